@@ -0,0 +1,121 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Published operations evaluated in Python.
+
+A document publishes each node's operations raw -- ``['r', '720.0 *
+$t', [0, 0, 1]]`` -- and a viewer evaluates them for every frame (see
+the widget's tree.ts). A format that cannot carry expressions needs
+the resulting matrices instead. They are composed here from the same
+serialized operations, with solid_node.expression evaluating the
+strings, in the order the widget applies them: the matrix of
+``[op1, ..., opN]`` is ``M_opN @ ... @ M_op1``.
+
+A cycle is evaluated at all of its samples at once. bake_tracks() turns
+a document's animated nodes into matrix tracks a viewer plays back by
+lookup, without evaluating any expression.
+"""
+
+import hashlib
+import math
+
+import numpy as np
+import trimesh
+
+from solid_node.expression import evaluate, evaluate_samples
+
+
+def is_animated(operations):
+    """Whether serialized ``operations`` depend on ``$t``."""
+    for operation in operations:
+        values = [operation[1]] if operation[0] == 'r' else operation[1]
+        if any('$t' in str(value) for value in values):
+            return True
+    return False
+
+
+def operation_matrix(operation, time):
+    """The 4x4 matrix of one serialized operation at ``$t = time``."""
+    if operation[0] == 'r':
+        _, angle, axis = operation
+        return trimesh.transformations.rotation_matrix(
+            math.radians(evaluate(str(angle), time)), axis)
+    return trimesh.transformations.translation_matrix(
+        [evaluate(str(value), time) for value in operation[1]])
+
+
+def local_matrix(operations, time=0.0):
+    """The local matrix of a node's serialized ``operations`` at
+    ``$t = time``."""
+    matrix = np.eye(4)
+    for operation in operations:
+        matrix = operation_matrix(operation, time) @ matrix
+    return matrix
+
+
+def sample_times(frames):
+    """The ``$t`` of each sample of one animation cycle of ``frames``
+    frames: both ends included, so a track closes its loop."""
+    return np.arange(frames + 1) / frames
+
+
+def operation_matrices(operation, times):
+    """``(len(times), 4, 4)`` matrices of one serialized operation, at
+    each ``$t`` in ``times``."""
+    matrices = np.tile(np.eye(4), (len(times), 1, 1))
+    if operation[0] == 'r':
+        _, angle, axis = operation
+        angles = np.radians(evaluate_samples(str(angle), times))
+        x, y, z = np.asarray(axis, dtype=np.float64) / np.linalg.norm(axis)
+        cosines, sines = np.cos(angles), np.sin(angles)
+        # Rodrigues: cos I + sin [axis]x + (1 - cos) axis axis^T
+        cross = np.array([[0, -z, y], [z, 0, -x], [-y, x, 0]])
+        matrices[:, :3, :3] = (
+            cosines[:, None, None] * np.eye(3)
+            + sines[:, None, None] * cross
+            + (1 - cosines)[:, None, None] * np.outer([x, y, z], [x, y, z]))
+    else:
+        for row, value in enumerate(operation[1]):
+            matrices[:, row, 3] = evaluate_samples(str(value), times)
+    return matrices
+
+
+def local_matrices(operations, frames):
+    """``(frames + 1, 4, 4)`` local matrices of ``operations`` over one
+    cycle, at sample_times(frames)."""
+    times = sample_times(frames)
+    matrices = np.tile(np.eye(4), (len(times), 1, 1))
+    for operation in operations:
+        matrices = operation_matrices(operation, times) @ matrices
+    return matrices
+
+
+def bake_tracks(root, frames):
+    """Give every animated node of the serialized tree ``root`` a
+    ``track``: the index of its local matrices over one cycle in the
+    returned bytes. Nodes that move alike share one track.
+
+    A track is ``frames + 1`` little-endian Float32 samples, one per
+    sample_times(frames), each the top three rows of the 4x4 matrix in
+    column-major order -- 12 floats, the layout of three.js'
+    ``Matrix4.elements`` without its constant last row.
+    """
+    tracks = {}
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        if is_animated(node['operations']):
+            matrices = local_matrices(node['operations'], frames)
+            content = (matrices[:, :3, :].transpose(0, 2, 1)
+                       .astype('<f4').tobytes())
+            node['track'] = tracks.setdefault(content, len(tracks))
+        # Reversed, so tracks are numbered in document order
+        pending.extend(reversed(node.get('children', ())))
+    return b''.join(tracks)
+
+
+def tracks_file(content):
+    """The file name of baked track ``content``: a new bake never
+    replaces a file a published document still names."""
+    return f'tracks-{hashlib.sha256(content).hexdigest()[:12]}.bin'
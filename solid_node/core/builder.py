@@ -19,8 +19,16 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from .loader import ProjectManifestError, load_node, project_root
 from .serializer import DOCUMENT_FORMAT, DOCUMENT_VERSION, serialize_node
-from .pieces import PieceInventory
+from .animation import bake_tracks, tracks_file
+from .pieces import PieceInventory, fingerprint_artifact, indexed_mesh_of
+from .precompress import (SUFFIXES, configured_encodings, is_current,
+                          precompress)
+from solid_node.derived_store import DATABASE
 from solid_node.node.base import StlRenderStart
+from solid_node.node.scheduler import RenderScheduler
+from solid_node.node.flyweight import flyweights
+from solid_node.node.render_pool import render_pool
+from solid_node.node.stat_cache import source_stats
 
 
 logger = logging.getLogger('core.builder')
@@ -112,6 +120,59 @@ def get_errors_file(build_dir=None):
     return os.path.join(build_dir or get_build_dir(), 'errors.json')
 
 
+def _content_urls():
+    """Whether SOLID_MODEL_URLS asks for model references that change
+    with the artifact's content, rather than its path alone."""
+    mode = os.environ.get('SOLID_MODEL_URLS', 'path')
+    if mode not in ('path', 'content'):
+        raise ValueError(
+            f"SOLID_MODEL_URLS={mode!r}; expected 'path' or 'content'")
+    return mode == 'content'
+
+
+def indexed_mesh_mode():
+    """What SOLID_INDEXED_MESHES asks publication to write beside each
+    STL: an indexed mesh with ``'float'`` or ``'int16'`` positions, or
+    None for none."""
+    mode = os.environ.get('SOLID_INDEXED_MESHES', 'float')
+    if mode not in ('float', 'int16', 'off'):
+        raise ValueError(f"SOLID_INDEXED_MESHES={mode!r}; expected "
+                         "'float', 'int16' or 'off'")
+    return None if mode == 'off' else mode
+
+
+def bake_frames():
+    """Whether SOLID_BAKE_FRAMES asks publication to bake each animated
+    node's local matrices into a track a viewer plays back by lookup."""
+    mode = os.environ.get('SOLID_BAKE_FRAMES', 'off')
+    if mode not in ('on', 'off'):
+        raise ValueError(
+            f"SOLID_BAKE_FRAMES={mode!r}; expected 'on' or 'off'")
+    return mode == 'on'
+
+
+def model_file(reference):
+    """The build-relative file a published model reference names,
+    without the content version SOLID_MODEL_URLS=content appends."""
+    return os.path.normpath(reference.partition('?')[0])
+
+
+def _published_files(snapshot):
+    """The build-relative files the models, indexed meshes and baked
+    tracks of ``snapshot`` name."""
+    files = set()
+    if 'tracks' in snapshot.get('animation', {}):
+        files.add(model_file(snapshot['animation']['tracks']))
+    pending = [snapshot['root']]
+    while pending:
+        node = pending.pop()
+        for key in ('model', 'mesh'):
+            if key in node:
+                files.add(model_file(node[key]))
+        pending.extend(node.get('children', []))
+    return files
+
+
 def atomic_write(path, content):
     """Replace one artifact without ever exposing a partial file."""
     directory = os.path.dirname(os.path.abspath(path)) or '.'
@@ -174,7 +235,8 @@ class Builder(FileSystemEventHandler):
     """Monitors .py files. On any change, generate STLs and exit"""
     def __init__(self, path, is_reload=False, build_dir=None,
                  watch=True, callback=None,
-                 lifecycle=False):
+                 lifecycle=False, in_process_renders=False, jobs=1,
+                 viewer_callback=None):
         super().__init__()
         self.path = path
 
@@ -189,8 +251,22 @@ class Builder(FileSystemEventHandler):
         self.build_dir = os.path.abspath(build_dir or get_build_dir())
         self.watch = watch
         self.callback = callback
+        # The web viewer of `solid develop`, told about every finished
+        # pass -- published or failed -- so it can push it to its clients.
+        self.viewer_callback = viewer_callback
         self.lifecycle = lifecycle
 
+        # Whether this builder drives every pending render to completion
+        # with the tree it already loaded, instead of exiting after each
+        # one so its supervisor respawns a fresh process. A fresh process
+        # re-imports the project and every CAD library and starts every
+        # in-memory cache empty; that isolation only buys anything when
+        # the source it loaded is no longer the source on disk, which
+        # generate_stl() checks after each render.
+        self.in_process_renders = in_process_renders
+        # How many openscad renders run at once in that mode.
+        self.jobs = jobs
+
         self.file_changed = None
         self.observer = Observer()
 
@@ -203,7 +279,9 @@ class Builder(FileSystemEventHandler):
             self.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
         self.file_changed = self.loop.create_future()
-        outcome = self.loop.run_until_complete(task)
+        with source_stats.build(), flyweights.build(), \
+                render_pool.build(self.jobs):
+            outcome = self.loop.run_until_complete(task)
         self.observer.stop()
         if self.observer.is_alive():
             self.observer.join()
@@ -233,6 +311,8 @@ class Builder(FileSystemEventHandler):
             for path in self.node.files:
                 self.observer.schedule(self, path, recursive=False)
             self.observer.start()
+            # Nothing invalidated what was remembered before watching.
+            source_stats.invalidate()
 
         error_message = None
         published = False
@@ -240,7 +320,7 @@ class Builder(FileSystemEventHandler):
             prepare_build_dir(self.build_dir)
             # A process may have waited while a newer edit was built. Never
             # let the model it loaded before waiting publish over that result.
-            if self.node.mtime != loaded_source_mtime:
+            if self._sources_changed(loaded_source_mtime):
                 return BuildOutcome.SOURCE_CHANGED
             if self._published_model_is_current():
                 # No artifact needs rendering -- but the document naming them
@@ -266,7 +346,7 @@ class Builder(FileSystemEventHandler):
                 # place stay readable.
                 try:
                     outcome = await self.generate_stl()
-                    if outcome is BuildOutcome.RENDERED:
+                    if outcome is not BuildOutcome.CURRENT:
                         return outcome
                     self._write_viewer_snapshot()
                     published = True
@@ -279,6 +359,7 @@ class Builder(FileSystemEventHandler):
         # callback that blocks must not hold the next builder off.
         if published:
             self._notify_callback()
+        self._notify_viewer()
         if not self.watch:
             return BuildOutcome.CURRENT
         return await self.wait_for_change()
@@ -326,24 +407,47 @@ class Builder(FileSystemEventHandler):
     async def generate_stl(self):
         """Trigger the stl generation on the root node, that will recursively render
         stls in all nodes. If in the middle a STL is built, the builder process
-        exits to be restarted."""
+        exits to be restarted -- unless it renders in process, in which case it
+        keeps the loaded tree and renders every pending STL, up to `jobs` at a
+        time, before returning."""
+        if self.in_process_renders:
+            loaded_source_mtime = self.node.mtime
+            scheduler = RenderScheduler(self.node, self.jobs)
+            # The tree in memory stops describing the source on disk once it
+            # is edited: only a fresh process can load the new one.
+            if not scheduler.run(
+                    lambda: self._sources_changed(loaded_source_mtime)):
+                return BuildOutcome.SOURCE_CHANGED
+            return self._render_outcome()
         try:
             self.node.trigger_stl()
-            if not self._artifacts_are_current():
-                # Another builder may own a node's per-STL render lock.  In
-                # that case generate_stl() deliberately does nothing, but the
-                # missing artifact is not a complete build: make the
-                # supervisor retry instead of running publication checks.
-                return BuildOutcome.RENDERED
-            return BuildOutcome.CURRENT
+            return self._render_outcome()
         except StlRenderStart as job:
-            logger.info(f"Building {job.stl_file} by pid {job.proc.pid}")
+            logger.info(f"Building {job.stl_file} by {job.worker}")
             job.wait()
             logger.info(f"{job.stl_file} done!")
             return BuildOutcome.RENDERED
 
+    def _sources_changed(self, loaded_source_mtime):
+        """Whether the sources moved on from the tree this process loaded.
+        Stats them again rather than trusting the build stat cache: a
+        builder that does not watch gets no events, and an editor's
+        atomic save can replace a file without its watch noticing."""
+        source_stats.invalidate()
+        return self.node.mtime != loaded_source_mtime
+
+    def _render_outcome(self):
+        if not self._artifacts_are_current():
+            # Another builder may own a node's per-STL render lock.  In that
+            # case generate_stl() deliberately does nothing, but the missing
+            # artifact is not a complete build: make the supervisor retry
+            # instead of running publication checks.
+            return BuildOutcome.RENDERED
+        return BuildOutcome.CURRENT
+
     async def report_error(self, error_message):
         write_error(error_message, self.build_dir)
+        self._notify_viewer()
         if not self.watch:
             return BuildOutcome.FAILED
         return await self.wait_for_change()
@@ -362,17 +466,42 @@ class Builder(FileSystemEventHandler):
         found everything already published notifies nobody.
         """
         os.makedirs(self.build_dir, exist_ok=True)
+        content_urls = _content_urls()
+        mode = indexed_mesh_mode()
+
+        def reference(path):
+            published = os.path.relpath(path, self.build_dir)
+            if content_urls:
+                published += '?v=' + fingerprint_artifact(path)
+            return published
+
+        def mesh_path(rigid_node):
+            path = indexed_mesh_of(rigid_node.stl_file, mode == 'int16')
+            return None if path is None else reference(path)
+
         inventory = PieceInventory()
         snapshot = {'format': DOCUMENT_FORMAT,
                     'version': DOCUMENT_VERSION,
                     'animation': {'fps': 30, 'frames': 360},
                     'root': serialize_node(
                         self.node,
-                        lambda rigid_node: os.path.relpath(
-                            rigid_node.stl_file, self.build_dir),
+                        lambda rigid_node: reference(rigid_node.stl_file),
                         inventory.register,
-                    )}
+                        mesh_path if mode else None)}
         snapshot['pieces'] = inventory.pieces()
+        if bake_frames():
+            animation = snapshot['animation']
+            tracks = bake_tracks(snapshot['root'], animation['frames'])
+            if tracks:
+                path = os.path.join(self.build_dir, tracks_file(tracks))
+                if not os.path.isfile(path):
+                    atomic_write(path, tracks)
+                animation['tracks'] = reference(path)
+        encodings = configured_encodings()
+        if encodings:
+            for published in _published_files(snapshot):
+                precompress(os.path.join(self.build_dir, published),
+                            encodings)
         document = json.dumps(snapshot).encode()
         if self._published_document() == document:
             return False
@@ -417,20 +546,27 @@ class Builder(FileSystemEventHandler):
         return current(self.node)
 
     def _sweep_unreferenced_artifacts(self, snapshot):
-        referenced = set()
-
-        def collect(node):
-            if 'model' in node:
-                referenced.add(os.path.normpath(node['model']))
-            for child in node.get('children', []):
-                collect(child)
-
-        collect(snapshot['root'])
+        referenced = _published_files(snapshot)
         for root, _, files in os.walk(self.build_dir):
             for filename in files:
                 path = os.path.join(root, filename)
                 relative = os.path.normpath(os.path.relpath(path,
                                                             self.build_dir))
+                if self._current_sibling(relative, referenced):
+                    continue
+                # The source digest SOLID_FRESHNESS=digest records beside
+                # an artifact lives as long as the artifact does; scad
+                # and BREP inputs are never swept, nor are theirs.
+                artifact = relative[:-len('.digest')]
+                if filename.endswith('.digest') and (
+                        artifact in referenced or
+                        artifact.endswith(('.scad', '.brep'))):
+                    continue
+                # The derived store and its WAL and shared-memory files
+                # outlive every publication, and connections hold them open.
+                if relative in (DATABASE, f'{DATABASE}-wal',
+                                f'{DATABASE}-shm'):
+                    continue
                 if (relative in referenced or filename in ('viewer.json',
                                                             'errors.json') or
                         filename.endswith(
@@ -438,17 +574,38 @@ class Builder(FileSystemEventHandler):
                     continue
                 os.remove(path)
 
+    def _current_sibling(self, relative, referenced):
+        """Whether ``relative`` is a compressed sibling of a referenced
+        model, written from its current content."""
+        for suffix in SUFFIXES.values():
+            # <model>.<fingerprint><suffix>, see precompress.sibling_of.
+            model = relative[:-len(suffix)].rpartition('.')[0]
+            if relative.endswith(suffix) and model in referenced:
+                return is_current(os.path.join(self.build_dir, model),
+                                  os.path.join(self.build_dir, relative))
+        return False
+
     def _notify_callback(self):
-        if not self.callback:
+        self._post(self.callback, 'Build-ready callback')
+
+    def _notify_viewer(self):
+        self._post(self.viewer_callback, 'Viewer notification')
+
+    def _post(self, url, purpose):
+        if not url:
             return
         try:
             import httpx
-            response = httpx.post(self.callback, content=b'', timeout=2.0)
+            response = httpx.post(url, content=b'', timeout=2.0)
             response.raise_for_status()
         except Exception as exc:
-            logger.warning('Build-ready callback failed for %s: %s',
-                           self.callback, exc)
+            logger.warning('%s failed for %s: %s', purpose, url, exc)
+
 
+    def on_any_event(self, event):
+        """Any change under watch may be a source the build stat cache
+        remembers: forget them all, they are cheap to stat again."""
+        source_stats.invalidate()
 
     def on_modified(self, event):
         """Called when a file is modified, sets the result of the awaiting future
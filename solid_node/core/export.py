@@ -15,8 +15,10 @@ import os
 import shutil
 
 from .serializer import DOCUMENT_FORMAT, DOCUMENT_VERSION, serialize_node
-from .builder import project_build_lock
-from .pieces import PieceInventory
+from .animation import bake_tracks, tracks_file
+from .builder import indexed_mesh_mode, project_build_lock
+from .pieces import PieceInventory, indexed_mesh_of
+from solid_node.node import indexed_mesh
 from solid_node.viewers import bundle as viewer_bundle
 
 
@@ -35,13 +37,18 @@ class WidgetBundleMissing(Exception):
         )
 
 
-def export_node(node, output_dir, fps=30, frames=360, widget=True):
+def export_node(node, output_dir, fps=30, frames=360, widget=True,
+                bake_frames=False):
     """Builds all STLs for `node`, then writes into `output_dir`:
 
     - manifest.json: the serialized node tree plus animation parameters
+    - if bake_frames: tracks-<hash>.bin, the local matrices of every
+      animated node at each frame, named from the manifest's animation
+      (see core/animation.py's bake_tracks())
     - models/: one STL per distinct rigid artifact, keyed by its path
       relative to the build dir (so same-named scripts in different
-      directories never collide, and identical instances deduplicate)
+      directories never collide, and identical instances deduplicate),
+      with its indexed mesh beside it unless SOLID_INDEXED_MESHES=off
     - unless widget=False: index.html plus the solid-widget.js bundle,
       making the directory a self-contained, embeddable viewer
 
@@ -49,8 +56,18 @@ def export_node(node, output_dir, fps=30, frames=360, widget=True):
     with project_build_lock():
         node.build_stls()
 
-    # Maps each rigid node's stl_file to its manifest-relative path
+    # Maps each rigid node's stl_file -- and its indexed mesh, when one
+    # is written -- to its manifest-relative path
     models = {}
+    mode = indexed_mesh_mode()
+
+    def mesh_path(rigid_node):
+        path = indexed_mesh_of(rigid_node.stl_file, mode == 'int16')
+        if path is None:
+            return None
+        return models.setdefault(
+            path, _model_path(rigid_node) + indexed_mesh.SUFFIX)
+
     inventory = PieceInventory()
     root = serialize_node(
         node,
@@ -58,6 +75,7 @@ def export_node(node, output_dir, fps=30, frames=360, widget=True):
             rigid_node.stl_file, _model_path(rigid_node),
         ),
         inventory.register,
+        mesh_path if mode else None,
     )
 
     manifest = {
@@ -69,11 +87,18 @@ def export_node(node, output_dir, fps=30, frames=360, widget=True):
     }
 
     os.makedirs(output_dir, exist_ok=True)
-    for stl_file, model_path in models.items():
+    tracks = bake_tracks(root, frames) if bake_frames else b''
+    if tracks:
+        manifest['animation']['tracks'] = tracks_file(tracks)
+        with open(os.path.join(output_dir, tracks_file(tracks)), 'wb') as fh:
+            fh.write(tracks)
+        logger.info(f'{manifest["animation"]["tracks"]} written')
+
+    for artifact, model_path in models.items():
         target = os.path.join(output_dir, model_path)
         os.makedirs(os.path.dirname(target), exist_ok=True)
-        shutil.copy2(stl_file, target)
-        logger.info(f'{stl_file} -> {target}')
+        shutil.copy2(artifact, target)
+        logger.info(f'{artifact} -> {target}')
 
     manifest_path = os.path.join(output_dir, 'manifest.json')
     with open(manifest_path, 'w') as fh:
@@ -0,0 +1,316 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Exports a node tree as one binary glTF (GLB) file.
+
+The manifest export copies one STL per distinct artifact, and a viewer
+fetches each of them. A GLB holds the whole tree in one file, in a
+format every 3D tool reads.
+
+Geometry is stored once per printed piece (see core/pieces.py): eight
+identical pistons are one glTF mesh referenced by eight nodes, which is
+what lets a renderer instance them. The node tree is the document's
+tree. A static node carries its local matrix. An animated one is either
+baked -- its operations evaluated at every frame of one cycle into
+translation and rotation samplers, identical tracks stored once -- or
+keeps its raw operations in ``extras``, the way the manifest publishes
+them, with its pose at ``$t = 0``.
+
+Positions are written as the STLs hold them, in millimeters with Z up,
+under one root node that turns them into glTF's meters with Y up. Node
+colors are sRGB, as CSS and OpenSCAD read them; glTF's base color
+factors are linear, so they are converted.
+"""
+
+import json
+import logging
+import os
+import struct
+
+import numpy as np
+import trimesh
+
+from .animation import (is_animated, local_matrices, local_matrix,
+                        sample_times)
+from .builder import atomic_write, project_build_lock
+from .export import _model_path
+from .pieces import PieceInventory
+from .serializer import serialize_node
+from solid_node.expression import UnsupportedExpression, evaluate_samples
+from solid_node.node.base import cached_base_mesh
+
+
+logger = logging.getLogger('core.gltf')
+
+ANIMATIONS = ('baked', 'expressions')
+
+_FLOAT, _UNSIGNED_SHORT, _UNSIGNED_INT = 5126, 5123, 5125
+_COMPONENTS = {np.dtype('<f4'): _FLOAT, np.dtype('<u2'): _UNSIGNED_SHORT,
+               np.dtype('<u4'): _UNSIGNED_INT}
+_ARRAY_BUFFER, _ELEMENT_ARRAY_BUFFER = 34962, 34963
+
+# -90 degrees about X, as an (x, y, z, w) quaternion: Z up becomes Y up.
+_Y_UP = [-np.sqrt(0.5), 0.0, 0.0, np.sqrt(0.5)]
+_METERS = [0.001] * 3
+
+
+class UnsupportedAnimation(Exception):
+    """A node's operations use an expression that cannot be evaluated
+    in Python, so the node cannot be placed in the GLB."""
+
+    def __init__(self, name, expression, error):
+        super().__init__(
+            f'{name}: cannot evaluate {expression!r} for the GLB '
+            f'({error})')
+
+
+def _unsupported_expression(operations, times):
+    """The first expression of ``operations`` that cannot be evaluated
+    at ``times``."""
+    for operation in operations:
+        values = [operation[1]] if operation[0] == 'r' else operation[1]
+        for value in values:
+            try:
+                evaluate_samples(str(value), times)
+            except UnsupportedExpression:
+                return str(value)
+    return None
+
+
+def _linear(channel):
+    """An sRGB color channel in [0, 1] as the linear value glTF's
+    baseColorFactor holds."""
+    if channel <= 0.04045:
+        return channel / 12.92
+    return ((channel + 0.055) / 1.055) ** 2.4
+
+
+class _Buffer:
+    """The binary chunk of a GLB, with its buffer views and accessors.
+    An array already stored is not stored twice."""
+
+    def __init__(self):
+        self.content = bytearray()
+        self.views = []
+        self.accessors = []
+        self._stored = {}
+
+    def accessor(self, array, kind, target=None, bounds=False):
+        array = np.ascontiguousarray(array)
+        key = (array.tobytes(), array.dtype.str, kind, target)
+        if key in self._stored:
+            return self._stored[key]
+        self.content.extend(bytes(-len(self.content) % 4))
+        view = {'buffer': 0, 'byteOffset': len(self.content),
+                'byteLength': array.nbytes}
+        if target is not None:
+            view['target'] = target
+        self.content.extend(key[0])
+        self.views.append(view)
+        accessor = {'bufferView': len(self.views) - 1,
+                    'componentType': _COMPONENTS[array.dtype],
+                    'count': len(array), 'type': kind}
+        if bounds:
+            columns = array.reshape(len(array), -1)
+            accessor['min'] = columns.min(axis=0).tolist()
+            accessor['max'] = columns.max(axis=0).tolist()
+        self.accessors.append(accessor)
+        self._stored[key] = len(self.accessors) - 1
+        return self._stored[key]
+
+
+class _GlbWriter:
+    """Accumulates the glTF document of one serialized node tree."""
+
+    def __init__(self, models, fps, frames, animation):
+        self.models = models
+        self.fps = fps
+        self.frames = frames
+        self.animation = animation
+        self.buffer = _Buffer()
+        self.nodes = []
+        self.meshes = []
+        self.materials = []
+        self.channels = []
+        self.samplers = []
+        self._meshes = {}
+        self._materials = {}
+        self._geometry = {}
+
+    def add_node(self, data, inherited_color=None):
+        """Add the serialized node ``data`` and its descendants, and
+        return its node index."""
+        color = data.get('color') or inherited_color
+        index = len(self.nodes)
+        node = {'name': data['name']}
+        self.nodes.append(node)
+        operations = data['operations']
+        try:
+            self._place(index, operations)
+        except UnsupportedExpression as error:
+            expression = _unsupported_expression(
+                operations, sample_times(self.frames))
+            raise UnsupportedAnimation(data['name'], expression,
+                                       error) from error
+        if 'model' in data:
+            mesh = self._mesh(data['piece'], self.models[data['model']],
+                              color)
+            if mesh is not None:
+                node['mesh'] = mesh
+        children = [self.add_node(child, color)
+                    for child in data.get('children', ())]
+        if children:
+            node['children'] = children
+        return index
+
+    def _place(self, index, operations):
+        node = self.nodes[index]
+        if self.animation == 'baked' and is_animated(operations):
+            self._bake(index, operations)
+        else:
+            matrix = local_matrix(operations)
+            if not np.allclose(matrix, np.eye(4)):
+                node['matrix'] = matrix.T.flatten().tolist()
+            if self.animation == 'expressions' and operations:
+                node['extras'] = {'operations': operations}
+
+    def _bake(self, index, operations):
+        matrices = local_matrices(operations, self.frames)
+        translations = matrices[:, :3, 3]
+        quaternion = trimesh.transformations.quaternion_from_matrix
+        rotations = np.array([quaternion(matrix)[[1, 2, 3, 0]]
+                              for matrix in matrices])
+        # q and -q are the same rotation; interpolating between samples
+        # of opposite signs would take the long way round.
+        for sample in range(1, len(rotations)):
+            if np.dot(rotations[sample], rotations[sample - 1]) < 0:
+                rotations[sample] = -rotations[sample]
+        node = self.nodes[index]
+        times = self.buffer.accessor(
+            (sample_times(self.frames) * self.frames / self.fps).astype('<f4'),
+            'SCALAR', bounds=True)
+        for path, values, kind in (('translation', translations, 'VEC3'),
+                                   ('rotation', rotations, 'VEC4')):
+            node[path] = values[0].tolist()
+            if np.allclose(values, values[0]):
+                continue
+            self.samplers.append({
+                'input': times, 'interpolation': 'LINEAR',
+                'output': self.buffer.accessor(values.astype('<f4'), kind)})
+            self.channels.append({'sampler': len(self.samplers) - 1,
+                                  'target': {'node': index, 'path': path}})
+
+    def _mesh(self, piece, stl_file, color):
+        """The mesh of ``piece`` in ``color``, added on first use; None
+        for an artifact without triangles."""
+        key = (piece, color)
+        if key not in self._meshes:
+            primitive = self._primitive(piece, stl_file)
+            if primitive is None:
+                self._meshes[key] = None
+            else:
+                primitive = dict(primitive)
+                if color is not None:
+                    primitive['material'] = self._material(color)
+                self.meshes.append({'name': piece,
+                                    'primitives': [primitive]})
+                self._meshes[key] = len(self.meshes) - 1
+        return self._meshes[key]
+
+    def _primitive(self, piece, stl_file):
+        if piece not in self._geometry:
+            mesh = cached_base_mesh(stl_file)
+            if not len(mesh.faces):
+                self._geometry[piece] = None
+            else:
+                index_type = '<u2' if len(mesh.vertices) <= 0xffff else '<u4'
+                self._geometry[piece] = {
+                    'attributes': {'POSITION': self.buffer.accessor(
+                        mesh.vertices.astype('<f4'), 'VEC3',
+                        _ARRAY_BUFFER, bounds=True)},
+                    'indices': self.buffer.accessor(
+                        mesh.faces.astype(index_type).reshape(-1),
+                        'SCALAR', _ELEMENT_ARRAY_BUFFER),
+                }
+        return self._geometry[piece]
+
+    def _material(self, color):
+        if color not in self._materials:
+            hex_code = color.lstrip('#')
+            rgb = [_linear(int(hex_code[i:i + 2], 16) / 255)
+                   for i in (0, 2, 4)]
+            self.materials.append({
+                'name': color,
+                'pbrMetallicRoughness': {'baseColorFactor': rgb + [1.0],
+                                         'metallicFactor': 0.1,
+                                         'roughnessFactor': 0.6}})
+            self._materials[color] = len(self.materials) - 1
+        return self._materials[color]
+
+    def document(self, root, pieces):
+        scene_root = len(self.nodes)
+        self.nodes.append({'name': 'millimeters, Z up', 'children': [root],
+                           'rotation': _Y_UP, 'scale': _METERS})
+        gltf = {
+            'asset': {'version': '2.0', 'generator': 'solid-node'},
+            'scene': 0,
+            'scenes': [{'nodes': [scene_root],
+                        'extras': {'fps': self.fps, 'frames': self.frames,
+                                   'pieces': pieces}}],
+            'nodes': self.nodes,
+        }
+        for key, values in (('meshes', self.meshes),
+                            ('materials', self.materials),
+                            ('accessors', self.buffer.accessors),
+                            ('bufferViews', self.buffer.views)):
+            if values:
+                gltf[key] = values
+        if self.channels:
+            gltf['animations'] = [{'name': 'cycle',
+                                   'channels': self.channels,
+                                   'samplers': self.samplers}]
+        if self.buffer.content:
+            gltf['buffers'] = [{'byteLength': len(self.buffer.content)}]
+        return gltf
+
+
+def export_glb(node, output_path, fps=30, frames=360, animation='baked'):
+    """Builds all STLs for ``node``, then writes the whole tree to the GLB
+    file ``output_path``. ``animation`` is 'baked' or 'expressions'.
+
+    Returns the glTF document written in its JSON chunk."""
+    if animation not in ANIMATIONS:
+        raise ValueError(f'animation={animation!r}; expected one of '
+                         f'{", ".join(ANIMATIONS)}')
+    with project_build_lock():
+        node.build_stls()
+
+    # Maps each model reference -- the manifest's, so the piece
+    # inventory reads the same as an export's -- to its stl_file
+    models = {}
+
+    def model_path(rigid_node):
+        reference = _model_path(rigid_node)
+        models[reference] = rigid_node.stl_file
+        return reference
+
+    inventory = PieceInventory()
+    root = serialize_node(node, model_path, inventory.register)
+    writer = _GlbWriter(models, fps, frames, animation)
+    gltf = writer.document(writer.add_node(root), inventory.pieces())
+
+    content = json.dumps(gltf, separators=(',', ':')).encode()
+    content += b' ' * (-len(content) % 4)
+    chunks = struct.pack('<I4s', len(content), b'JSON') + content
+    binary = bytes(writer.buffer.content)
+    if binary:
+        binary += bytes(-len(binary) % 4)
+        chunks += struct.pack('<I4s', len(binary), b'BIN\0') + binary
+    header = struct.pack('<4sII', b'glTF', 2, 12 + len(chunks))
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    atomic_write(output_path, header + chunks)
+    logger.info(f'{output_path} written: {len(writer.meshes)} meshes for '
+                f'{len(inventory.pieces())} pieces, {len(writer.nodes)} '
+                f'nodes')
+    return gltf
@@ -22,12 +22,43 @@ class AmbiguousNodeError(Exception):
     pass
 
 
+# Discovery results by starting directory, with every manifest the walk
+# looked at and its mtime then (None when there was none). Node
+# construction, source closures and build-dir resolution each ask for
+# every node, so a large tree used to parse the same pyproject.toml
+# thousands of times; now a result is reused for as long as none of
+# those manifests appeared, changed or disappeared.
+_project_cache = {}
+
+
+def _manifest_mtime(manifest):
+    try:
+        return os.stat(manifest).st_mtime
+    except FileNotFoundError:
+        return None
+
+
 def discover_project(origin=None):
     """Return ``(root, model_reference)`` for the nearest Solid project."""
     origin = os.path.realpath(origin or os.getcwd())
     directory = origin if os.path.isdir(origin) else os.path.dirname(origin)
+    cached = _project_cache.get(directory)
+    if cached is not None:
+        project, manifests = cached
+        if all(_manifest_mtime(manifest) == mtime
+               for manifest, mtime in manifests):
+            return project
+    project, manifests = _walk_to_project(directory, origin)
+    _project_cache[directory] = (project, manifests)
+    return project
+
+
+def _walk_to_project(directory, origin):
+    manifests = []
     while True:
         manifest = os.path.join(directory, 'pyproject.toml')
+        mtime = _manifest_mtime(manifest)
+        manifests.append((manifest, mtime))
         try:
             with open(manifest, 'rb') as stream:
                 config = tomllib.load(stream)
@@ -37,7 +68,7 @@ def discover_project(origin=None):
                 if not isinstance(model, str) or not model:
                     raise ProjectManifestError(
                         f"{manifest} has [tool.solid-node] but no model reference")
-                return directory, model
+                return (directory, model), manifests
         except FileNotFoundError:
             pass
         parent = os.path.dirname(directory)
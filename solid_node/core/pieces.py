@@ -20,6 +20,9 @@ import hashlib
 import logging
 import os
 
+from solid_node import derived_store
+from solid_node.memory_cache import MemoryCache, object_size
+from solid_node.node import indexed_mesh
 from solid_node.node.base import cached_base_mesh
 
 logger = logging.getLogger('core.pieces')
@@ -31,27 +34,31 @@ logger = logging.getLogger('core.pieces')
 _HASH_LEN = 12
 
 # Module-level cache of artifact content fingerprints, keyed on
-# (path, mtime) -- the same shape as node/base.py's base-mesh cache, so a
-# rebuilt STL is picked up and a stale entry under its old mtime is
-# evicted rather than accumulating one per rebuild.
-_fingerprint_cache = {}
+# (path, mtime, size, inode), so a rebuilt STL is picked up and a stale
+# entry under its old stat is evicted rather than accumulating one per
+# rebuild. The inode tells renders apart (see derived_store.py).
+_fingerprint_cache = MemoryCache('fingerprint')
 
 
 def fingerprint_artifact(path):
     """The content identity of a built artifact: sha256 of its bytes,
-    truncated to _HASH_LEN hex digits. Cached per (path, mtime): a
+    truncated to _HASH_LEN hex digits. Cached per stat: a
     project's already-loaded mesh cache does not need a second read of
     the same file, and this cache does not need one either across a
     republication that finds every artifact still current."""
-    mtime = os.path.getmtime(path)
-    key = (path, mtime)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime, stat.st_size, stat.st_ino)
     cached = _fingerprint_cache.get(key)
     if cached is None:
         for stale in [k for k in _fingerprint_cache if k[0] == path]:
             del _fingerprint_cache[stale]
-        with open(path, 'rb') as artifact:
-            cached = hashlib.sha256(artifact.read()).hexdigest()[:_HASH_LEN]
-        _fingerprint_cache[key] = cached
+        cached = derived_store.get('fingerprint', path, stat)
+        if cached is None:
+            with open(path, 'rb') as artifact:
+                cached = hashlib.sha256(
+                    artifact.read()).hexdigest()[:_HASH_LEN]
+            derived_store.put('fingerprint', path, cached, stat)
+        _fingerprint_cache.put(key, cached, object_size(cached))
     return cached
 
 
@@ -65,17 +72,43 @@ def _geometry_facts(path):
     'Failure is reported, not fatal'), with watertight false and no
     size/volume rather than aborting the whole document."""
     try:
-        mesh = cached_base_mesh(path)
-        size = [float(value) for value in mesh.extents]
-        volume = float(mesh.volume)
-        watertight = bool(mesh.is_watertight)
-        return size, volume, watertight
+        stat = os.stat(path)
+        facts = derived_store.get('geometry', path, stat)
+        if facts is None:
+            mesh = cached_base_mesh(path).copy()
+            size = [float(value) for value in mesh.extents]
+            volume = float(mesh.volume)
+            watertight = bool(mesh.is_watertight)
+            facts = [size, volume, watertight]
+            derived_store.put('geometry', path, facts, stat)
+        return tuple(facts)
     except Exception:
         logger.warning('Could not derive geometry facts for %s', path,
                        exc_info=True)
         return None, None, False
 
 
+def indexed_mesh_of(stl_file, quantize=False):
+    """The indexed mesh file of a built artifact (see
+    node/indexed_mesh.py), written unless a current one with the same
+    position encoding is already there, its header carrying the same
+    facts a piece publishes. None when the artifact holds no triangles
+    or cannot be loaded: its STL is then the only representation."""
+    path = indexed_mesh.sibling(stl_file)
+    if indexed_mesh.is_current(stl_file, path) and quantize == (
+            indexed_mesh.header(path)['encoding'] == indexed_mesh.INT16):
+        return path
+    try:
+        mesh = cached_base_mesh(stl_file)
+    except (OSError, ValueError):
+        logger.warning('Could not index %s', stl_file, exc_info=True)
+        return None
+    if not len(mesh.faces):
+        return None
+    _, volume, watertight = _geometry_facts(stl_file)
+    return indexed_mesh.write(stl_file, mesh, volume, watertight, quantize)
+
+
 def _project_relative_source(node):
     """node.src, relative to its project root, so the inventory names a
     source the way a maker reading the project would recognise it rather
@@ -0,0 +1,113 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Compressed siblings of published artifacts.
+
+An STL is fetched again by every browser that opens the viewer, and by
+each one again whenever it changes. When SOLID_PRECOMPRESS names
+encodings, the builder writes ``part.stl.<fingerprint>.br`` and/or
+``part.stl.<fingerprint>.gz`` beside each published model, once per
+artifact content, and the web viewer answers a request accepting one of
+them with the sibling and a ``Content-Encoding`` header instead of
+compressing on every request.
+
+A sibling is named after the content fingerprint of the artifact it was
+compressed from -- the one the viewer's ETag carries -- not after its
+mtime, which does not tell renders apart (see derived_store.py); a
+sibling named for other content is neither served nor kept.
+"""
+
+import gzip
+import logging
+import os
+
+from .pieces import fingerprint_artifact
+
+logger = logging.getLogger('core.precompress')
+
+# Content-Encoding token -> file suffix, in order of preference.
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def configured_encodings():
+    """The encodings SOLID_PRECOMPRESS asks for, in preference order."""
+    setting = os.environ.get('SOLID_PRECOMPRESS', '')
+    encodings = [token.strip() for token in setting.split(',')
+                 if token.strip()]
+    for encoding in encodings:
+        if encoding not in SUFFIXES:
+            raise ValueError(
+                f"SOLID_PRECOMPRESS names {encoding!r}; expected a comma "
+                f"separated list of {', '.join(SUFFIXES)}")
+    if 'br' in encodings and _brotli() is None:
+        raise ValueError("SOLID_PRECOMPRESS=br needs the brotli module")
+    return [encoding for encoding in SUFFIXES if encoding in encodings]
+
+
+def _compress(encoding, content):
+    if encoding == 'br':
+        return _brotli().compress(content)
+    # mtime=0: the same artifact always compresses to the same bytes.
+    return gzip.compress(content, mtime=0)
+
+
+def sibling_of(path, encoding, fingerprint=None):
+    """The ``encoding`` sibling of ``path`` for its current content, whose
+    ``fingerprint`` is computed when not given."""
+    fingerprint = fingerprint or fingerprint_artifact(path)
+    return f'{path}.{fingerprint}{SUFFIXES[encoding]}'
+
+
+def is_current(path, sibling):
+    """Whether ``sibling`` was compressed from ``path``'s content."""
+    try:
+        fingerprint = fingerprint_artifact(path)
+    except OSError:
+        return False
+    return any(sibling == sibling_of(path, encoding, fingerprint)
+               for encoding in SUFFIXES)
+
+
+def precompress(path, encodings):
+    """Write the ``encodings`` siblings of ``path`` that are missing."""
+    # Local import: the builder imports this module.
+    from solid_node.core.builder import atomic_write
+    fingerprint = fingerprint_artifact(path)
+    content = None
+    for encoding in encodings:
+        sibling = sibling_of(path, encoding, fingerprint)
+        if os.path.isfile(sibling):
+            continue
+        if content is None:
+            with open(path, 'rb') as stream:
+                content = stream.read()
+        atomic_write(sibling, _compress(encoding, content))
+        logger.debug(f'{sibling} written')
+
+
+def negotiate(path, accept_encoding, fingerprint=None):
+    """``(encoding, sibling)`` of the preferred current sibling of
+    ``path``, whose content is ``fingerprint``, that ``accept_encoding``
+    allows, or None."""
+    accepted = set()
+    for item in (accept_encoding or '').split(','):
+        token, _, parameters = item.strip().partition(';')
+        quality = parameters.strip().replace(' ', '')
+        if quality in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(token.strip().lower())
+    for encoding, suffix in SUFFIXES.items():
+        if encoding in accepted or '*' in accepted:
+            sibling = sibling_of(path, encoding, fingerprint)
+            if os.path.isfile(sibling):
+                return encoding, sibling
+    return None
@@ -16,7 +16,7 @@ DOCUMENT_FORMAT = 'solid-node-export'
 DOCUMENT_VERSION = 1
 
 
-def serialize_node(node, model_path, piece_id=None):
+def serialize_node(node, model_path, piece_id=None, mesh_path=None):
     """Serialize one node using ``model_path`` for rigid artifacts.
 
     The established parent-linking rule must run before recursion because a
@@ -28,6 +28,11 @@ def serialize_node(node, model_path, piece_id=None):
     every rigid node -- ``model`` being the reference just resolved above --
     and its return value is published as ``piece``. It defaults to ``None``
     so every existing caller keeps its previous, piece-free document.
+
+    ``mesh_path``, when supplied, is called with every rigid node for the
+    reference of its indexed mesh (see node/indexed_mesh.py), published
+    as ``mesh`` unless it returns None. Viewers prefer it to ``model``,
+    which stays the node's geometry identity.
     """
     data = {
         'name': node.name,
@@ -39,6 +44,9 @@ def serialize_node(node, model_path, piece_id=None):
     if node.rigid:
         model = model_path(node)
         data['model'] = model
+        mesh = mesh_path(node) if mesh_path is not None else None
+        if mesh is not None:
+            data['mesh'] = mesh
         if piece_id is not None:
             data['piece'] = piece_id(node, model)
         return data
@@ -50,6 +58,7 @@ def serialize_node(node, model_path, piece_id=None):
     for child in children:
         node._link_child(child)
     data['children'] = [
-        serialize_node(child, model_path, piece_id) for child in children
+        serialize_node(child, model_path, piece_id, mesh_path)
+        for child in children
     ]
     return data
@@ -0,0 +1,139 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Facts derived from files, kept on disk between processes.
+
+The in-memory caches keyed on (path, mtime) -- artifact fingerprints,
+geometry facts, manifold bounds and verdicts, parsed import statements --
+die with the process. ``solid build``, ``solid develop``, the test runner
+and the exporter are separate processes, and each one re-read and
+re-derived everything for an unchanged tree.
+
+This store keeps those facts in ``derived.sqlite`` inside the project's
+build directory, keyed on the file's path, mtime, size and inode, with
+one row per (kind, path): a file whose stat changed replaces its row
+rather than adding one. Artifacts are stamped with their sources' mtime,
+so new bytes can appear under an old mtime and size; they are published
+with os.replace, though, which gives them a new inode. The in-memory
+caches stay in front of it; it is only asked on their miss, and written
+when the fact had to be computed.
+
+SQLite in WAL mode lets any number of readers proceed while one process
+writes, and a writer waits for another instead of failing. The store is
+an optimization only: a build directory that does not exist yet, a
+file outside any project or any SQLite error means the fact is simply
+computed again.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+
+logger = logging.getLogger('node.derived_store')
+
+DATABASE = 'derived.sqlite'
+
+# How long a writer waits for another one before giving up on the store.
+_BUSY_TIMEOUT = 5.0
+
+# Bumped whenever _SCHEMA changes: a store of another version is
+# emptied, it only holds what can be derived again.
+_VERSION = 2
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS derived (
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (kind, path)
+)
+'''
+
+# sqlite3 connections must not be shared between threads, and the
+# scheduler's render threads ask for facts too.
+_connections = threading.local()
+
+
+def get(kind, path, stat=None):
+    """The ``kind`` fact stored for ``path`` at its current stat, or None.
+    """
+    try:
+        stat = stat or os.stat(path)
+        connection = _connection(path)
+        if connection is None:
+            return None
+        row = connection.execute(
+            'SELECT mtime, size, inode, value FROM derived '
+            'WHERE kind = ? AND path = ?',
+            (kind, os.path.abspath(path))).fetchone()
+    except (OSError, sqlite3.Error) as error:
+        logger.debug(f'{path}: derived store unavailable ({error})')
+        return None
+    if row is None or tuple(row[:3]) != (
+            stat.st_mtime, stat.st_size, stat.st_ino):
+        return None
+    return json.loads(row[3])
+
+
+def put(kind, path, value, stat=None):
+    """Store the ``kind`` fact ``value`` (JSON-serializable) for ``path``
+    at its stat."""
+    try:
+        stat = stat or os.stat(path)
+        connection = _connection(path)
+        if connection is None:
+            return
+        connection.execute(
+            'INSERT OR REPLACE INTO derived VALUES (?, ?, ?, ?, ?, ?)',
+            (kind, os.path.abspath(path), stat.st_mtime, stat.st_size,
+             stat.st_ino, json.dumps(value)))
+    except (OSError, sqlite3.Error) as error:
+        logger.debug(f'{path}: derived store unavailable ({error})')
+
+
+def database(path):
+    """The store holding facts about ``path``, or None when it has no
+    build directory to live in."""
+    # Local import: the builder imports node code, which uses the store.
+    from solid_node.core.builder import get_build_dir
+    build_dir = get_build_dir(path)
+    # A relative build directory means no project root was found: it
+    # would resolve against whatever the working directory happens to be.
+    if not os.path.isabs(build_dir) or not os.path.isdir(build_dir):
+        return None
+    return os.path.join(build_dir, DATABASE)
+
+
+def _connection(path):
+    filename = database(path)
+    if filename is None:
+        return None
+    connections = getattr(_connections, 'by_file', None)
+    if connections is None:
+        connections = _connections.by_file = {}
+    connection = connections.get(filename)
+    if connection is not None and not os.path.exists(filename):
+        # The build directory was cleaned under us.
+        connection.close()
+        connection = None
+    if connection is None:
+        # Autocommit: every statement is its own short transaction, so no
+        # reader or writer ever holds the database across a computation.
+        connection = sqlite3.connect(
+            filename, timeout=_BUSY_TIMEOUT, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        version, = connection.execute('PRAGMA user_version').fetchone()
+        if version != _VERSION:
+            connection.execute('DROP TABLE IF EXISTS derived')
+            connection.execute(f'PRAGMA user_version={_VERSION}')
+        connection.execute(_SCHEMA)
+        connections[filename] = connection
+    return connection
@@ -4,6 +4,7 @@
 
 """Exact B-rep geometry shared by nodes and geometric assertions."""
 
+import logging
 import os
 import tempfile
 import time
@@ -15,8 +16,12 @@ from OCP.BRepBuilderAPI import BRepBuilderAPI_Transform
 from OCP.gp import gp_Trsf
 from OCP.TopTools import TopTools_ListOfShape
 
+from solid_node.memory_cache import MemoryCache
 
-_shape_cache = {}
+
+logger = logging.getLogger('node.exact')
+
+_shape_cache = MemoryCache('exact shape')
 
 
 def cached_shape(brep_file):
@@ -29,7 +34,9 @@ def cached_shape(brep_file):
                           if key[0] == brep_file]:
             del _shape_cache[stale_key]
         cached = cq.Shape.importBrep(brep_file)
-        _shape_cache[key] = cached
+        # The BREP's size stands in for the shape's: OCCT has no cheap
+        # measure of what a shape holds in memory.
+        _shape_cache.put(key, cached, os.path.getsize(brep_file))
     return cached
 
 
@@ -85,23 +92,30 @@ def placed_shape(shape, matrix):
         BRepBuilderAPI_Transform(shape.wrapped, transform, True).Shape())
 
 
-def _boolean(operation, first, second, first_name, second_name):
+def _shape_list(shapes):
+    listed = TopTools_ListOfShape()
+    for shape in shapes:
+        listed.Append(shape.wrapped)
+    return listed
+
+
+def _run_boolean(operation, arguments, tools):
     algorithm = {
         'intersection': BRepAlgoAPI_Common,
         'fusion': BRepAlgoAPI_Fuse,
     }[operation]()
-    arguments = TopTools_ListOfShape()
-    arguments.Append(first.wrapped)
-    tools = TopTools_ListOfShape()
-    tools.Append(second.wrapped)
-    algorithm.SetArguments(arguments)
-    algorithm.SetTools(tools)
+    algorithm.SetArguments(_shape_list(arguments))
+    algorithm.SetTools(_shape_list(tools))
     algorithm.SetRunParallel(True)
+    algorithm.Build()
+    if not algorithm.IsDone():
+        raise RuntimeError('kernel reported not-done')
+    return cq.Shape.cast(algorithm.Shape())
+
+
+def _boolean(operation, first, second, first_name, second_name):
     try:
-        algorithm.Build()
-        if not algorithm.IsDone():
-            raise RuntimeError('kernel reported not-done')
-        return cq.Shape.cast(algorithm.Shape())
+        return _run_boolean(operation, [first], [second])
     except Exception as error:
         raise RuntimeError(
             f"Exact {operation} failed for {first_name} and "
@@ -117,6 +131,26 @@ def fuse_shapes(first, second, first_name, second_name):
     return _boolean('fusion', first, second, first_name, second_name)
 
 
+def fuse_all(shapes, names, owner):
+    """Fuse ``shapes``, named ``names``, into the single shape ``owner``.
+
+    One multi-argument boolean fuses them all at once, in parallel, where
+    a left fold runs len(shapes) - 1 booleans against a growing result.
+    Should it fail, they are fused pairwise instead, so the error names
+    the shape that could not be fused.
+    """
+    if len(shapes) > 2:
+        try:
+            return _run_boolean('fusion', shapes[:1], shapes[1:])
+        except Exception as error:
+            logger.info(f'{owner}: fusing {len(shapes)} shapes at once '
+                        f'failed ({error}), fusing them pairwise')
+    result = shapes[0]
+    for shape, name in zip(shapes[1:], names[1:]):
+        result = fuse_shapes(result, shape, owner, name)
+    return result
+
+
 def solid_count(shape):
     return len(shape.Solids())
 
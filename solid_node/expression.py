@@ -0,0 +1,378 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""In-process evaluation of the OpenSCAD expressions solid2 builds.
+
+A symbolic value -- `720.0 * self.time` outside set_keyframe(), or the
+call strings solid_node.math emits for non-linear kinematics -- is an
+OpenSCADConstant holding an OpenSCAD expression string. Resolving it
+used to mean writing a scad file that echoes it and running OpenSCAD,
+once per value, for every placement matrix composed.
+
+The subset solid2 and solid_node.math produce is small: numbers,
+variables ($t and globals registered through solid2), arithmetic with
+OpenSCAD's `^` for power, comparisons, logic, the ternary, and scalar
+builtins. This module parses and evaluates that subset directly, with
+the degree trig from solid_node.math so the two agree by construction
+(ADR-022). Anything else raises UnsupportedExpression, and the caller
+falls back to OpenSCAD.
+
+evaluate_samples() evaluates one expression at many values of $t at
+once, with numpy standing in for each operation, for callers that bake
+a whole animation cycle.
+"""
+
+import math as _math
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from solid_node import math as _degree_math
+
+
+class UnsupportedExpression(ValueError):
+    """The expression uses a construct this evaluator does not cover."""
+
+
+_TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+      | (?P<name>\$?[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<operator>==|!=|<=|>=|&&|\|\||[-+*/%^<>!?:(),])
+    )''', re.VERBOSE)
+
+
+def _round(value):
+    # OpenSCAD rounds halves away from zero; Python's round() to even.
+    return _math.copysign(_math.floor(abs(value) + 0.5), value)
+
+
+def _log(*args):
+    # log(x) is base 10 in OpenSCAD; log(b, x) takes the base first.
+    if len(args) == 1:
+        return _math.log10(args[0])
+    base, value = args
+    return _math.log(value) / _math.log(base)
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+_FUNCTIONS = {
+    'sin': _degree_math.sin,
+    'cos': _degree_math.cos,
+    'tan': _degree_math.tan,
+    'asin': _degree_math.asin,
+    'acos': _degree_math.acos,
+    'atan': _degree_math.atan,
+    'atan2': _degree_math.atan2,
+    'sqrt': _degree_math.sqrt,
+    'abs': abs,
+    'pow': _math.pow,
+    'exp': _math.exp,
+    'ln': _math.log,
+    'log': _log,
+    'floor': _math.floor,
+    'ceil': _math.ceil,
+    'round': _round,
+    'sign': _sign,
+    'min': min,
+    'max': max,
+}
+
+_CONSTANTS = {
+    'PI': _math.pi,
+    'true': True,
+    'false': False,
+}
+
+_BINARY = {
+    '||': lambda a, b: bool(a) or bool(b),
+    '&&': lambda a, b: bool(a) and bool(b),
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': lambda a, b: a / b,
+    '%': _math.fmod,
+    '^': _math.pow,
+}
+
+# numpy counterparts of _FUNCTIONS and _BINARY, elementwise over arrays
+# of $t samples.
+_ARRAY_FUNCTIONS = {
+    'sin': lambda x: np.sin(np.radians(x)),
+    'cos': lambda x: np.cos(np.radians(x)),
+    'tan': lambda x: np.tan(np.radians(x)),
+    'asin': lambda x: np.degrees(np.arcsin(x)),
+    'acos': lambda x: np.degrees(np.arccos(x)),
+    'atan': lambda x: np.degrees(np.arctan(x)),
+    'atan2': lambda y, x: np.degrees(np.arctan2(y, x)),
+    'sqrt': np.sqrt,
+    'abs': np.abs,
+    'pow': np.power,
+    'exp': np.exp,
+    'ln': np.log,
+    'log': lambda *args: (np.log10(args[0]) if len(args) == 1
+                          else np.log(args[1]) / np.log(args[0])),
+    'floor': np.floor,
+    'ceil': np.ceil,
+    'round': lambda x: np.copysign(np.floor(np.abs(x) + 0.5), x),
+    'sign': np.sign,
+    'min': np.minimum,
+    'max': np.maximum,
+}
+
+_ARRAY_BINARY = dict(_BINARY, **{
+    '||': np.logical_or,
+    '&&': np.logical_and,
+    '%': np.fmod,
+    '^': np.power,
+})
+
+# Binary precedence levels, loosest first. `^` is not here: it binds
+# tighter than unary minus and is right-associative, as in OpenSCAD.
+_LEVELS = [
+    ('||',),
+    ('&&',),
+    ('==', '!='),
+    ('<', '<=', '>', '>='),
+    ('+', '-'),
+    ('*', '/', '%'),
+]
+
+
+def _tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if match is None or match.end() == position:
+            raise UnsupportedExpression(
+                f'cannot tokenize {expression[position:]!r}')
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent over the token list, building nested tuples:
+    ('num', value), ('var', name), ('call', name, args),
+    ('unary', op, operand), ('binary', op, left, right) and
+    ('ternary', condition, then, otherwise)."""
+
+    def __init__(self, expression):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def parse(self):
+        tree = self._ternary()
+        if self.position != len(self.tokens):
+            raise UnsupportedExpression(
+                f'unexpected {self.tokens[self.position][1]!r}')
+        return tree
+
+    def _peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][1]
+        return None
+
+    def _take(self, expected=None):
+        if self.position >= len(self.tokens):
+            raise UnsupportedExpression('unexpected end of expression')
+        kind, text = self.tokens[self.position]
+        if expected is not None and text != expected:
+            raise UnsupportedExpression(f'expected {expected!r}, got {text!r}')
+        self.position += 1
+        return kind, text
+
+    def _ternary(self):
+        condition = self._binary(0)
+        if self._peek() != '?':
+            return condition
+        self._take('?')
+        then = self._ternary()
+        self._take(':')
+        otherwise = self._ternary()
+        return ('ternary', condition, then, otherwise)
+
+    def _binary(self, level):
+        if level == len(_LEVELS):
+            return self._unary()
+        left = self._binary(level + 1)
+        while self._peek() in _LEVELS[level]:
+            _, operator = self._take()
+            right = self._binary(level + 1)
+            left = ('binary', operator, left, right)
+        return left
+
+    def _unary(self):
+        if self._peek() in ('-', '+', '!'):
+            _, operator = self._take()
+            return ('unary', operator, self._unary())
+        return self._power()
+
+    def _power(self):
+        base = self._primary()
+        if self._peek() == '^':
+            self._take('^')
+            return ('binary', '^', base, self._unary())
+        return base
+
+    def _primary(self):
+        kind, text = self._take()
+        if kind == 'number':
+            return ('num', float(text))
+        if text == '(':
+            inner = self._ternary()
+            self._take(')')
+            return inner
+        if kind != 'name':
+            raise UnsupportedExpression(f'unexpected {text!r}')
+        if self._peek() != '(':
+            return ('var', text)
+        self._take('(')
+        args = []
+        if self._peek() != ')':
+            args.append(self._ternary())
+            while self._peek() == ',':
+                self._take(',')
+                args.append(self._ternary())
+        self._take(')')
+        if text not in _FUNCTIONS:
+            raise UnsupportedExpression(f'unknown function {text}()')
+        return ('call', text, tuple(args))
+
+
+@lru_cache(maxsize=4096)
+def parse(expression):
+    """The parsed tree of an OpenSCAD expression, cached by its text."""
+    return _Parser(expression).parse()
+
+
+def _registered_variable(name):
+    """A global defined through solid2's set_global_variable(), as the
+    expression string its definition assigns."""
+    from solid2.extensions.greedy_scad_interface.scad_variable import \
+        ScadVariable
+    definition = ScadVariable.registered_variables.get(name)
+    if definition is None:
+        return None
+    match = re.search(rf'^{re.escape(name)}\s*=\s*(.*?);', definition,
+                      re.MULTILINE)
+    return match.group(1) if match else None
+
+
+def _evaluate(tree, variables, resolving):
+    kind = tree[0]
+    if kind == 'num':
+        return tree[1]
+    if kind == 'var':
+        name = tree[1]
+        if name in variables:
+            return variables[name]
+        if name in _CONSTANTS:
+            return _CONSTANTS[name]
+        definition = _registered_variable(name)
+        if definition is None or name in resolving:
+            raise UnsupportedExpression(f'unknown variable {name}')
+        return _evaluate(parse(definition), variables, resolving | {name})
+    if kind == 'unary':
+        operand = _evaluate(tree[2], variables, resolving)
+        if tree[1] == '!':
+            return not operand
+        return -operand if tree[1] == '-' else +operand
+    if kind == 'binary':
+        left = _evaluate(tree[2], variables, resolving)
+        right = _evaluate(tree[3], variables, resolving)
+        return _BINARY[tree[1]](left, right)
+    if kind == 'ternary':
+        condition = _evaluate(tree[1], variables, resolving)
+        return _evaluate(tree[2] if condition else tree[3],
+                         variables, resolving)
+    args = [_evaluate(arg, variables, resolving) for arg in tree[2]]
+    return _FUNCTIONS[tree[1]](*args)
+
+
+def evaluate(expression, time=0.0):
+    """The float value of an OpenSCAD expression at animation time
+    ``time`` -- 0 by default, the $t a plain OpenSCAD run evaluates with.
+
+    Raises UnsupportedExpression for a construct outside the subset, and
+    for a result OpenSCAD would produce but Python's math refuses
+    (division by zero, a domain error): OpenSCAD then decides.
+    """
+    try:
+        value = _evaluate(parse(expression), {'$t': time}, frozenset())
+    except (ArithmeticError, ValueError, TypeError) as error:
+        if isinstance(error, UnsupportedExpression):
+            raise
+        raise UnsupportedExpression(f'{expression}: {error}') from error
+    if isinstance(value, bool):
+        raise UnsupportedExpression(f'{expression} is not a number')
+    return float(value)
+
+
+def _evaluate_array(tree, variables, resolving):
+    """_evaluate() over arrays. Both branches of a ternary are evaluated
+    and selected per sample."""
+    kind = tree[0]
+    if kind == 'var' and tree[1] not in variables:
+        name = tree[1]
+        if name in _CONSTANTS:
+            return _CONSTANTS[name]
+        definition = _registered_variable(name)
+        if definition is None or name in resolving:
+            raise UnsupportedExpression(f'unknown variable {name}')
+        return _evaluate_array(parse(definition), variables,
+                               resolving | {name})
+    if kind in ('num', 'var'):
+        return _evaluate(tree, variables, resolving)
+    if kind == 'unary':
+        operand = _evaluate_array(tree[2], variables, resolving)
+        if tree[1] == '!':
+            return np.logical_not(operand)
+        return -operand if tree[1] == '-' else +operand
+    if kind == 'binary':
+        left = _evaluate_array(tree[2], variables, resolving)
+        right = _evaluate_array(tree[3], variables, resolving)
+        return _ARRAY_BINARY[tree[1]](left, right)
+    if kind == 'ternary':
+        return np.where(_evaluate_array(tree[1], variables, resolving),
+                        _evaluate_array(tree[2], variables, resolving),
+                        _evaluate_array(tree[3], variables, resolving))
+    args = [_evaluate_array(arg, variables, resolving) for arg in tree[2]]
+    return _ARRAY_FUNCTIONS[tree[1]](*args)
+
+
+def evaluate_samples(expression, times):
+    """The float values of an OpenSCAD expression at each animation time
+    in ``times``, as an array of the same shape.
+
+    Evaluated once over the whole array. A sample numpy cannot produce a
+    finite number for is left to evaluate(), sample by sample, which
+    raises UnsupportedExpression where it would.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    try:
+        with np.errstate(all='ignore'):
+            values = np.asarray(_evaluate_array(
+                parse(expression), {'$t': times}, frozenset()))
+    except (ArithmeticError, ValueError, TypeError) as error:
+        if isinstance(error, UnsupportedExpression):
+            raise
+    else:
+        if values.dtype != np.bool_ and np.isfinite(values).all():
+            return np.broadcast_to(values, times.shape).astype(np.float64)
+    return np.array([evaluate(expression, float(time))
+                     for time in times.flat]).reshape(times.shape)
@@ -21,17 +21,27 @@ class Build:
     needs_node = True
 
     def add_arguments(self, parser):
-        pass
+        parser.add_argument('--isolated-renders', action='store_true',
+                            help='Start a fresh builder process after every '
+                                 'rendered STL instead of rendering them all '
+                                 'in one process')
+        parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                            help='Number of STLs rendered at once '
+                                 '(default: number of CPUs)')
 
     def builder(self):
         Builder(
             self.path,
             watch=False,
             lifecycle=True,
+            in_process_renders=not self.isolated_renders,
+            jobs=self.jobs,
         ).start()
 
     def handle(self, args):
         self.path = args.path
+        self.isolated_renders = getattr(args, 'isolated_renders', False)
+        self.jobs = getattr(args, 'jobs', None) or 1
         try:
             resolve_node(self.path)
         except (ProjectManifestError, AmbiguousNodeError) as error:
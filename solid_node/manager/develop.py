@@ -2,12 +2,14 @@
 # Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
 # SPDX-License-Identifier: Apache-2.0
 
+import os
 import sys
 import logging
 from multiprocessing import Process
 from solid_node.core.builder import Builder, BuildOutcome
 from solid_node.viewers.openscad import OpenScadViewer
 from solid_node.viewers.web import WebViewer, WebDevServer
+from solid_node.viewers.web.viewer import build_ready_url
 from solid_node.openscad import OpenScadUnavailable, require_openscad
 
 
@@ -39,6 +41,9 @@ class Develop:
                             help='Debug mode to support breakpoints in webserver')
         parser.add_argument('--callback', metavar='URL',
                             help='POST URL notified after each complete build')
+        parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                            help='Number of STLs rendered at once '
+                                 '(default: number of CPUs)')
 
 
     def openscad(self):
@@ -56,10 +61,15 @@ class Develop:
             is_reload=is_reload,
             callback=callback,
             lifecycle=True,
+            in_process_renders=True,
+            jobs=self.jobs,
+            viewer_callback=self.viewer_callback,
         ).start()
 
     def handle(self, args):
         self.path = args.path
+        self.jobs = getattr(args, 'jobs', None) or 1
+        self.viewer_callback = None
         callback = getattr(args, 'callback', None)
         no_web = getattr(args, 'no_web', False)
         wants_web = args.web or args.web_dev or args.debug_web
@@ -80,7 +90,6 @@ class Develop:
                 sys.stderr.write(f'Error: {error}\n')
                 raise SystemExit(1)
 
-        builder_proc = None
         web_proc = None
         web_dev_proc = None
         openscad_proc = None
@@ -103,8 +112,11 @@ class Develop:
             if args.debug_web:
                 return self.web()
 
+            # The viewer stays up across builds; each builder tells it
+            # when a pass ends, and it pushes that to the browser.
             web_proc = Process(target=self.web)
             web_proc.start()
+            self.viewer_callback = build_ready_url()
 
         if args.debug_builder:
             return self.builder(callback=callback)
@@ -117,13 +129,6 @@ class Develop:
         first_run = True
 
         while True:
-                if web_proc and builder_proc:
-                    logger.info('Restarting WEB')
-                    web_proc.terminate()
-                    web_proc.join()
-                    web_proc = Process(target=self.web)
-                    web_proc.start()
-
                 builder_proc = Process(target=self.builder,
                                        args=(not first_run, None, callback))
                 builder_proc.start()
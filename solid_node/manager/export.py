@@ -2,10 +2,12 @@
 # Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
 # SPDX-License-Identifier: Apache-2.0
 
+import os
 import sys
 import logging
 from solid_node.core.loader import load_node
 from solid_node.core.export import export_node, WidgetBundleMissing
+from solid_node.core.gltf import ANIMATIONS, UnsupportedAnimation, export_glb
 
 
 logger = logging.getLogger('manager.export')
@@ -13,7 +15,8 @@ logger = logging.getLogger('manager.export')
 
 class Export:
     """Exports a node as a static embeddable artifact: manifest.json
-    plus the STL meshes, ready to be served by any static file host."""
+    plus the STL meshes, ready to be served by any static file host, or
+    as a single binary glTF file."""
 
     needs_node = True
 
@@ -37,6 +40,28 @@ class Export:
             help='Number of frames in one animation cycle, '
                  'the resolution of $t (default: 360)',
         )
+        parser.add_argument(
+            '--format',
+            choices=('manifest', 'glb'),
+            default='manifest',
+            help='manifest: manifest.json plus one STL per piece, for the '
+                 'widget (default). glb: a single binary glTF, model.glb',
+        )
+        parser.add_argument(
+            '--animation',
+            choices=ANIMATIONS,
+            default='baked',
+            help='How --format glb carries animated operations: baked '
+                 'into per-frame samplers (default), or as the raw '
+                 'expressions in each node\'s extras',
+        )
+        parser.add_argument(
+            '--bake-frames',
+            action='store_true',
+            help='With --format manifest, evaluate the operations of '
+                 'every animated node at each frame into a binary '
+                 'matrix track, so the viewer plays them back by lookup',
+        )
         parser.add_argument(
             '--no-widget',
             dest='widget',
@@ -52,10 +77,21 @@ class Export:
             sys.stderr.write(f'Error loading node: {e}\n')
             sys.exit(1)
 
+        if args.format == 'glb':
+            output = os.path.join(args.output, 'model.glb')
+            try:
+                export_glb(node, output, fps=args.fps, frames=args.frames,
+                           animation=args.animation)
+            except UnsupportedAnimation as e:
+                sys.stderr.write(f'Error: {e}\n')
+                sys.exit(1)
+            print(f'Exported to {output}')
+            return
+
         try:
             export_node(node, args.output,
                         fps=args.fps, frames=args.frames,
-                        widget=args.widget)
+                        widget=args.widget, bake_frames=args.bake_frames)
         except WidgetBundleMissing as e:
             sys.stderr.write(f'Error: {e}\n')
             sys.exit(1)
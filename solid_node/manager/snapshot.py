@@ -7,6 +7,7 @@ import logging
 from subprocess import run, CalledProcessError
 from solid_node.core.loader import load_node
 from solid_node.core.builder import project_build_lock
+from solid_node.node.flyweight import flyweights
 from solid_node.viewers.openscad import OpenScadRenderer
 from solid_node.openscad import OpenScadUnavailable
 
@@ -213,6 +214,7 @@ class Snapshot:
             node = load_node(self.path)
             # set_keyframe is a no-op for non-animated nodes
             node.set_keyframe(self.time)
-            node.assemble()
+            with flyweights.build():
+                node.assemble()
 
         return node
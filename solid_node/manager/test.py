@@ -13,6 +13,7 @@ from solid_node.core.loader import (
     AmbiguousNodeError, project_root, _defined_classes,
 )
 from solid_node.core.builder import project_build_lock
+from solid_node.node.flyweight import flyweights
 from solid_node.node.base import AbstractBaseNode
 
 
@@ -113,9 +114,10 @@ class Test:
             self.fail(str(error))
         node.set_keyframe(time)
         rendered = node.render()
-        node.assemble()
-        with project_build_lock():
-            node.build_stls()
+        with flyweights.build():
+            node.assemble()
+            with project_build_lock():
+                node.build_stls()
         return node
 
     def ensure_node_class(self, path):
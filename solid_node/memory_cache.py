@@ -0,0 +1,162 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""One memory budget for the in-process geometry caches.
+
+The base mesh cache (node/base.py), the manifold cache (test.py), the
+exact shape cache (exact.py) and the fingerprint cache (core/pieces.py)
+are keyed on (path, mtime) and only ever dropped an entry when the same
+path came back with a newer mtime. A long ``solid develop`` session or a
+parameter sweep touching hundreds of distinct STLs kept every one of
+them, and the process grew to gigabytes.
+
+Each of those caches is now a MemoryCache. They keep their dict-like
+interface and their own stale-mtime eviction, but every entry is also
+charged, at its estimated size, to one budget they share:
+``SOLID_MEMORY_CACHE_SIZE`` bytes (``K``, ``M`` and ``G`` suffixes
+accepted, 2G by default). Storing an entry that takes the total over the
+budget evicts the least recently used entries of whichever caches hold
+them. Each cache counts its hits, misses, evictions and bytes.
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+
+
+logger = logging.getLogger('node.memory_cache')
+
+_DEFAULT_SIZE = '2G'
+
+_SIZE_SUFFIXES = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def parse_size(configured, variable):
+    """Bytes in a size such as ``512M``, read from environment
+    ``variable``."""
+    match = re.fullmatch(r'\s*(\d+)\s*([KMG]?)B?\s*', configured.upper())
+    if match is None:
+        raise ValueError(f'{variable}={configured!r} is not a size')
+    return int(match.group(1)) * _SIZE_SUFFIXES[match.group(2)]
+
+
+def memory_budget():
+    """The budget shared by every MemoryCache, in bytes."""
+    return parse_size(
+        os.environ.get('SOLID_MEMORY_CACHE_SIZE', _DEFAULT_SIZE),
+        'SOLID_MEMORY_CACHE_SIZE')
+
+
+class _Budget:
+    """Recency order and sizes of every cached entry, across caches."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._entries = OrderedDict()  # (cache, key) -> bytes
+        self.bytes = 0
+
+    def touch(self, cache, key):
+        self._entries.move_to_end((cache, key))
+
+    def charge(self, cache, key, size):
+        self.release(cache, key)
+        self._entries[(cache, key)] = size
+        self.bytes += size
+        budget = memory_budget()
+        # The entry just stored is kept even when it alone exceeds the
+        # budget: its caller is about to use it.
+        while self.bytes > budget and len(self._entries) > 1:
+            (victim, victim_key), _ = next(iter(self._entries.items()))
+            victim._evict(victim_key)
+
+    def release(self, cache, key):
+        size = self._entries.pop((cache, key), None)
+        if size is not None:
+            self.bytes -= size
+        return size
+
+
+_budget = _Budget()
+
+
+class MemoryCache:
+    """A dict of cached geometry whose entries count against the shared
+    memory budget. ``put`` takes the entry's estimated size in bytes."""
+
+    def __init__(self, name):
+        self.name = name
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    def __repr__(self):
+        return (f'<MemoryCache {self.name}: {len(self._values)} entries, '
+                f'{self.bytes} bytes>')
+
+    def get(self, key, default=None):
+        with _budget.lock:
+            if key in self._values:
+                self.hits += 1
+                _budget.touch(self, key)
+                return self._values[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, size):
+        with _budget.lock:
+            self._values[key] = value
+            self.bytes -= _budget.release(self, key) or 0
+            self.bytes += size
+            _budget.charge(self, key, size)
+
+    def _evict(self, key):
+        del self[key]
+        self.evictions += 1
+        logger.debug(f'{key} evicted from the {self.name} cache')
+
+    def __delitem__(self, key):
+        with _budget.lock:
+            del self._values[key]
+            self.bytes -= _budget.release(self, key) or 0
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __iter__(self):
+        return iter(list(self._values))
+
+    def __len__(self):
+        return len(self._values)
+
+    def clear(self):
+        with _budget.lock:
+            for key in list(self._values):
+                del self[key]
+
+    def stats(self):
+        """The counters, as a dict."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'bytes': self.bytes,
+                'entries': len(self._values)}
+
+
+def mesh_size(mesh):
+    """Estimated bytes held by a mesh: its vertex and face arrays."""
+    return mesh.vertices.nbytes + mesh.faces.nbytes
+
+
+def manifold_size(manifold):
+    """Estimated bytes held by a manifold3d.Manifold: float32 vertex
+    positions and uint32 triangle indices, as it was built from."""
+    return (manifold.num_vert() + manifold.num_tri()) * 3 * 4
+
+
+def object_size(value):
+    """Bytes held by a small Python object."""
+    return sys.getsizeof(value)
@@ -4,9 +4,11 @@
 
 import sys
 from solid2 import import_stl
+from solid_node import render_cache
 from solid_node.exact import (cached_shape, shape_from_rendered, write_brep,
                               write_stl)
 from solid_node.node.leaf import LeafNode
+from solid_node.node.render_pool import render_pool
 
 
 class CheckCQEditor(type):
@@ -39,6 +41,23 @@ class CadQueryNode(LeafNode, metaclass=CheckCQEditor):
         self.validate(rendered)
         return shape_from_rendered(rendered)
 
+    def _render_elsewhere(self):
+        """Stale artifacts are rendered by a pool worker when a build
+        runs several jobs; render() would otherwise run right here,
+        while the parent assembles."""
+        return render_pool.submit(self) is not None
+
+    def import_optimized(self):
+        if self.rigid and render_pool.pending(self.stl_file):
+            return self._colorize(self._import_stl())
+        return super().import_optimized()
+
+    def generate_stl(self):
+        job = render_pool.pending(self.stl_file)
+        if job is not None:
+            raise job
+        return super().generate_stl()
+
     def as_scad(self, rendered):
         """Export the model to STL and returns a scad code to render it.
 
@@ -50,7 +69,15 @@ class CadQueryNode(LeafNode, metaclass=CheckCQEditor):
         """
         shape = shape_from_rendered(rendered)
         if not self._up_to_date(self.stl_file):
-            write_stl(shape, self.stl_file, self.mtime)
+            key = render_cache.exact_key(self, 'stl')
+            if not render_cache.fetch(key, self.stl_file, self.mtime):
+                write_stl(shape, self.stl_file, self.mtime)
+                render_cache.store(key, self.stl_file)
+            self._record_digest(self.stl_file)
         if not self._up_to_date(self.brep_file):
-            write_brep(shape, self.brep_file, self.mtime)
+            key = render_cache.exact_key(self, 'brep')
+            if not render_cache.fetch(key, self.brep_file, self.mtime):
+                write_brep(shape, self.brep_file, self.mtime)
+                render_cache.store(key, self.brep_file)
+            self._record_digest(self.brep_file)
         return import_stl(self.local_stl)
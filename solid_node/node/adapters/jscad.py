@@ -57,4 +57,6 @@ class JScadNode(LeafNode):
             os.utime(self.stl_file, (time.time(), self.mtime))
         except FileNotFoundError:
             pass
+        else:
+            self._record_digest(self.stl_file)
         return import_stl(self.local_stl)
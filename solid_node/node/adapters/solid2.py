@@ -7,8 +7,11 @@ import re
 import tempfile
 from subprocess import Popen
 from solid2 import scad_render
-from solid_node.openscad import require_openscad
+from solid2.core.object_base import OpenSCADConstant
+from solid_node.expression import UnsupportedExpression, evaluate
+from solid_node.openscad import openscad_binary, require_openscad
 from solid_node.node.leaf import LeafNode
+from solid_node.node.stat_cache import source_stats
 
 
 class Solid2Node(LeafNode):
@@ -24,44 +27,122 @@ class Solid2Node(LeafNode):
 
     def as_number(self, n):
         """Receives a solid2 function result and calculates its number.
-        uses an openscad process internally to do the calculation."""
-        if type(n).__module__.startswith('solid2'):
-            # This is very clumsy, but it works. Trimesh cannot load
-            # translated / rotated mesh, and transforming meshes after loading
-            # requires knowing the final number in python memory.
-            # If it's a scad function, then we need to get from OpenScad.
-
+        Expressions in the subset solid_node.expression covers are
+        evaluated in process; anything else goes through an openscad
+        process, unless set_keyframe() already resolved it in its batch."""
+        if not _is_symbolic(n):
+            return n
+        time = self._keyframe_time or 0
+        if isinstance(n, OpenSCADConstant):
+            try:
+                return evaluate(n.value, time)
+            except UnsupportedExpression:
+                pass
+        # This is very clumsy, but it works. Trimesh cannot load
+        # translated / rotated mesh, and transforming meshes after loading
+        # requires knowing the final number in python memory.
+        # If it's a scad function, then we need to get from OpenScad.
+        key = (_render_expression(n)[1], time)
+        if key not in _current_values():
             openscad = require_openscad(
                 f'node {self.name}',
                 'symbolic value evaluation uses OpenSCAD')
-            lines = scad_render(n).split('\n')
-            code = []
-            while lines[0].startswith('include'):
-                code.append(lines.pop(0))
-            while not lines[0].strip():
-                lines.pop(0)
-            code.append('echo(')
-            while lines:
-                line = lines.pop(0)
-                if line.strip():
-                    code.append(line)
-            code = '\n'.join(code)
-            code = re.sub(r";$", ");", code)
-
-            scad_file = tempfile.mktemp(suffix='.scad')
-            result_file = tempfile.mktemp('.echo')
+            resolve_symbolic_values([n], time, openscad)
+        return _openscad_values[key]
+
+
+# Numbers OpenSCAD computed for symbolic values, by (expression text, $t),
+# for every keyframe resolved since the build stat cache was last
+# invalidated: an expression's includes are sources too, so the values
+# go with it (see stat_cache.py), not when $t moves to another keyframe.
+_openscad_values = {}
+_values_generation = source_stats.generation
+
+
+def _current_values():
+    """_openscad_values, emptied first if the sources may have changed
+    since it was filled."""
+    global _values_generation
+    if _values_generation != source_stats.generation:
+        _openscad_values.clear()
+        _values_generation = source_stats.generation
+    return _openscad_values
+
+
+def _is_symbolic(value):
+    return type(value).__module__.startswith('solid2')
+
 
+def _render_expression(value):
+    """Split scad_render(value) into its include lines and the bare
+    expression, without the statement's trailing semicolon."""
+    includes = []
+    body = []
+    for line in scad_render(value).split('\n'):
+        if line.startswith('include'):
+            includes.append(line)
+        elif line.strip():
+            body.append(line)
+    return includes, re.sub(r';\s*$', '', '\n'.join(body))
+
+
+def resolve_symbolic_values(values, time=0, openscad=None):
+    """Compute, in a single openscad run, every value in ``values`` that
+    the in-process evaluator cannot, with $t set to ``time``, so that
+    Solid2Node.as_number() finds them already resolved.
+
+    Without an ``openscad`` binary the batch is skipped when none is
+    installed: as_number() then raises for the value that needs it, with
+    the node that asked, if anything ever does.
+    """
+    time = time or 0
+    values_known = _current_values()
+    includes = []
+    pending = []
+    for value in values:
+        if not _is_symbolic(value):
+            continue
+        if isinstance(value, OpenSCADConstant):
             try:
-                open(scad_file, 'w').write(code)
-                proc = Popen([openscad, '-o', result_file, scad_file])
-                proc.wait()
-                result = open(result_file).read()
-                result = result.replace('ECHO: ', '').strip()
-                n = int(result)
-            finally:
-                if os.path.exists(scad_file):
-                    os.remove(scad_file)
-                if os.path.exists(result_file):
-                    os.remove(result_file)
-
-        return n
+                evaluate(value.value, time)
+                continue
+            except UnsupportedExpression:
+                pass
+        value_includes, expression = _render_expression(value)
+        if (expression, time) in values_known or expression in pending:
+            continue
+        includes.extend(line for line in value_includes
+                        if line not in includes)
+        pending.append(expression)
+
+    if not pending:
+        return
+    openscad = openscad or openscad_binary()
+    if openscad is None:
+        return
+
+    code = includes + [f'$t = {time!r};']
+    code += [f'echo({expression});' for expression in pending]
+
+    scad_file = tempfile.mktemp(suffix='.scad')
+    result_file = tempfile.mktemp('.echo')
+
+    try:
+        open(scad_file, 'w').write('\n'.join(code) + '\n')
+        proc = Popen([openscad, '-o', result_file, scad_file])
+        proc.wait()
+        results = [line[len('ECHO: '):].strip()
+                   for line in open(result_file).read().split('\n')
+                   if line.startswith('ECHO: ')]
+    finally:
+        if os.path.exists(scad_file):
+            os.remove(scad_file)
+        if os.path.exists(result_file):
+            os.remove(result_file)
+
+    if len(results) != len(pending):
+        raise RuntimeError(
+            f'OpenSCAD echoed {len(results)} values for {len(pending)} '
+            f'symbolic expressions')
+    for expression, result in zip(pending, results):
+        values_known[(expression, time)] = float(result)
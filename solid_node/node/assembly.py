@@ -64,13 +64,14 @@ class AssemblyNode(InternalNode):
         if render is not None and not getattr(render, '_idempotent', False):
             cls.render = _idempotent_render(render)
 
-    def set_keyframe(self, time):
+    def _apply_keyframe(self, time, visited):
         """Set a fixed time for keyframes and tests, propagating it
         down the tree so nested assemblies render numerically too."""
+        super()._apply_keyframe(time, visited)
         self._time = time
         rendered = self.render()
         for child in rendered or ():
-            child.set_keyframe(time)
+            child._apply_keyframe(time, visited)
 
     @property
     def time(self):
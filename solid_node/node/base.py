@@ -8,15 +8,21 @@ import time
 import inspect
 import hashlib
 import logging
+import shutil
 import tempfile
 import numpy as np
-import trimesh
 from decimal import Decimal
 from subprocess import Popen
 from solid2 import scad_render, import_stl, color
+from solid_node import render_cache
+from solid_node.memory_cache import MemoryCache, mesh_size
 from solid_node.openscad import require_openscad
 from .operations import Rotation, Translation
-from .sources import source_closure
+from .sources import closure_digest, source_closure
+from .flyweight import flyweights
+from .stat_cache import source_stats
+from . import indexed_mesh, shared_meshes
+from .stl import load_stl
 
 
 logger = logging.getLogger('node.base')
@@ -38,35 +44,142 @@ def _atomic_write_text(path, content, mtime):
         raise
 
 
-# Module-level cache of loaded base meshes (no operations applied),
-# keyed on (stl_file, mtime) -- skill-repo docs/performance-improvement.md
-# fix 1. Before this cache, AbstractBaseNode.mesh called trimesh.load()
-# on EVERY access; a single real STL can take over a second to load
-# (the v8-engine camshaft, 660k faces), and a test suite hits `.mesh`
-# thousands of times. Keying on mtime (not just path) means a rebuilt
-# STL is picked up automatically -- and any stale entry under the
-# file's OLD mtime is evicted on the next access under its new one, so
-# a rebuild loop doesn't accumulate one cached mesh per rebuild.
-_base_mesh_cache = {}
+def _read_text(path):
+    try:
+        with open(path) as fh:
+            return fh.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write_digest(path, digest):
+    """Record ``digest``, the source closure the artifact at ``path`` was
+    just produced from, beside it; nothing when it is None."""
+    if digest is not None:
+        _atomic_write_text(f'{path}.digest', digest, time.time())
+
+
+def _restamp(path, mtime):
+    """Give the artifact at ``path`` the mtime ``mtime``. A file linked
+    from elsewhere -- the render cache, another worktree's build -- is
+    copied first, so the other links keep the mtime they want."""
+    if os.stat(path).st_nlink == 1:
+        os.utime(path, (time.time(), mtime))
+        return
+    descriptor, temporary = tempfile.mkstemp(
+        prefix=f'.{os.path.basename(path)}.', suffix='.tmp',
+        dir=os.path.dirname(path) or '.')
+    os.close(descriptor)
+    try:
+        shutil.copyfile(path, temporary)
+        os.utime(temporary, (time.time(), mtime))
+        os.replace(temporary, path)
+    except Exception:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def _digest_freshness():
+    """Whether SOLID_FRESHNESS asks for source digests to decide
+    freshness, rather than mtimes alone."""
+    mode = os.environ.get('SOLID_FRESHNESS', 'mtime')
+    if mode not in ('mtime', 'digest'):
+        raise ValueError(
+            f"SOLID_FRESHNESS={mode!r}; expected 'mtime' or 'digest'")
+    return mode == 'digest'
+
+
+# Module-level cache of loaded base meshes (no operations applied) --
+# skill-repo docs/performance-improvement.md fix 1. Before this cache,
+# AbstractBaseNode.mesh called trimesh.load() on EVERY access; a single
+# real STL can take over a second to load (the v8-engine camshaft, 660k
+# faces), and a test suite hits `.mesh` thousands of times. Entries are
+# keyed on the STL's content fingerprint, so byte-identical pieces built
+# by different nodes share one mesh, and _base_mesh_paths remembers the
+# key each path had at its last stat (see _content_key): a rebuilt STL
+# is picked up on its next access, and the entry for its old content is
+# evicted then, so a rebuild loop doesn't accumulate one cached mesh per
+# rebuild. Distinct STLs are bounded by the memory budget all geometry
+# caches share (memory_cache.py).
+_base_mesh_cache = MemoryCache('base mesh')
+_base_mesh_paths = {}
+
+
+def _stat_identity(stat):
+    # The inode too: mtime and size do not tell renders apart (see
+    # derived_store.py).
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _remember_key(stl_file, stat, key, cache, paths):
+    """Record in ``paths`` that ``cache`` keeps ``stl_file`` at ``stat``
+    under ``key``, and return it. The entry under the key the file had
+    before is dropped -- unless another path still has it -- so a
+    rebuild loop does not accumulate one entry per rebuild."""
+    previous = paths.get(stl_file)
+    paths[stl_file] = (_stat_identity(stat), key)
+    if previous is not None and previous[1] != key:
+        stale = previous[1]
+        if stale in cache and all(
+                other != stale for _, other in paths.values()):
+            del cache[stale]
+    return key
+
+
+def _content_key(stl_file, cache, paths, stat=None):
+    """The content fingerprint ``cache`` keeps ``stl_file``'s geometry
+    under, only computed when the file's stat changed since ``paths``
+    last saw it."""
+    stat = stat or os.stat(stl_file)
+    remembered = paths.get(stl_file)
+    if remembered is not None and remembered[0] == _stat_identity(stat):
+        return remembered[1]
+    # Local import: core.pieces imports this module.
+    from solid_node.core.pieces import fingerprint_artifact
+    return _remember_key(stl_file, stat, fingerprint_artifact(stl_file),
+                         cache, paths)
 
 
 def cached_base_mesh(stl_file):
     """The node's immutable base mesh (STL geometry, no operations
-    applied), loaded once per (stl_file, mtime) and shared across every
-    caller. Returns the cached object itself -- callers that need a
-    mutable copy (AbstractBaseNode.mesh) must .copy() it; callers that
-    only read it (e.g. the AABB broad-phase's local .bounds, or
-    solid_node/core/pieces.py's per-artifact geometry facts) can use it
-    directly. Public: core/pieces.py reads the same cache a build or
-    test may already have populated, rather than loading independently."""
-    mtime = os.path.getmtime(stl_file)
-    key = (stl_file, mtime)
-    cached = _base_mesh_cache.get(key)
-    if cached is None:
-        for stale_key in [k for k in _base_mesh_cache if k[0] == stl_file]:
-            del _base_mesh_cache[stale_key]
-        cached = trimesh.load(stl_file)
-        _base_mesh_cache[key] = cached
+    applied), loaded once per content and shared across every caller
+    and every STL with the same bytes. Returns the cached
+    stl.CompactMesh itself: float32 vertices and int32 faces, read-only.
+    Callers that need a trimesh (AbstractBaseNode.mesh,
+    solid_node/core/pieces.py's per-artifact geometry facts) take a
+    float64 one from its .copy() or .placed(); callers that only read
+    arrays or bounds (e.g. the AABB broad-phase's local .bounds) use it
+    directly. Public: core/pieces.py reads the same cache a build or test
+    may already have populated, rather than loading independently.
+    Loaded through stl.load_stl, not trimesh.load: see stl.py. With
+    SOLID_SHARED_MESHES set, a mesh another process already loaded is
+    mapped from shared memory instead (see shared_meshes.py), and a
+    current indexed mesh beside the STL is read rather than the STL
+    itself (see indexed_mesh.py)."""
+    stat = os.stat(stl_file)
+    remembered = _base_mesh_paths.get(stl_file)
+    if remembered is not None and remembered[0] == _stat_identity(stat):
+        cached = _base_mesh_cache.get(remembered[1])
+        if cached is not None:
+            return cached
+    # A published segment is found by stat and mapped, not copied onto
+    # the heap, so it is kept under its stat: fingerprinting it would
+    # read the very STL the segment spares this process.
+    cached = shared_meshes.attach(stl_file, stat)
+    if cached is not None:
+        key = _remember_key(stl_file, stat,
+                            (stl_file,) + _stat_identity(stat),
+                            _base_mesh_cache, _base_mesh_paths)
+    else:
+        key = _content_key(stl_file, _base_mesh_cache, _base_mesh_paths,
+                           stat)
+        cached = _base_mesh_cache.get(key)
+        if cached is not None:
+            return cached
+        cached = indexed_mesh.load(stl_file) or load_stl(stl_file)
+        shared_meshes.publish(stl_file, stat, cached)
+    _base_mesh_cache.put(key, cached, mesh_size(cached))
     return cached
 
 
@@ -279,6 +392,10 @@ class AbstractBaseNode:
     # this node's mesh.
     _parent = None
 
+    # The time of the last set_keyframe(), the $t symbolic values are
+    # resolved at; None outside keyframes, where OpenSCAD's $t is 0.
+    _keyframe_time = None
+
     # Set to false to render scad directly instead of stls
     # Only works in openscad viewer
     optimize = True
@@ -303,6 +420,9 @@ class AbstractBaseNode:
         self._explicit_name = name is not None
         self.name = name or self.__class__.__name__
         self.uniq_id = _build_uniq_id(self.__class__, args, kwargs)
+        # What the node was constructed with, for the render pool to
+        # construct it again in a worker (see render_pool.py).
+        self._arguments = (args, kwargs)
 
         # A list of rotations and translations to be applied to object
         # after rendering. Operations done this way will be applied after
@@ -386,9 +506,24 @@ class AbstractBaseNode:
         raise NotImplementedError
 
     def set_keyframe(self, time):
-        """Set a fixed time for keyframes and tests.
-        No-op for non-animated nodes; overridden by AssemblyNode."""
-        pass
+        """Set a fixed time for keyframes and tests, then resolve every
+        symbolic value the operations of the tree still hold in a single
+        batch, instead of one OpenSCAD run per value as they are read."""
+        visited = []
+        self._apply_keyframe(time, visited)
+        from .adapters.solid2 import Solid2Node, resolve_symbolic_values
+        resolve_symbolic_values([
+            value
+            for node in visited if isinstance(node, Solid2Node)
+            for operation in node.operations
+            for value in operation.inputs
+        ], time)
+
+    def _apply_keyframe(self, time, visited):
+        """Record the keyframe time on this node and add it to
+        ``visited``. Only AssemblyNode has anything to animate."""
+        self._keyframe_time = time
+        visited.append(self)
 
     def assemble(self, root=None):
         """Renders this node and returns an optimized version
@@ -399,12 +534,25 @@ class AbstractBaseNode:
         if root:
             self.root = root
 
-        if self._render_can_be_skipped():
+        key = self._flyweight_key()
+        shared = flyweights.get(key)
+        if shared is not None:
+            # An identical instance already did everything below in this
+            # build (see flyweight.py); only the operations are ours.
+            self.model, assembled = shared
+        elif self._render_can_be_skipped():
             # Everything below would recompute an artifact that is
             # already on disk and already current. import_optimized()
             # imports it instead; self.model stays unset and is
             # rendered lazily if something actually asks for the scad.
             assembled = self.import_optimized()
+            flyweights.put(key, (self.model, assembled))
+        elif self._render_elsewhere():
+            # A worker process is writing this node's stale artifacts;
+            # import the STL it will publish. self.model stays unset, as
+            # above.
+            assembled = self.import_optimized()
+            flyweights.put(key, (self.model, assembled))
         else:
             rendered = self.render()
 
@@ -418,6 +566,7 @@ class AbstractBaseNode:
                 assembled = self.import_optimized()
             else:
                 assembled = self.model
+            flyweights.put(key, (self.model, assembled))
 
         for operation in self.operations:
             # Apply scad operation
@@ -427,6 +576,27 @@ class AbstractBaseNode:
 
         return assembled
 
+    def discard_assembly(self):
+        """Forget what assemble() produced for this node and everything
+        below it, so the next assemble() starts over.
+
+        A parent assembled while a child's STL was still missing inlines
+        the child's geometry instead of importing it. Once that STL has
+        been rendered, assembling again lets the parent import it, and
+        lets a leaf whose artifacts are now current skip its render.
+        """
+        self._assembled = False
+        flyweights.forget(self._flyweight_key())
+        for child in self.children:
+            child.discard_assembly()
+
+    def _flyweight_key(self):
+        """What identifies this node's assembly before operations among
+        identical instances, or None when it is not shared. None here:
+        an internal node's children are its own. LeafNode overrides.
+        """
+        return None
+
     def _render_can_be_skipped(self):
         """Whether assemble() can import this node's artifact instead of
         producing it. False here: an internal node's file set is the
@@ -437,6 +607,13 @@ class AbstractBaseNode:
         """
         return False
 
+    def _render_elsewhere(self):
+        """Whether another process took over producing this node's
+        artifacts. False here: CadQueryNode hands them to the render pool
+        (see render_pool.py) during a build with several jobs.
+        """
+        return False
+
     def _require_model(self):
         """This node's own geometry as scad.
 
@@ -455,12 +632,14 @@ class AbstractBaseNode:
 
     def import_optimized(self):
         if self.rigid and self._up_to_date(self.stl_file):
-            basedir = os.path.relpath(self.basedir, self.root)
-            local_stl = os.path.join(basedir, self.local_stl)
-            imported_stl = import_stl(local_stl)
-            return self._colorize(imported_stl)
+            return self._colorize(self._import_stl())
         return self._colorize(self.model)
 
+    def _import_stl(self):
+        """This node's STL, imported relative to the root's scad."""
+        basedir = os.path.relpath(self.basedir, self.root)
+        return import_stl(os.path.join(basedir, self.local_stl))
+
     def _colorize(self, scad_code):
         if self.color is None:
             return scad_code
@@ -483,7 +662,7 @@ class AbstractBaseNode:
     def mtime(self):
         """Maximum mtime in source file of all nodes rendered inside this one"""
         return max([
-            os.path.getmtime(path)
+            source_stats.getmtime(path)
             for path in self.files
         ])
 
@@ -516,6 +695,7 @@ class AbstractBaseNode:
 
     def generate_scad(self):
         _atomic_write_text(self.scad_file, self.scad_code, self.mtime)
+        self._record_digest(self.scad_file)
         logger.info(f"{self.scad_file} generated with {self.mtime}!")
 
     def trigger_stl(self):
@@ -564,6 +744,10 @@ class AbstractBaseNode:
             f'node {node_name} ({backend} backend)',
             'its backend renders this STL through OpenSCAD')
 
+        cache_key = render_cache.scad_key(self.scad_file, openscad)
+        if render_cache.fetch(cache_key, self.stl_file, self.mtime):
+            return self._record_digest(self.stl_file)
+
         fh = open(self.lock_file, 'w')
 
         os.makedirs(os.path.dirname(self.stl_file) or '.', exist_ok=True)
@@ -579,7 +763,8 @@ class AbstractBaseNode:
         fh.close()
         logger.info(f'Job started with pid {proc.pid}')
         raise StlRenderStart(proc, self.stl_file, temporary, self.mtime,
-                             self.lock_file)
+                             self.lock_file, cache_key,
+                             self._source_digest())
 
     @property
     def stl_builder_command(self):
@@ -661,21 +846,21 @@ class AbstractBaseNode:
         """The node's mesh in WORLD coordinates: its own operations
         applied first, then each ancestor's, up the assembled tree —
         the same composition the viewer renders. The base geometry is
-        loaded once per (stl_file, mtime) (see _cached_base_mesh) and
-        always returned as a fresh COPY with a single composed world
-        matrix applied (see _compose_world_matrix) -- callers are free
-        to mutate the result; the cached base mesh never is."""
-        mesh = cached_base_mesh(self.stl_file).copy()
-        mesh.apply_transform(_compose_world_matrix(self))
-        return mesh
-
-    def build_stls(node):
-        while True:
-            try:
-                node.trigger_stl()
-                return
-            except StlRenderStart as job:
-                job.wait()
+        loaded once per STL content (see cached_base_mesh) and
+        always returned as a fresh stl.PlacedMesh, a trimesh.Trimesh
+        carrying a single composed world matrix (see
+        _compose_world_matrix) that copies and transforms the base
+        geometry when its vertices or faces are first read -- callers are
+        free to mutate the result; the cached base mesh never is."""
+        return cached_base_mesh(self.stl_file).placed(
+            _compose_world_matrix(self))
+
+    def build_stls(self, jobs=1):
+        """Render every pending STL in this tree, ``jobs`` openscad
+        processes at a time."""
+        # Local import: the scheduler drives nodes, so it imports this module.
+        from .scheduler import RenderScheduler
+        RenderScheduler(self, jobs).run()
 
     def save_checkpoint(self):
         """Sets a checkpoint on self.operations, so that state can
@@ -691,10 +876,43 @@ class AbstractBaseNode:
 
 
     def _up_to_date(self, path):
-        return (
-            os.path.exists(path) and
-            os.path.getmtime(path) == self.mtime
-        )
+        """Whether the artifact at ``path`` was produced from the current
+        sources: its mtime is the newest source mtime.
+
+        With SOLID_FRESHNESS=digest, an artifact whose mtime no longer
+        matches is still current when the digest of the source closure
+        recorded beside it when it was produced (see _record_digest)
+        matches -- a save without changes, a checkout round trip or a
+        formatter pass moves mtimes, not content. It is then restamped
+        with the new mtime, so everything else reading mtimes agrees.
+        """
+        if not os.path.exists(path):
+            return False
+        mtime = self.mtime
+        if os.path.getmtime(path) == mtime:
+            return True
+        if not _digest_freshness():
+            return False
+
+        recorded = f'{path}.digest'
+        if _read_text(recorded) == closure_digest(self.files):
+            _restamp(path, mtime)
+            return True
+        # About to be replaced: a digest left behind would vouch for the
+        # next artifact before it is checked against its own sources.
+        if os.path.exists(recorded):
+            os.remove(recorded)
+        return False
+
+    def _source_digest(self):
+        """The digest of this node's source closure when
+        SOLID_FRESHNESS=digest asks for one, else None."""
+        return closure_digest(self.files) if _digest_freshness() else None
+
+    def _record_digest(self, path):
+        """Record beside the artifact just produced at ``path`` the
+        sources it was produced from, for _up_to_date."""
+        _write_digest(path, self._source_digest())
 
     def _make_build_dirs(self):
         # The build directory is absolute once anchored on the project root,
@@ -704,21 +922,46 @@ class AbstractBaseNode:
 
 class StlRenderStart(Exception):
 
-    def __init__(self, proc, stl_file, temporary_file, mtime, lock_file):
+    def __init__(self, proc, stl_file, temporary_file, mtime, lock_file,
+                 cache_key=None, digest=None):
         super().__init__()
         self.proc = proc
         self.stl_file = stl_file
         self.temporary_file = temporary_file
         self.mtime = mtime
         self.lock_file = lock_file
+        self.cache_key = cache_key
+        # The source digest the render started from, see _write_digest.
+        self.digest = digest
+
+    @property
+    def worker(self):
+        """What is rendering, for the log."""
+        return f'pid {self.proc.pid}'
+
+    def done(self):
+        """Whether the render has exited."""
+        return self.proc.poll() is not None
 
     def finish(self):
         os.utime(self.temporary_file, (time.time(), self.mtime))
         os.replace(self.temporary_file, self.stl_file)
+        _write_digest(self.stl_file, self.digest)
         logger.info(f"{self.stl_file} generated with {self.mtime}!")
+        render_cache.store(self.cache_key, self.stl_file)
         if os.path.exists(self.lock_file):
             os.remove(self.lock_file)
 
+    def cancel(self):
+        """Stop the render and discard whatever it wrote."""
+        if self.proc.poll() is None:
+            self.proc.terminate()
+            self.proc.wait()
+        for path in (self.temporary_file, self.lock_file):
+            if os.path.exists(path):
+                os.remove(path)
+        logger.info(f"{self.stl_file} cancelled")
+
     def wait(self):
         logger.info(f"waiting for {self.stl_file} ...")
         self.proc.wait()
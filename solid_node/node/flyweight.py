@@ -0,0 +1,91 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Identical leaves assembled once per build.
+
+An engine holding eight ``Piston()`` with the same parameters has eight
+nodes with one uniq_id, one scad file and one STL. InternalNode.as_scad
+assembles each of them, and each one rendered, validated, converted to
+scad, wrote the same scad file and stat()ed the same artifacts again.
+
+While a build is active, the first leaf to assemble records what it
+produced before its operations -- its model and the imported or inlined
+geometry -- under its artifact identity, and every identical leaf takes
+that instead of doing the work. Operations, _parent and the rest of the
+instance stay its own: each instance applies its own operations on top
+of the shared result. solid2 objects hold no reference to their parents,
+so one object can sit under any number of them.
+
+Only leaves share: an internal node's children are instances of their
+own, linked to it while it assembles. An entry is dropped when its node
+discards its assembly -- the scheduler does that once an STL has been
+rendered, so the next pass imports it -- and whenever the build stat
+cache is invalidated, since the artifact state it recorded may have
+changed with the sources. Outside a build nothing is shared.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+
+from .stat_cache import source_stats
+
+
+logger = logging.getLogger('node.flyweight')
+
+
+class Flyweights:
+    """Build-scoped registry of what identical leaves assembled, with
+    counters."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.active = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """The entry stored for ``key`` in this build, or None."""
+        if not self.active or key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == source_stats.generation:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if not self.active or key is None:
+            return
+        with self._lock:
+            self._entries[key] = (source_stats.generation, value)
+
+    def forget(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    @contextmanager
+    def build(self):
+        """Share assembled leaves for the duration of one build, then
+        report how many assemblies that saved. Nested builds share the
+        outer one's registry."""
+        if self.active:
+            yield self
+            return
+        self._entries.clear()
+        self.hits = self.misses = 0
+        self.active = True
+        try:
+            yield self
+        finally:
+            self.active = False
+            self._entries.clear()
+            logger.info(f'{self.hits} of {self.hits + self.misses} leaf '
+                        f'assemblies shared with an identical instance')
+
+
+flyweights = Flyweights()
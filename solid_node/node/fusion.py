@@ -2,10 +2,21 @@
 # Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
 # SPDX-License-Identifier: Apache-2.0
 
-from solid_node.exact import (cached_shape, fuse_shapes, placed_shape,
-                              write_brep, write_stl)
+import logging
+
+import numpy as np
+import trimesh
+from manifold3d import Error, Manifold, OpType
+
+from solid_node import render_cache
+from solid_node.exact import (_atomic_export, cached_shape, fuse_all,
+                              placed_shape, write_brep, write_stl)
 from .base import _compose_solid_matrix
 from .internal import InternalNode
+from .render_pool import render_pool
+
+
+logger = logging.getLogger('node.fusion')
 
 
 class FusionNode(InternalNode):
@@ -52,18 +63,84 @@ class FusionNode(InternalNode):
             placed_shape(child.shape(), _compose_solid_matrix(child))
             for child in self.children
         ]
-        result = placed[0]
-        for child, child_shape in zip(self.children[1:], placed[1:]):
-            result = fuse_shapes(result, child_shape, self.name, child.name)
-        return result
+        return fuse_all(placed, [child.name for child in self.children],
+                        self.name)
 
     def generate_stl(self):
         if not self.exact:
+            if self._fuse_child_stls():
+                return
             return super().generate_stl()
         if (self._up_to_date(self.stl_file)
                 and self._up_to_date(self.brep_file)):
             return
-        shape = self.shape()
-        write_brep(shape, self.brep_file, self.mtime)
-        write_stl(
-            shape, self.stl_file, self.mtime, remove_degenerate=True)
+        job = render_pool.submit(self)
+        if job is not None:
+            raise job
+        brep_key = render_cache.exact_key(self, 'brep')
+        stl_key = render_cache.exact_key(self, 'stl')
+        shape = None
+        if not render_cache.fetch(brep_key, self.brep_file, self.mtime):
+            shape = self.shape()
+            write_brep(shape, self.brep_file, self.mtime)
+            render_cache.store(brep_key, self.brep_file)
+        self._record_digest(self.brep_file)
+        if not render_cache.fetch(stl_key, self.stl_file, self.mtime):
+            if shape is None:
+                # The BREP came from the cache and is current, so this
+                # loads it rather than fusing again.
+                shape = self.shape()
+            write_stl(
+                shape, self.stl_file, self.mtime, remove_degenerate=True)
+            render_cache.store(stl_key, self.stl_file)
+        self._record_digest(self.stl_file)
+
+    def _fuse_child_stls(self):
+        """Write this fusion's STL as the manifold3d union of its
+        children's STLs, placed in the fusion's frame. Returns False when
+        OpenSCAD has to render it instead: a child STL that is missing or
+        not watertight, a child or union manifold3d reports an error for,
+        an empty union, or nothing for this process to write.
+
+        The children are rendered already; asking OpenSCAD to union their
+        imports is a CGAL render that can take minutes.
+        """
+        if (self._up_to_date(self.stl_file) or not self.rigid
+                or self._stl_generation_locked):
+            return False
+        # Local import: solid_node.test imports the node package.
+        from solid_node.test import _cached_manifold
+        if not all(child._up_to_date(child.stl_file)
+                   for child in self.children):
+            return False
+        key = render_cache.fusion_key(self.scad_file)
+        if render_cache.fetch(key, self.stl_file, self.mtime):
+            self._record_digest(self.stl_file)
+            return True
+        placed = []
+        for child in self.children:
+            try:
+                manifold, _ = _cached_manifold(child.stl_file)
+            except ValueError as error:
+                logger.info(f'{self.name}: {error}; fusing with OpenSCAD')
+                return False
+            matrix = _compose_solid_matrix(child)
+            placed.append(manifold.transform(matrix[:3, :4]))
+        union = Manifold.batch_boolean(placed, OpType.Add)
+        errors = [manifold.status() for manifold in placed + [union]
+                  if manifold.status() != Error.NoError]
+        if errors or union.is_empty():
+            reason = errors[0].name if errors else 'empty union'
+            logger.info(f'{self.name}: manifold3d could not fuse its '
+                        f'children ({reason}); fusing with OpenSCAD')
+            return False
+        mesh = union.to_mesh()
+        fused = trimesh.Trimesh(
+            vertices=np.asarray(mesh.vert_properties)[:, :3],
+            faces=np.asarray(mesh.tri_verts), process=False)
+        _atomic_export(self.stl_file, self.mtime,
+                       lambda output: fused.export(output, file_type='stl'))
+        render_cache.store(key, self.stl_file)
+        self._record_digest(self.stl_file)
+        logger.info(f"{self.stl_file} fused with {self.mtime}!")
+        return True
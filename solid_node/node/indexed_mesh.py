@@ -0,0 +1,197 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Indexed mesh files written beside published STLs.
+
+A binary STL stores the three corners of every triangle as float32,
+whether other triangles share them or not: about three times the bytes
+of the same mesh indexed. Every reader pays for it. cached_base_mesh
+welds the corners back into shared vertices on each load, and the
+viewer's STLLoader parses them and uploads them unshared.
+
+An indexed mesh holds the welded vertices and the faces indexing them,
+with a header carrying what publication already knows about the mesh:
+its bounds, volume and watertightness, and the content fingerprint of
+the STL it was written from. It is written beside its STL as
+``part.stl.mesh``, and only read while the STL's fingerprint matches:
+the STL's mtime does not tell renders apart (see derived_store.py).
+
+Layout, little-endian:
+
+- an 88-byte header (_HEADER): magic, version, position encoding,
+  flags, vertex and face counts, bounds as float64, volume (NaN when
+  unknown) and the STL's fingerprint, NUL-padded ASCII;
+- positions: float32 (FLOAT32) or float64 (FLOAT64) coordinates, or
+  int16 (INT16) quantized across the bounds -- a coordinate is
+  ``center + q / 32767 * half`` of the box -- padded to 4 bytes;
+- faces: uint32 vertex indices, three per triangle.
+
+Float positions are the very vertices load_stl welds, so cached_base_mesh
+reads them instead of the STL. Quantized ones are for display only: a
+65535th of the model's extent is finer than a pixel, and the positions
+take half the room.
+"""
+
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+from .stl import CompactMesh
+
+
+logger = logging.getLogger('node.indexed_mesh')
+
+SUFFIX = '.mesh'
+
+MAGIC = b'SNIM'
+VERSION = 2
+
+FLOAT32, FLOAT64, INT16 = 0, 1, 2
+
+WATERTIGHT = 1
+
+_HEADER = np.dtype([
+    ('magic', 'S4'),
+    ('version', '<u2'),
+    ('encoding', 'u1'),
+    ('flags', 'u1'),
+    ('vertices', '<u4'),
+    ('faces', '<u4'),
+    ('bounds', '<f8', (2, 3)),
+    ('volume', '<f8'),
+    ('source', 'S16'),
+])
+
+_POSITIONS = {FLOAT32: '<f4', FLOAT64: '<f8', INT16: '<i2'}
+
+_QUANTUM = 32767
+
+
+def sibling(stl_file):
+    """The indexed mesh file of ``stl_file``."""
+    return stl_file + SUFFIX
+
+
+def is_current(stl_file, path=None):
+    """Whether the indexed mesh at ``path`` (``stl_file``'s sibling by
+    default) was written from ``stl_file``'s current content."""
+    record = header(path or sibling(stl_file))
+    if record is None:
+        return False
+    try:
+        return record['source'] == _fingerprint(stl_file)
+    except OSError:
+        return False
+
+
+def _fingerprint(stl_file):
+    # Local import: core.pieces imports this module.
+    from solid_node.core.pieces import fingerprint_artifact
+    return fingerprint_artifact(stl_file).encode()
+
+
+def header(path):
+    """The header record of the indexed mesh at ``path``, or None when
+    it is not one this version reads."""
+    try:
+        record = np.fromfile(path, _HEADER, 1)
+    except (OSError, ValueError):
+        return None
+    if (len(record) != 1 or record['magic'][0] != MAGIC or
+            record['version'][0] != VERSION or
+            record['encoding'][0] not in _POSITIONS):
+        return None
+    return record[0]
+
+
+def write(stl_file, mesh, volume, watertight, quantize=False):
+    """Write the CompactMesh ``mesh`` of ``stl_file`` as its indexed
+    sibling, with its mtime and fingerprint, and return the sibling's
+    path."""
+    vertices = mesh.vertices
+    bounds = mesh.bounds
+    if quantize:
+        encoding = INT16
+        center, half = _box(bounds)
+        positions = np.rint((vertices - center) / half * _QUANTUM)
+        positions = positions.astype('<i2')
+    else:
+        encoding = FLOAT32 if vertices.dtype == np.float32 else FLOAT64
+        positions = np.ascontiguousarray(vertices, _POSITIONS[encoding])
+    record = np.zeros(1, _HEADER)
+    record['magic'] = MAGIC
+    record['version'] = VERSION
+    record['encoding'] = encoding
+    record['flags'] = WATERTIGHT if watertight else 0
+    record['vertices'] = len(vertices)
+    record['faces'] = len(mesh.faces)
+    record['bounds'] = bounds
+    record['volume'] = np.nan if volume is None else volume
+    record['source'] = _fingerprint(stl_file)
+    padding = -positions.nbytes % 4
+
+    path = sibling(stl_file)
+    mtime_ns = os.stat(stl_file).st_mtime_ns
+    descriptor, temporary = tempfile.mkstemp(
+        prefix=f'.{os.path.basename(path)}.', suffix='.tmp',
+        dir=os.path.dirname(path) or '.')
+    try:
+        with os.fdopen(descriptor, 'wb') as output:
+            output.write(record.tobytes())
+            output.write(positions.tobytes())
+            output.write(bytes(padding))
+            output.write(np.ascontiguousarray(mesh.faces, '<u4').tobytes())
+        os.utime(temporary, ns=(mtime_ns, mtime_ns))
+        os.replace(temporary, path)
+    except Exception:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    logger.debug(f'{path} written')
+    return path
+
+
+def read(path):
+    """The mesh in the indexed mesh file at ``path``, as a CompactMesh,
+    or None when it is not one this version reads."""
+    record = header(path)
+    if record is None:
+        return None
+    encoding = int(record['encoding'])
+    vertex_count, face_count = int(record['vertices']), int(record['faces'])
+    try:
+        positions = np.memmap(path, _POSITIONS[encoding], 'r',
+                              _HEADER.itemsize, (vertex_count, 3))
+        offset = _HEADER.itemsize + positions.nbytes
+        # Indices are uint32 on disk; no mesh comes near 2**31 vertices,
+        # so they read as the int32 CompactMesh keeps without a copy.
+        faces = np.memmap(path, '<i4', 'r', offset + -offset % 4,
+                          (face_count, 3))
+    except (OSError, ValueError):
+        return None
+    if encoding == INT16:
+        center, half = _box(record['bounds'])
+        positions = center + positions / _QUANTUM * half
+    return CompactMesh(positions, faces)
+
+
+def load(stl_file):
+    """The base mesh of ``stl_file`` read from its indexed sibling, or
+    None when that is not current or not exact."""
+    path = sibling(stl_file)
+    if not is_current(stl_file, path):
+        return None
+    if header(path)['encoding'] == INT16:
+        return None
+    return read(path)
+
+
+def _box(bounds):
+    """Center and half extent of ``bounds``, the half extent never 0."""
+    bounds = np.asarray(bounds, np.float64)
+    center = (bounds[0] + bounds[1]) / 2
+    half = (bounds[1] - bounds[0]) / 2
+    return center, np.where(half > 0, half, 1.0)
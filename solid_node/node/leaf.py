@@ -48,6 +48,13 @@ class LeafNode(AbstractBaseNode):
             and (not self.exact or self._up_to_date(self.brep_file))
         )
 
+    def _flyweight_key(self):
+        """Instances of one class with one uniq_id share their artifacts;
+        they assemble alike while they also agree on everything else
+        assemble() reads from the instance."""
+        return (self.__class__, self.basepath, self.root, self.color,
+                self.fn, self.optimize, self.rigid, self._keyframe_time)
+
     def as_scad(self, rendered):
         """Internally, the project is composed using OpenScad to render
         all STLs, so each LeafNode subclass must be able to output
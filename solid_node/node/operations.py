@@ -41,6 +41,11 @@ class Rotation:
         """Returns a serialized rotation as ["r", angle, axis]"""
         return ['r', str(self.angle), self.axis]
 
+    @property
+    def inputs(self):
+        """The values matrix() resolves through the node's as_number()"""
+        return [self.angle]
+
     @property
     def reversed(self):
         """Return an operation that reverses the rotation"""
@@ -85,6 +90,11 @@ class Translation:
         translation = [ str(x) for x in self.translation ]
         return ['t', translation]
 
+    @property
+    def inputs(self):
+        """The values matrix() resolves through the node's as_number()"""
+        return list(self.translation)
+
     @property
     def reversed(self):
         """Returns an operation that reverts the translation"""
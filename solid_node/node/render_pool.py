@@ -0,0 +1,204 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Exact artifacts rendered in worker processes.
+
+OpenSCAD renders run as child processes, so the scheduler keeps several
+going at once. The exact backends render inside the builder instead: a
+CadQuery leaf runs render(), tessellation and exportBrep while
+InternalNode.as_scad assembles it, and an exact FusionNode fuses in
+generate_stl. Those OCCT calls are CPU-bound and ran one after another,
+leaving every other core idle.
+
+While a build with more than one job is active, a stale exact node is
+handed to a pool of worker processes instead. A worker imports the
+node's class from its source file, constructs it with the arguments the
+node was constructed with -- the same ones its uniq_id is derived from
+-- and assembles it and generates its STL there, so every artifact is
+written atomically by the code that writes it in process. Meanwhile the
+builder keeps assembling: a parent imports the STL the worker will
+publish, and the scheduler does not start it before that STL is
+current. The render is a StlRenderStart, so the scheduler and the
+builder wait for it as they wait for OpenSCAD.
+
+A node the worker cannot rebuild by reference -- a class defined inside
+a function, arguments that do not pickle or do not reproduce its
+uniq_id -- is rendered in process, as it was before.
+"""
+
+import inspect
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from .base import StlRenderStart
+
+
+logger = logging.getLogger('node.render_pool')
+
+
+class PooledRender(StlRenderStart):
+    """The artifacts of one node being rendered by a pool worker."""
+
+    def __init__(self, pool, node, future):
+        super().__init__(None, node.stl_file, None, node.mtime, None)
+        self.pool = pool
+        self.node = node
+        self.future = future
+
+    @property
+    def worker(self):
+        return 'a render pool worker'
+
+    def done(self):
+        return self.future.done()
+
+    def finish(self):
+        self.pool.release(self)
+        if self.future.result():
+            logger.info(f"{self.stl_file} generated with {self.mtime}!")
+            return
+        logger.info(f"{self.stl_file}: {self.node.name} cannot be rebuilt "
+                    "by a worker, rendering it here")
+        self.pool.refuse(self.stl_file)
+        self.node.discard_assembly()
+        self.node.assemble()
+        self.node.generate_stl()
+
+    def cancel(self):
+        """Forget the render. One already running still completes: its
+        artifacts are written atomically, for the sources it read."""
+        self.future.cancel()
+        self.pool.release(self)
+        logger.info(f"{self.stl_file} cancelled")
+
+    def wait(self):
+        logger.info(f"waiting for {self.stl_file} ...")
+        self.future.exception()
+        logger.info(f"{self.stl_file} done!")
+        self.finish()
+
+
+class RenderPool:
+    """Build-scoped pool of worker processes for exact renders."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = {}
+        self._refused = set()
+        self.jobs = 1
+
+    @property
+    def active(self):
+        return self.jobs > 1
+
+    def pending(self, stl_file):
+        """The render under way for ``stl_file``, or None."""
+        return self._pending.get(stl_file)
+
+    def pending_jobs(self):
+        """Every render under way."""
+        with self._lock:
+            return list(self._pending.values())
+
+    def submit(self, node):
+        """Hand ``node``'s artifacts to a worker: the PooledRender doing
+        it, or None when the node is rendered in process."""
+        if not self.active or not node.optimize or not node.rigid:
+            return None
+        with self._lock:
+            job = self._pending.get(node.stl_file)
+            if job is not None:
+                return job
+            if node.stl_file in self._refused:
+                return None
+            reference = _reference(node)
+            if reference is None:
+                self._refused.add(node.stl_file)
+                return None
+            if self._executor is None:
+                # Spawned, not forked: the builder holds threads (the
+                # watchdog observer) and OCCT state a fork would copy.
+                self._executor = ProcessPoolExecutor(
+                    self.jobs,
+                    mp_context=multiprocessing.get_context('spawn'))
+            job = PooledRender(self, node,
+                               self._executor.submit(_render, *reference))
+            self._pending[node.stl_file] = job
+            logger.info(f'{node.stl_file} handed to the render pool')
+            return job
+
+    def release(self, job):
+        with self._lock:
+            if self._pending.get(job.stl_file) is job:
+                del self._pending[job.stl_file]
+
+    def refuse(self, stl_file):
+        with self._lock:
+            self._refused.add(stl_file)
+
+    @contextmanager
+    def build(self, jobs):
+        """Render exact nodes in up to ``jobs`` workers for the duration of
+        one build. Renders nobody waited for still complete before it
+        ends: each one publishes whole artifacts."""
+        if self.active or jobs <= 1:
+            yield self
+            return
+        self.jobs = jobs
+        try:
+            yield self
+        finally:
+            self.jobs = 1
+            executor, self._executor = self._executor, None
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            self._pending.clear()
+            self._refused.clear()
+
+
+render_pool = RenderPool()
+
+
+def _reference(node):
+    """What a worker needs to construct ``node`` again, or None."""
+    klass = type(node)
+    if '<locals>' in klass.__qualname__:
+        return None
+    arguments = getattr(node, '_arguments', None)
+    if arguments is None:
+        return None
+    try:
+        pickle.dumps(arguments)
+    except Exception:
+        return None
+    return (os.path.realpath(inspect.getfile(klass)), klass.__qualname__,
+            arguments, node.uniq_id)
+
+
+def _render(source, qualname, arguments, uniq_id):
+    """In a worker: produce the artifacts of the node of class
+    ``qualname`` in ``source`` constructed with ``arguments``. Returns
+    False when that does not rebuild the node with ``uniq_id``."""
+    # Local import: the loader imports the builder, which imports nodes.
+    from solid_node.core.loader import import_module_from_path
+    try:
+        target = import_module_from_path(source)
+        for name in qualname.split('.'):
+            target = getattr(target, name)
+        args, kwargs = arguments
+        node = target(*args, **kwargs)
+    except Exception as error:
+        logger.debug(f'{source}:{qualname} cannot be rebuilt ({error})')
+        return False
+    if node.uniq_id != uniq_id:
+        return False
+    node.assemble()
+    node.generate_stl()
+    return True
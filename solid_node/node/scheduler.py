@@ -0,0 +1,141 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Concurrent STL rendering for a whole assembled tree.
+
+AbstractBaseNode.generate_stl raises StlRenderStart for the first stale
+STL it reaches, and trigger_stl stops there, so rendering one job at a
+time leaves every other core idle on a cold build. The scheduler below
+walks the tree instead, starts every stale rigid node that is ready, up
+to a job limit, and keeps going as jobs finish.
+
+A node is ready when none of the rigid nodes below it is stale. A parent
+assembled while a child's STL was missing inlines the child's geometry
+into its scad instead of importing the STL, so it waits for the child,
+and the tree is assembled again before the parent starts.
+
+Exact nodes handed to the render pool while the tree assembles (see
+render_pool.py) occupy a core each as well: they count against the job
+limit, and are waited for, like the openscad children.
+"""
+
+import logging
+import time
+
+from .base import StlRenderStart
+from .render_pool import render_pool
+
+
+logger = logging.getLogger('node.scheduler')
+
+# How long to sleep between polls of the running openscad children.
+_POLL_INTERVAL = 0.05
+
+
+class RenderScheduler:
+    """Renders every pending STL below ``node``, ``jobs`` at a time."""
+
+    def __init__(self, node, jobs=1):
+        self.node = node
+        self.jobs = max(1, jobs)
+        self._running = []
+
+    def run(self, interrupted=None):
+        """Render until nothing is pending; return whether it completed.
+
+        ``interrupted``, when given, is asked after every finished job.
+        When it answers true, the jobs still running are cancelled and
+        False is returned: their output would be published under the
+        source state the tree was loaded from.
+
+        A node whose STL is locked by another process is left alone, so a
+        completed run does not guarantee every artifact is current.
+        """
+        try:
+            while True:
+                self.node.assemble()
+                progressed = self._start_ready()
+                if not self._running:
+                    if not progressed:
+                        return True
+                else:
+                    self._wait_any()
+                    if interrupted is not None and interrupted():
+                        self.cancel()
+                        return False
+                self.node.discard_assembly()
+        except BaseException:
+            self.cancel()
+            raise
+
+    def cancel(self):
+        for job in self._running:
+            job.cancel()
+        self._running = []
+
+    def _start_ready(self):
+        """Start every ready node that fits under the job limit. Returns
+        whether anything was produced synchronously -- exact fusions
+        write their artifacts inline rather than through openscad."""
+        progressed = False
+        running = {job.stl_file for job in self._running}
+        for job in render_pool.pending_jobs():
+            if job.stl_file not in running:
+                self._running.append(job)
+                running.add(job.stl_file)
+        for candidate in list(_ready_nodes(self.node)):
+            if len(self._running) >= self.jobs:
+                break
+            if candidate.stl_file in running:
+                continue
+            try:
+                candidate.generate_stl()
+            except StlRenderStart as job:
+                logger.info(f"Building {job.stl_file} by {job.worker}")
+                self._running.append(job)
+                running.add(job.stl_file)
+                continue
+            if not _stale(candidate):
+                progressed = True
+        return progressed
+
+    def _wait_any(self):
+        while True:
+            for job in self._running:
+                if job.done():
+                    self._running.remove(job)
+                    job.finish()
+                    return job
+            time.sleep(_POLL_INTERVAL)
+
+
+def _ready_nodes(node):
+    """Yield the stale rigid nodes below ``node`` (itself included) none of
+    whose rigid descendants is stale, once per artifact."""
+    seen = set()
+
+    def walk(current):
+        """Yield ready nodes below ``current``; return whether anything at
+        or below it is stale."""
+        stale_below = False
+        for child in current.children:
+            stale_below = (yield from walk(child)) or stale_below
+        if not _stale(current):
+            return stale_below
+        if not stale_below and current.stl_file not in seen:
+            seen.add(current.stl_file)
+            yield current
+        return True
+
+    yield from walk(node)
+
+
+def _stale(node):
+    """Whether a rigid node still has an artifact to produce."""
+    if not node.rigid:
+        return False
+    if not node._up_to_date(node.stl_file):
+        return True
+    return (getattr(node, 'exact', False)
+            and not node._up_to_date(node.brep_file))
@@ -0,0 +1,120 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Base meshes published once to shared memory, mapped by every process.
+
+``solid develop`` runs the builder, the web viewer and ``solid test`` as
+separate processes, and ``solid build`` starts a builder process per
+attempt. Each of them parsed the same large STLs into its own heap.
+
+Setting ``SOLID_SHARED_MESHES`` to a directory -- one on a tmpfs such as
+``/dev/shm/solid-meshes`` makes it shared memory proper -- lets the
+first process to load an STL write its compact vertex and face arrays
+there, in a segment named after the STL's path, mtime, size and inode
+(see derived_store.py on why the inode). Every
+other process maps the segment read-only and builds its base mesh on
+the mapped arrays: no parse and no copy, and one copy of the pages for
+the whole machine.
+
+A segment is a file published with os.replace, so a reader never maps a
+half-written one, and numpy owns each mapping, so it lasts exactly as
+long as the arrays viewing it. Publishing a newer segment for an STL
+removes the older ones; processes still mapping those keep their pages
+until they let go.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+from .stl import CompactMesh
+
+
+logger = logging.getLogger('node.shared_meshes')
+
+# Vertex count, face count and the byte size of a vertex coordinate,
+# little-endian uint64.
+_HEADER_FIELDS = 3
+_HEADER = np.dtype('<u8').itemsize * _HEADER_FIELDS
+
+
+def shared_dir():
+    """The segment directory, or None when meshes are not shared."""
+    return os.environ.get('SOLID_SHARED_MESHES') or None
+
+
+def _prefix(stl_file):
+    path = os.path.realpath(stl_file)
+    return hashlib.sha256(path.encode()).hexdigest()[:16] + '-'
+
+
+def _segment(directory, stl_file, stat):
+    return os.path.join(
+        directory,
+        f'{_prefix(stl_file)}{stat.st_mtime_ns}-{stat.st_size}-'
+        f'{stat.st_ino}.mesh')
+
+
+def attach(stl_file, stat):
+    """The base mesh of ``stl_file`` mapped from its published segment,
+    or None when there is none."""
+    directory = shared_dir()
+    if directory is None:
+        return None
+    segment = _segment(directory, stl_file, stat)
+    try:
+        header = np.fromfile(segment, '<u8', _HEADER_FIELDS)
+        vertex_count, face_count, coordinate = (int(field)
+                                                for field in header)
+        vertices = np.memmap(segment, f'<f{coordinate}', 'r', _HEADER,
+                             (vertex_count, 3))
+        faces = np.memmap(segment, '<i4', 'r',
+                          _HEADER + vertices.nbytes, (face_count, 3))
+    except (OSError, ValueError, TypeError):
+        return None
+    return CompactMesh(vertices, faces)
+
+
+def publish(stl_file, stat, mesh):
+    """Publish the CompactMesh ``mesh`` as the base mesh of ``stl_file``
+    at ``stat``."""
+    directory = shared_dir()
+    if directory is None:
+        return
+    segment = _segment(directory, stl_file, stat)
+    vertices = np.ascontiguousarray(
+        mesh.vertices, mesh.vertices.dtype.newbyteorder('<'))
+    faces = np.ascontiguousarray(mesh.faces, '<i4')
+    try:
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(
+            prefix='.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(descriptor, 'wb') as output:
+                output.write(np.array(
+                    [len(vertices), len(faces), vertices.itemsize],
+                    '<u8').tobytes())
+                output.write(vertices.tobytes())
+                output.write(faces.tobytes())
+            os.replace(temporary, segment)
+        except Exception:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        _remove_stale(directory, stl_file, segment)
+    except OSError as error:
+        logger.debug(f'{stl_file}: could not publish its mesh ({error})')
+
+
+def _remove_stale(directory, stl_file, current):
+    prefix = _prefix(stl_file)
+    for entry in os.scandir(directory):
+        if entry.name.startswith(prefix) and entry.path != current:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
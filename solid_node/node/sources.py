@@ -17,10 +17,13 @@ including the file.
 """
 
 import ast
+import hashlib
 import os
 import sys
 from importlib.util import resolve_name
 
+from solid_node import derived_store
+
 
 # The framework is a library, not project source. It normally lives in
 # site-packages, well outside any project, but when the framework tests
@@ -75,49 +78,148 @@ def _parse_project_imports(path, root):
         # A JScadNode's source file is its .js; nothing to parse.
         return frozenset()
 
+    package = _package_of(path)
+
+    names = set()
+    for level, module, aliases in _import_statements(path):
+        if aliases is None:
+            names.add(module)
+        else:
+            names.update(
+                _import_from_targets(level, module, aliases, package))
+
+    return frozenset(
+        found for found in (_project_file(name, root) for name in names)
+        if found is not None
+    )
+
+
+def _import_statements(path):
+    """``[level, module, names]`` for every import statement in ``path``,
+    ``names`` being None for a plain ``import``.
+
+    Parsing is the expensive half of the closure, and its result depends
+    on the file alone, so it is kept in the derived store for the next
+    process. Resolving the names to files depends on what this
+    interpreter imported, so that is done again every time."""
+    stat = os.stat(path) if os.path.exists(path) else None
+    if stat is not None:
+        statements = derived_store.get('imports', path, stat)
+        if statements is not None:
+            return statements
+
     try:
         with open(path, 'rb') as fh:
             tree = ast.parse(fh.read(), filename=path)
     except (OSError, SyntaxError):
         # A file the builder is about to fail on anyway. Tracking
         # nothing extra here leaves today's behaviour untouched.
-        return frozenset()
-
-    package = _package_of(path)
+        return []
 
-    names = set()
+    statements = []
     for statement in ast.walk(tree):
         if isinstance(statement, ast.Import):
-            names.update(alias.name for alias in statement.names)
+            statements.extend(
+                [0, alias.name, None] for alias in statement.names)
         elif isinstance(statement, ast.ImportFrom):
-            names.update(_import_from_targets(statement, package))
+            statements.append([
+                statement.level, statement.module or '',
+                [alias.name for alias in statement.names]])
+    derived_store.put('imports', path, statements, stat)
+    return statements
+
+
+class _ModuleIndex:
+    """The realpath of every imported module's file, and the modules
+    imported from every realpath, kept in step with sys.modules.
+
+    Scanning sys.modules and resolving each module's path once per parsed
+    file made closure computation proportional to the interpreter --
+    thousands of modules once cadquery, OCP and trimesh are loaded --
+    rather than to the project. The index resolves each module's path
+    once, when it first sees the module, and only looks at sys.modules
+    again after it changed.
+    """
 
-    return frozenset(
-        found for found in (_project_file(name, root) for name in names)
-        if found is not None
-    )
+    def __init__(self):
+        self._modules = {}  # name -> the module object that was indexed
+        self._paths = {}    # name -> realpath of its file, or None
+        self._names = {}    # realpath -> names imported from it, in order
+        self._signature = None
+
+    def _refresh(self):
+        # Dicts keep insertion order, so an import -- or a module deleted
+        # and imported again, as the loader does -- changes the last key,
+        # and a removal changes the length.
+        signature = (len(sys.modules), next(reversed(sys.modules), None))
+        if signature == self._signature:
+            return
+        self._signature = signature
+        current = dict(sys.modules)
+        for name in [name for name in self._modules if name not in current]:
+            self._forget(name)
+        for name, module in current.items():
+            if name not in self._modules or self._modules[name] is not module:
+                self._index(name, module)
+
+    def _forget(self, name):
+        del self._modules[name]
+        path = self._paths.pop(name)
+        if path is not None:
+            self._names[path].remove(name)
+            if not self._names[path]:
+                del self._names[path]
+
+    def _index(self, name, module):
+        if name in self._modules:
+            self._forget(name)
+        filename = getattr(module, '__file__', None)
+        path = os.path.realpath(filename) if filename else None
+        self._modules[name] = module
+        self._paths[name] = path
+        if path is not None:
+            self._names.setdefault(path, []).append(name)
+
+    def module(self, name):
+        """The module imported as ``name`` and the realpath of its file."""
+        self._refresh()
+        module = sys.modules.get(name)
+        if module is None:
+            return None, None
+        if self._modules.get(name) is not module:
+            # Replaced in place, which leaves the signature alone.
+            self._index(name, module)
+        return module, self._paths[name]
+
+    def modules_from(self, path):
+        """The modules imported from the file at realpath ``path``, in
+        the order they were imported."""
+        self._refresh()
+        for name in self._names.get(path, ()):
+            module = sys.modules.get(name)
+            if module is not None and module is self._modules[name]:
+                yield module
+
+
+_modules = _ModuleIndex()
 
 
 def _package_of(path):
     """The package a file was imported as, needed to resolve its
     relative imports. Taken from the interpreter, which has already
     done the resolution correctly."""
-    for module in list(sys.modules.values()):
-        filename = getattr(module, '__file__', None)
-        if filename and os.path.realpath(filename) == path:
-            return getattr(module, '__package__', None) or None
+    for module in _modules.modules_from(path):
+        return getattr(module, '__package__', None) or None
     return None
 
 
-def _import_from_targets(statement, package):
+def _import_from_targets(level, module, names, package):
     """Module names a `from ... import ...` statement can refer to."""
-    module = statement.module or ''
-
-    if statement.level:
+    if level:
         if package is None:
             return ()
         try:
-            base = resolve_name('.' * statement.level + module, package)
+            base = resolve_name('.' * level + module, package)
         except (ImportError, ValueError):
             return ()
     else:
@@ -128,22 +230,16 @@ def _import_from_targets(statement, package):
 
     # An imported name may itself be a submodule (`from pkg import mod`),
     # so offer both readings and let sys.modules decide.
-    return [base] + [f'{base}.{alias.name}' for alias in statement.names]
+    return [base] + [f'{base}.{name}' for name in names]
 
 
 def _project_file(name, root):
     """The project file a module name resolves to, or None if it is not
     one the node should track."""
-    module = sys.modules.get(name)
-    if module is None:
+    module, path = _modules.module(name)
+    if path is None:
         return None
 
-    filename = getattr(module, '__file__', None)
-    if not filename:
-        return None
-
-    path = os.path.realpath(filename)
-
     # A package __init__ is, in the conventional layout, the root
     # assembly's own source: it imports every node in the project.
     # Python executes it to resolve any relative import, so following
@@ -162,3 +258,37 @@ def _project_file(name, root):
         return None
 
     return path
+
+
+# sha256 of file contents, keyed on (path, mtime, size, normalized): a
+# file whose stat is unchanged is never read again, and a re-stat that
+# differs evicts the stale entry.
+_digest_cache = {}
+
+
+def file_digest(path, normalized=True):
+    """The sha256 of a file's content. Source is normalized so that a
+    save which only changes line endings or trailing whitespace hashes
+    the same; pass ``normalized=False`` for binary files."""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime, stat.st_size, normalized)
+    digest = _digest_cache.get(key)
+    if digest is None:
+        for stale in [k for k in _digest_cache
+                      if k[0] == path and k[3] == normalized]:
+            del _digest_cache[stale]
+        with open(path, 'rb') as fh:
+            content = fh.read()
+        if normalized:
+            content = b'\n'.join(
+                line.rstrip() for line in content.splitlines()).rstrip()
+        digest = _digest_cache[key] = hashlib.sha256(content).hexdigest()
+    return digest
+
+
+def closure_digest(paths):
+    """One digest for a whole source closure, file names included."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(f'{path}\0{file_digest(path)}\0'.encode())
+    return digest.hexdigest()
@@ -0,0 +1,92 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Source mtimes, stat()ed once per build instead of once per question.
+
+AbstractBaseNode.mtime is the newest mtime of every file in node.files,
+and it is asked for constantly: by every _up_to_date check, by
+generate_scad, by the serializer, by the builder's freshness checks and
+by LeafNode._render_can_be_skipped. A large tree with large closures
+spends tens of thousands of stat calls per build re-reading files that
+have not changed.
+
+While a build is active, SourceStats remembers each source file's mtime.
+It is only safe because the builder watches those very files: every
+watchdog event drops what was remembered, and a builder that does not
+watch drops it before each decision that depends on the sources being
+unchanged. Outside a build nothing is remembered, so code that writes a
+source and reads node.mtime straight after keeps working.
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+
+logger = logging.getLogger('node.stat_cache')
+
+
+class SourceStats:
+    """Build-scoped cache of source file mtimes, with counters."""
+
+    def __init__(self):
+        self._mtimes = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, so an mtime read before an event
+        # is not stored after it.
+        self._generation = 0
+        self.active = False
+        self.lookups = 0
+        self.stats = 0
+
+    @property
+    def avoided(self):
+        """How many stat calls the cache answered instead."""
+        return self.lookups - self.stats
+
+    @property
+    def generation(self):
+        """Bumped by every invalidation: anything derived from the sources
+        while it had another value may be stale."""
+        return self._generation
+
+    def getmtime(self, path):
+        self.lookups += 1
+        if self.active:
+            mtime = self._mtimes.get(path)
+            if mtime is not None:
+                return mtime
+        self.stats += 1
+        generation = self._generation
+        mtime = os.path.getmtime(path)
+        if self.active:
+            with self._lock:
+                if generation == self._generation:
+                    self._mtimes[path] = mtime
+        return mtime
+
+    def invalidate(self):
+        """Forget every remembered mtime; the sources may have changed."""
+        with self._lock:
+            self._generation += 1
+            self._mtimes.clear()
+
+    @contextmanager
+    def build(self):
+        """Remember mtimes for the duration of one build, then report how
+        many stat calls that saved."""
+        self.invalidate()
+        self.lookups = self.stats = 0
+        self.active = True
+        try:
+            yield self
+        finally:
+            self.active = False
+            self.invalidate()
+            logger.info(f'{self.avoided} of {self.lookups} source stat '
+                        f'calls served from the build stat cache')
+
+
+source_stats = SourceStats()
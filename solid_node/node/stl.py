@@ -0,0 +1,254 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""A vectorized STL loader for the base mesh cache.
+
+trimesh.load parses an STL through its generic loader and then processes
+the result; for the 660k-face camshaft that is about a second per load,
+and a test run or a publication loads every artifact of the tree. What
+the callers of cached_base_mesh read is vertices, faces and what follows
+from them -- bounds, extents, volume, watertightness -- so this loader
+only produces those:
+
+- a binary STL is memory-mapped and its triangle records read through a
+  structured dtype, with no per-triangle Python;
+- an ASCII STL (OpenSCAD's default output) is split once and, in the
+  facet layout every common writer emits, its coordinates are picked by
+  stride and converted in one pass;
+- the corners are welded into shared vertices by sorting their bit
+  patterns, which is what merging does in trimesh, without its rounding:
+  an STL writer emits a shared corner with the same coordinates every
+  time.
+
+The result is a CompactMesh, its vertices in first-use order like a
+processed trimesh load. It keeps vertices as float32 -- what a binary STL
+holds -- and faces as int32, half of what a trimesh.Trimesh stores, and
+only widens them to float64 in the Trimesh its ``copy()`` builds for a
+consumer that needs one.
+"""
+
+import os
+
+import numpy as np
+import trimesh
+
+
+_HEADER = 80
+
+_TRIANGLE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('corners', '<f4', (3, 3)),
+    ('attributes', '<u2'),
+])
+
+
+class CompactMesh:
+    """Read-only vertices and faces of a mesh, stored compactly.
+
+    Vertices are float32 unless that would round them -- an ASCII STL may
+    hold coordinates float32 cannot represent -- and faces are int32.
+    """
+
+    def __init__(self, vertices, faces):
+        if vertices.dtype != np.float32:
+            narrow = vertices.astype(np.float32)
+            if np.array_equal(narrow, vertices):
+                vertices = narrow
+        if faces.dtype != np.int32:
+            faces = faces.astype(np.int32)
+        vertices.flags.writeable = False
+        faces.flags.writeable = False
+        self.vertices = vertices
+        self.faces = faces
+        self._bounds = None
+
+    def __repr__(self):
+        return (f'<CompactMesh {len(self.vertices)} vertices '
+                f'{self.vertices.dtype}, {len(self.faces)} faces>')
+
+    @property
+    def nbytes(self):
+        return self.vertices.nbytes + self.faces.nbytes
+
+    @property
+    def bounds(self):
+        """``[[min x, y, z], [max x, y, z]]``, as float64."""
+        if self._bounds is None:
+            if len(self.vertices):
+                self._bounds = np.array([self.vertices.min(axis=0),
+                                         self.vertices.max(axis=0)],
+                                        dtype=np.float64)
+            else:
+                self._bounds = np.zeros((2, 3))
+            self._bounds.flags.writeable = False
+        return self._bounds
+
+    def copy(self):
+        """A new, mutable trimesh.Trimesh of this geometry, in float64."""
+        return trimesh.Trimesh(
+            vertices=self.vertices.astype(np.float64),
+            faces=self.faces.astype(np.int64), process=False)
+
+    def placed(self, matrix):
+        """This mesh placed by the 4x4 ``matrix``, as a PlacedMesh."""
+        return PlacedMesh(self, matrix)
+
+
+class PlacedMesh(trimesh.Trimesh):
+    """A CompactMesh placed by a 4x4 matrix, transformed only when read.
+
+    AbstractBaseNode.mesh used to copy the cached mesh and transform every
+    vertex on each access, though assertInside, assertClose and assertFar
+    often read nothing but one node's bounds. This is a trimesh.Trimesh
+    whose vertices and faces are only placed -- copied from the base mesh
+    and transformed by Trimesh.apply_transform, exactly the copy .mesh used
+    to return -- when something first reads them. Until then ``bounds``
+    come from the base mesh's bounds whenever the matrix keeps boxes
+    axis-aligned.
+    """
+
+    def __init__(self, base, matrix):
+        super().__init__(process=False)
+        self._matrix = np.array(matrix, dtype=np.float64)
+        # The base mesh while this one is not placed yet, then None.
+        self._pending = base
+
+    def __repr__(self):
+        if self._pending is not None:
+            return f'<PlacedMesh of {self._pending!r}>'
+        return super().__repr__()
+
+    @property
+    def _data(self):
+        # Every read of vertices or faces goes through Trimesh._data.
+        store = self.__dict__['_store']
+        if self.__dict__.get('_pending') is not None:
+            self._place(store)
+        return store
+
+    @_data.setter
+    def _data(self, store):
+        self.__dict__['_store'] = store
+
+    def _place(self, store):
+        base, self._pending = self._pending, None
+        store['vertices'] = base.vertices.astype(np.float64)
+        store['faces'] = base.faces.astype(np.int64)
+        self.apply_transform(self._matrix)
+
+    @property
+    def bounds(self):
+        base = self._pending
+        linear = self._matrix[:3, :3]
+        if base is not None and len(base.vertices) and (
+                np.count_nonzero(np.abs(linear) > 1e-12, axis=1) == 1).all():
+            # Scales, mirrors and quarter turns map the local box's
+            # corners onto the placed mesh's extremes.
+            corners = np.array(np.meshgrid(*base.bounds.T)).reshape(3, -1).T
+            placed = trimesh.transformations.transform_points(
+                corners, self._matrix)
+            return np.array([placed.min(axis=0), placed.max(axis=0)])
+        return super().bounds
+
+
+def load_stl(path):
+    """The mesh in the STL file at ``path``, as a CompactMesh."""
+    with open(path, 'rb') as stl:
+        header = stl.read(_HEADER + 4)
+    count = _binary_triangle_count(path, header)
+    if count is None:
+        with open(path, 'rb') as stl:
+            corners = _ascii_corners(stl.read())
+    elif count:
+        records = np.memmap(path, dtype=_TRIANGLE, mode='r',
+                            offset=_HEADER + 4, shape=(count,))
+        corners = np.array(records['corners'], np.float32).reshape(-1, 3)
+        del records
+    else:
+        corners = np.empty((0, 3), np.float32)
+    return CompactMesh(*weld(corners))
+
+
+def _binary_triangle_count(path, header):
+    """The triangle count of a binary STL, or None for an ASCII one.
+
+    A binary header may itself start with "solid", so the size decides:
+    a binary file is exactly its header plus 50 bytes per triangle."""
+    if len(header) < _HEADER + 4:
+        return None
+    count = int(np.frombuffer(header, '<u4', 1, _HEADER)[0])
+    if os.path.getsize(path) != _HEADER + 4 + count * _TRIANGLE.itemsize:
+        return None
+    return count
+
+
+# Tokens per facet in the layout every common writer emits: "facet normal
+# x y z outer loop", three "vertex x y z", "endloop endfacet".
+_FACET_TOKENS = 21
+_VERTEX_TOKENS = (7, 11, 15)
+_COORDINATE_TOKENS = (8, 9, 10, 12, 13, 14, 16, 17, 18)
+_KEYWORDS = {b'solid', b'facet', b'vertex', b'endsolid'}
+
+
+def _ascii_corners(content):
+    corners = _regular_ascii_corners(content.split())
+    if corners is not None:
+        return corners
+    # Several solids, upper case keywords or an unusual layout: find
+    # every vertex instead.
+    tokens = np.array(content.lower().split())
+    starts = np.flatnonzero(tokens == b'vertex')
+    if len(starts) % 3:
+        raise ValueError('ASCII STL with a triangle missing corners')
+    return tokens[starts[:, None] + np.arange(1, 4)].astype(np.float64)
+
+
+def _regular_ascii_corners(tokens):
+    """The corners of a single-solid ASCII STL laid out as _FACET_TOKENS,
+    picked by stride without looking at each token, or None."""
+    try:
+        start = tokens.index(b'facet')
+    except ValueError:
+        return None
+    header, body = tokens[:start], tokens[start:]
+    count = len(body) // _FACET_TOKENS
+    end = count * _FACET_TOKENS
+    trailer = body[end:]
+    if header[:1] != [b'solid'] or trailer[:1] != [b'endsolid']:
+        return None
+    # Only the solid's name may surround the facets.
+    if any(token.lower() in _KEYWORDS for token in header[1:] + trailer[1:]):
+        return None
+    if body[0:end:_FACET_TOKENS].count(b'facet') != count:
+        return None
+    for offset in _VERTEX_TOKENS:
+        if body[offset:end:_FACET_TOKENS].count(b'vertex') != count:
+            return None
+    coordinates = [None] * (count * len(_COORDINATE_TOKENS))
+    for index, offset in enumerate(_COORDINATE_TOKENS):
+        coordinates[index::len(_COORDINATE_TOKENS)] = (
+            body[offset:end:_FACET_TOKENS])
+    return np.array(coordinates, dtype=np.float64).reshape(-1, 3)
+
+
+def weld(corners):
+    """``(vertices, faces)`` for an (3n, 3) array of triangle corners,
+    corners with identical coordinates sharing one vertex."""
+    if not len(corners):
+        return corners.reshape(0, 3), np.empty((0, 3), np.int64)
+    # -0.0 and 0.0 are the same corner with different bits.
+    corners = np.ascontiguousarray(corners + 0.0)
+    bits = corners.view(f'u{corners.itemsize}')
+    order = np.lexsort(bits.T[::-1])
+    ordered = bits[order]
+    first_of_group = np.empty(len(order), bool)
+    first_of_group[0] = True
+    np.any(ordered[1:] != ordered[:-1], axis=1, out=first_of_group[1:])
+    # lexsort is stable, so each group starts at its first use.
+    first_uses = order[first_of_group]
+    rank = np.empty(len(first_uses), np.int64)
+    rank[np.argsort(first_uses)] = np.arange(len(first_uses))
+    inverse = np.empty(len(order), np.int64)
+    inverse[order] = rank[np.cumsum(first_of_group) - 1]
+    return corners[np.sort(first_uses)], inverse.reshape(-1, 3)
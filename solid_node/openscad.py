@@ -5,6 +5,7 @@
 """Conditional availability contract for the OpenSCAD executable."""
 
 import shutil
+import subprocess
 from functools import lru_cache
 
 
@@ -32,3 +33,16 @@ def require_openscad(needed_by, reason, alternative=None):
     if binary is None:
         raise OpenScadUnavailable(needed_by, reason, alternative)
     return binary
+
+
+@lru_cache(maxsize=None)
+def openscad_version(binary):
+    """The version line ``binary --version`` prints, or None if it cannot
+    be run. Artifacts rendered by another version are not reused."""
+    try:
+        proc = subprocess.run([binary, '--version'], capture_output=True,
+                              text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    output = (proc.stdout + proc.stderr).strip()
+    return output or None
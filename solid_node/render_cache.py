@@ -0,0 +1,223 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Content-addressed cache of rendered artifacts, shared between builds.
+
+An artifact is current when its mtime equals the newest mtime of the
+sources it came from. That is exact within one build tree, but a branch
+switch, a `touch` or a second worktree re-renders STLs whose scad is
+byte-identical to one rendered before. Setting ``SOLID_CACHE_DIR`` keeps
+every rendered STL and BREP in that directory under a hash of what
+produced it, and a later build hardlinks a hit into its tree instead of
+rendering again:
+
+- an OpenSCAD STL is keyed on its scad text (which carries `$fn`), the
+  content of every file that scad imports or includes, and the OpenSCAD
+  version;
+- a fusion STL unioned in process is keyed the same way, with the
+  manifold3d version in place of OpenSCAD's;
+- an exact (CadQuery) artifact has no scad of its own, so it is keyed on
+  the node's identity, the content of its source files, and the CadQuery
+  version.
+
+Artifacts are never modified in place -- they are published with
+os.replace -- so the build tree and the cache can share one inode, as
+long as every link wants the same mtime; otherwise a hit is copied. The
+cache is kept under ``SOLID_CACHE_SIZE`` bytes (``K``, ``M`` and ``G``
+suffixes accepted, 5G by default) by removing the least recently used
+entries after each store.
+"""
+
+import hashlib
+import importlib.metadata
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+
+from solid_node.memory_cache import parse_size
+from solid_node.node.sources import file_digest
+from solid_node.openscad import openscad_version
+
+
+logger = logging.getLogger('node.render_cache')
+
+_DEFAULT_SIZE = '5G'
+
+# The file each entry directory holds. The directory's own mtime is the
+# entry's last use: the artifact's mtime belongs to whichever build tree
+# linked it last.
+_ARTIFACT = 'artifact'
+
+_SCAD_DEPENDENCY = re.compile(
+    r'\bimport\s*\(\s*(?:file\s*=\s*)?"(?P<imported>[^"]+)"'
+    r'|\b(?:include|use)\s*<(?P<included>[^>]+)>')
+
+
+def cache_dir():
+    """The cache directory, or None when caching is off."""
+    return os.environ.get('SOLID_CACHE_DIR') or None
+
+
+def cache_size():
+    """The size budget, in bytes."""
+    return parse_size(os.environ.get('SOLID_CACHE_SIZE', _DEFAULT_SIZE),
+                      'SOLID_CACHE_SIZE')
+
+
+def scad_key(scad_file, openscad):
+    """The key of the STL ``openscad`` renders from ``scad_file``, or None
+    when caching is off or a dependency cannot be located -- a library
+    found through OPENSCADPATH could change without the key noticing."""
+    if cache_dir() is None:
+        return None
+    version = openscad_version(openscad)
+    if version is None:
+        return None
+    return _scad_key(scad_file, f'scad\0{version}')
+
+
+def fusion_key(scad_file):
+    """The key of the STL manifold3d unions from the children ``scad_file``
+    imports (see FusionNode._fuse_child_stls), or None when caching is
+    off or a child cannot be located."""
+    if cache_dir() is None:
+        return None
+    version = importlib.metadata.version('manifold3d')
+    return _scad_key(scad_file, f'manifold\0{version}')
+
+
+def _scad_key(scad_file, producer):
+    with open(scad_file) as source:
+        code = source.read()
+    digest = hashlib.sha256()
+    digest.update(f'{producer}\0{code}'.encode())
+    directory = os.path.dirname(scad_file)
+    for match in _SCAD_DEPENDENCY.finditer(code):
+        dependency = match.group('imported') or match.group('included')
+        path = os.path.join(directory, dependency)
+        if not os.path.isfile(path):
+            return None
+        digest.update(
+            f'\0{dependency}\0{file_digest(path, False)}'.encode())
+    return digest.hexdigest()
+
+
+def exact_key(node, kind):
+    """The key of an exact node's ``kind`` artifact ('stl' or 'brep'), or
+    None when caching is off."""
+    if cache_dir() is None:
+        return None
+    import cadquery
+    digest = hashlib.sha256()
+    digest.update(
+        f'exact\0{kind}\0{cadquery.__version__}\0{node.uniq_id}'.encode())
+    for source_digest in sorted(file_digest(path) for path in node.files):
+        digest.update(f'\0{source_digest}'.encode())
+    return digest.hexdigest()
+
+
+def _entry(key):
+    return os.path.join(cache_dir(), key[:2], key)
+
+
+def fetch(key, path, mtime):
+    """Link the artifact cached under ``key`` at ``path`` with ``mtime``.
+    Returns whether there was one."""
+    if key is None:
+        return False
+    entry = _entry(key)
+    cached = os.path.join(entry, _ARTIFACT)
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    temporary = tempfile.mktemp(
+        prefix=f'.{os.path.basename(path)}.', suffix='.tmp', dir=directory)
+    try:
+        stat = os.stat(cached)
+        if stat.st_nlink == 1 or stat.st_mtime == mtime:
+            _link_or_copy(cached, temporary)
+        else:
+            # Linked into a build tree whose sources have another mtime:
+            # setting ours on a shared inode would make that one stale.
+            shutil.copyfile(cached, temporary)
+    except FileNotFoundError:
+        return False
+    try:
+        os.utime(temporary, (time.time(), mtime))
+        os.replace(temporary, path)
+    except Exception:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    _touch(entry)
+    logger.info(f'{path} linked from the render cache')
+    return True
+
+
+def store(key, path):
+    """Keep the artifact at ``path`` under ``key``, then trim the cache."""
+    if key is None:
+        return
+    entry = _entry(key)
+    cached = os.path.join(entry, _ARTIFACT)
+    if os.path.exists(cached):
+        _touch(entry)
+        return
+    os.makedirs(entry, exist_ok=True)
+    temporary = tempfile.mktemp(prefix=f'.{_ARTIFACT}.', dir=entry)
+    try:
+        _link_or_copy(path, temporary)
+        os.replace(temporary, cached)
+    except Exception:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    evict()
+
+
+def evict():
+    """Remove the least recently used entries until the cache fits its
+    budget."""
+    root = cache_dir()
+    if root is None or not os.path.isdir(root):
+        return
+    entries = []
+    total = 0
+    for shard in os.scandir(root):
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            try:
+                size = os.stat(os.path.join(entry.path, _ARTIFACT)).st_size
+                used = entry.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            entries.append((used, size, entry.path))
+            total += size
+    budget = cache_size()
+    for used, size, path in sorted(entries):
+        if total <= budget:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        logger.info(f'{path} evicted from the render cache')
+
+
+def _link_or_copy(source, destination):
+    try:
+        os.link(source, destination)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        # Another filesystem, or one without hardlinks.
+        shutil.copyfile(source, destination)
+
+
+def _touch(entry):
+    try:
+        os.utime(entry)
+    except FileNotFoundError:
+        pass
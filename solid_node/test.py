@@ -13,9 +13,11 @@ import trimesh
 from manifold3d import Manifold, Mesh
 from unittest import TestCase as BaseTestCase
 
+from solid_node import derived_store
+from solid_node.memory_cache import MemoryCache, manifold_size
 from solid_node.node.base import (cached_base_mesh, _compose_solid_matrix,
-                                  _compose_world_matrix, _enclosing_solid,
-                                  _topmost_rigid_nodes)
+                                  _compose_world_matrix, _content_key,
+                                  _enclosing_solid, _topmost_rigid_nodes)
 from solid_node.node.operations import Rotation, Translation
 from solid_node.exact import (fuse_shapes, intersect_shapes, placed_shape,
                               solid_count, solid_volume)
@@ -40,35 +42,46 @@ class IntersectionStats:
 # meshes and re-converts both to Manifold, even when the caller only
 # needs is_empty()/volume(); this cache pays that conversion (and the
 # watertightness check) once per STL for the whole suite instead of
-# once per boolean. Keyed the same way as cached_base_mesh (fix 1),
-# with the same stale-entry eviction on rebuild.
-_manifold_cache = {}
+# once per boolean. Keyed the same way as cached_base_mesh (fix 1), on
+# content, with the same release of a rebuilt STL's old entry: identical
+# printed pieces share one Manifold and one watertight check.
+_manifold_cache = MemoryCache('manifold')
+_manifold_paths = {}
 
 
 def _cached_manifold(stl_file):
-    """(Manifold, local_bounds) for `stl_file`, built once per
-    (stl_file, mtime) from the same trimesh mesh fix 1's
+    """(Manifold, local_bounds) for `stl_file`, built once per STL
+    content from the same mesh fix 1's
     cached_base_mesh loads (no extra disk read). Watertightness is
     validated ONCE here, at cache fill -- not on every boolean -- and
     raises a clear, STL-naming error if it fails, instead of letting
     an obscure failure surface deep inside the boolean engine."""
-    mtime = os.path.getmtime(stl_file)
-    key = (stl_file, mtime)
+    stat = os.stat(stl_file)
+    key = _content_key(stl_file, _manifold_cache, _manifold_paths, stat)
     cached = _manifold_cache.get(key)
     if cached is None:
-        for stale_key in [k for k in _manifold_cache if k[0] == stl_file]:
-            del _manifold_cache[stale_key]
-        mesh = cached_base_mesh(stl_file)
-        if not mesh.is_volume:
+        # The verdict and bounds outlive the process in the derived
+        # store: a known-bad STL fails without being loaded, and a known
+        # volume skips the is_volume check.
+        facts = derived_store.get('manifold', stl_file, stat)
+        if facts is None:
+            mesh = cached_base_mesh(stl_file)
+            facts = {'volume': bool(mesh.copy().is_volume),
+                     'bounds': mesh.bounds.tolist()}
+            derived_store.put('manifold', stl_file, facts, stat)
+        if not facts['volume']:
             raise ValueError(
                 f"{stl_file} is not watertight -- cannot build a Manifold "
                 "cache for spatial assertions")
+        mesh = cached_base_mesh(stl_file)
+        # Copies: manifold3d only accepts writable arrays, and the cached
+        # ones are read-only.
         manifold = Manifold(mesh=Mesh(
-            vert_properties=np.asarray(mesh.vertices, np.float32),
-            tri_verts=np.asarray(mesh.faces, np.uint32),
+            vert_properties=np.array(mesh.vertices, np.float32),
+            tri_verts=np.array(mesh.faces, np.uint32),
         ))
-        cached = (manifold, mesh.bounds.copy())
-        _manifold_cache[key] = cached
+        cached = (manifold, np.array(facts['bounds'], dtype=np.float64))
+        _manifold_cache.put(key, cached, manifold_size(manifold))
     return cached
 
 
@@ -258,7 +271,7 @@ def _intersection_stats(node1, node2, compose_matrix=_compose_world_matrix):
 
 
 def _mesh_in_frame(node, compose_matrix):
-    """Copy a node's base STL and place it in the requested frame.
+    """A node's base STL, placed in the requested frame.
 
     Mesh-only test doubles have no base artifact to reframe; their ``mesh`` is
     already treated as the caller's local geometry.
@@ -266,9 +279,7 @@ def _mesh_in_frame(node, compose_matrix):
     stl_file = getattr(node, 'stl_file', None)
     if stl_file is None:
         return node.mesh
-    mesh = cached_base_mesh(stl_file).copy()
-    mesh.apply_transform(compose_matrix(node))
-    return mesh
+    return cached_base_mesh(stl_file).placed(compose_matrix(node))
 
 
 class TestCase(BaseTestCase):
@@ -553,7 +564,7 @@ class TestCase(BaseTestCase):
                 bodies = solid_count(solid.shape())
                 source = 'exact geometry'
             else:
-                bodies = len(cached_base_mesh(solid.stl_file).split(
+                bodies = len(cached_base_mesh(solid.stl_file).copy().split(
                     only_watertight=False))
                 source = 'STL'
             if bodies != 1:
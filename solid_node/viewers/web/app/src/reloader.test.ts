@@ -28,6 +28,18 @@ import { Reloader } from './reloader';
 
 const BANNER_SELECTOR = '.reload-offline-banner';
 
+// What the viewer sends on every connection, and after a pass that
+// changed nothing.
+const greeting = (revision: string) =>
+  JSON.stringify({ type: 'build', revision, changed: [] });
+
+// Flush the microtask queue the async build check schedules.
+const flush = async () => {
+  for (let i = 0; i < 5; i++) {
+    await Promise.resolve();
+  }
+};
+
 beforeEach(() => {
   jest.useFakeTimers();
   FakeWebSocket.instances = [];
@@ -117,27 +129,73 @@ describe('Reloader offline banner', () => {
     expect(FakeWebSocket.instances).toHaveLength(3);
   });
 
-  it('on reconnect after a drop, triggers the full reload path and then clears the banner', async () => {
+  it('on reconnect after a drop, clears the banner and reloads a model that changed meanwhile', async () => {
     const reload = jest.fn(() => Promise.resolve());
     new Reloader(() => {}, reload);
 
     latestSocket().onopen?.();
+    latestSocket().onmessage?.({ data: greeting('abc123') });
     latestSocket().onclose?.();
     expect(document.querySelector(BANNER_SELECTOR)).not.toBeNull();
 
     jest.advanceTimersByTime(2000);
-    // Reconnect succeeds: same full-reload path a file-change "reload"
-    // message would trigger (fetch /_build_error, then reload()).
     latestSocket().onopen?.();
+    expect(document.querySelector(BANNER_SELECTOR)).toBeNull();
 
-    // Flush the microtask queue the async reconnect handler schedules.
-    await Promise.resolve();
-    await Promise.resolve();
-    await Promise.resolve();
+    // The restarted viewer greets the client with a newer revision.
+    latestSocket().onmessage?.({ data: greeting('def456') });
+    await flush();
 
     expect(global.fetch).toHaveBeenCalledWith('/_build_error');
     expect(reload).toHaveBeenCalled();
-    expect(document.querySelector(BANNER_SELECTOR)).toBeNull();
+  });
+
+  it('reloads when the viewer pushes a finished build', async () => {
+    const reload = jest.fn(() => Promise.resolve());
+    const reloader = new Reloader(() => {}, reload);
+
+    latestSocket().onopen?.();
+    latestSocket().onmessage?.({ data: greeting('abc123') });
+    await flush();
+    expect(reload).not.toHaveBeenCalled();
+
+    latestSocket().onmessage?.({ data: JSON.stringify({
+      type: 'build', revision: 'def456', changed: ['models/part.stl'],
+    }) });
+    await flush();
+
+    expect(reload).toHaveBeenCalledTimes(1);
+    expect(reloader.revision).toBe('def456');
+  });
+
+  it('does not refetch the model when a pass leaves the revision unchanged', async () => {
+    const reload = jest.fn(() => Promise.resolve());
+    new Reloader(() => {}, reload);
+
+    latestSocket().onopen?.();
+    latestSocket().onmessage?.({ data: greeting('abc123') });
+    latestSocket().onmessage?.({ data: greeting('abc123') });
+    await flush();
+
+    expect(global.fetch).toHaveBeenCalledTimes(2);
+    expect(reload).not.toHaveBeenCalled();
+  });
+
+  it('shows a pending build error to a newly opened tab', async () => {
+    (global as any).fetch = jest.fn(() =>
+      Promise.resolve({
+        json: () => Promise.resolve({ error: 'boom', tstamp: 1 }),
+      }),
+    );
+    const setError = jest.fn();
+    new Reloader(setError, () => {});
+
+    latestSocket().onopen?.();
+    latestSocket().onmessage?.({ data: greeting('abc123') });
+    await flush();
+
+    expect(global.fetch).toHaveBeenCalledWith('/_build_error');
+    expect(setError).toHaveBeenCalledWith('boom');
   });
 
   it('does not re-trigger the reload path on a first-ever successful connect', () => {
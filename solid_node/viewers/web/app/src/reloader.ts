@@ -11,6 +11,16 @@ export interface BuildError {
   tstamp: number;
 }
 
+// Sent by the viewer when a client connects, with the current revision,
+// and every time a build pass ends: the published document's revision
+// and the artifacts whose mtime changed with it. The widget's reconcile
+// compares mtimes itself, so `changed` only tells the revision's story.
+export interface BuildMessage {
+  type: 'build';
+  revision: string | null;
+  changed: string[];
+}
+
 // How long to wait between reconnect attempts once a connection attempt
 // has failed (skill-repo improvements.md #12: retry indefinitely, ~2s).
 const RETRY_INTERVAL_MS = 2000;
@@ -33,6 +43,10 @@ export class Reloader {
   setError: SetErrorType;
   errorTstamp: number | null = null;
 
+  // The revision of the last build message received; undefined until
+  // the first one, which names the document the page already loaded.
+  revision: string | null | undefined = undefined;
+
   firstCheck: boolean;
 
   // True once any connection attempt has ever succeeded.
@@ -70,23 +84,30 @@ export class Reloader {
     this.reloadTrigger = new WebSocket(`${protocol}//${domain}/ws/reload`);
 
     this.reloadTrigger.onopen = () => {
-      const isReconnect = this.bannerVisible;
+      // The viewer greets every connection with its current revision:
+      // a reconnect heals through that message, with zero manual
+      // interaction, if the model changed while it was down.
       this.everConnected = true;
       this.failedAttempts = 0;
-
-      if (isReconnect) {
-        // Heal the browser with zero manual interaction: a restarted
-        // `solid develop` must repopulate the tree/STLs, not just clear
-        // the banner, since the model may have changed while it was down.
-        this.checkBuild().finally(() => this.hideBanner());
-      } else {
-        this.hideBanner();
-      }
+      this.hideBanner();
     };
 
     this.reloadTrigger.onmessage = (event) => {
       if (event.data === "reload") {
         this.checkBuild();
+        return;
+      }
+      const message = JSON.parse(event.data) as BuildMessage;
+      if (message.type === 'build') {
+        // The viewer stays up across builds: nothing reconnects, so
+        // this is the only signal. A pass that failed leaves the
+        // revision as it was, so only the build error is checked;
+        // otherwise reload() reconciles the document, fetching only the
+        // artifacts whose mtime moved.
+        const changed = this.revision !== undefined
+          && message.revision !== this.revision;
+        this.revision = message.revision;
+        this.checkBuild(changed);
       }
     };
 
@@ -132,12 +153,14 @@ export class Reloader {
     }
   }
 
-  async checkBuild() {
+  async checkBuild(reload: boolean = true) {
     const response = await fetch('/_build_error');
     const result = await response.json() as BuildError;
     if (!result.error || result.tstamp == this.errorTstamp) {
       this.setError('');
-      this.reload();
+      if (reload) {
+        this.reload();
+      }
     } else {
       this.errorTstamp = result.tstamp;
       this.setError(result.error);
@@ -2,21 +2,25 @@
 # Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
 # SPDX-License-Identifier: Apache-2.0
 
+import hashlib
 import json
 import logging
+import mimetypes
 import os
 import subprocess
 from pathlib import Path
 
 import httpx
 import uvicorn
-from fastapi import FastAPI, HTTPException, Response, WebSocket
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.websockets import WebSocketDisconnect
 
 from solid_node.core.builder import get_build_dir, get_errors_file
 from solid_node.core.logging import uvicorn_config
+from solid_node.core.pieces import fingerprint_artifact
+from solid_node.core.precompress import negotiate
 from solid_node.viewers.bundle import (
     api_version, bundle_path, has_bundle, missing_bundle_remedy,
 )
@@ -34,6 +38,32 @@ def frontend_port():
     return int(os.environ.get('SOLID_NODE_FRONTEND_PORT', 3000))
 
 
+def build_ready_url():
+    """Where a builder tells the viewer on this machine that a build pass
+    ended."""
+    return f'http://127.0.0.1:{backend_port()}/_build_ready'
+
+
+def published_state(build_dir=None):
+    """``(revision, {model: mtime})`` of the published viewer.json: a
+    digest of the document, and every artifact it names."""
+    document = os.path.join(build_dir or get_build_dir(), 'viewer.json')
+    try:
+        with open(document, 'rb') as stream:
+            content = stream.read()
+        root = json.loads(content)['root']
+    except (OSError, ValueError, KeyError):
+        return None, {}
+    artifacts = {}
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        if node.get('model'):
+            artifacts[node['model']] = node.get('mtime')
+        pending.extend(node.get('children') or ())
+    return hashlib.sha256(content).hexdigest()[:12], artifacts
+
+
 class WebDevServer:
     """Run the development React server proxied by :class:`WebViewer`."""
     def __init__(self, path):
@@ -48,6 +78,53 @@ class WebDevServer:
         proc.communicate()
 
 
+# A model requested under the content version the builder published
+# for it (SOLID_MODEL_URLS=content) never changes at that URL.
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def artifact_response(path, request):
+    """``path`` as the response to ``request``.
+
+    The entity tag is the artifact's content fingerprint, so a client
+    revalidating what it already holds gets a 304 without the body, even
+    across rebuilds that rewrote the same bytes. A current precompressed
+    sibling is sent when the client accepts its encoding.
+    """
+    fingerprint = fingerprint_artifact(path)
+    negotiated = negotiate(path, request.headers.get('accept-encoding'),
+                           fingerprint)
+    headers = {'Vary': 'Accept-Encoding'}
+    if negotiated is None:
+        body, etag = path, f'"{fingerprint}"'
+    else:
+        encoding, body = negotiated
+        etag = f'"{fingerprint}-{encoding}"'
+        headers['Content-Encoding'] = encoding
+    headers['ETag'] = etag
+    if request.query_params.get('v') == fingerprint:
+        headers['Cache-Control'] = IMMUTABLE
+    else:
+        headers['Cache-Control'] = 'no-cache'
+    if _matches(request.headers.get('if-none-match'), etag):
+        headers.pop('Content-Encoding', None)
+        return Response(status_code=304, headers=headers)
+    media_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    return FileResponse(body, headers=headers, media_type=media_type)
+
+
+def _matches(if_none_match, etag):
+    """Whether an If-None-Match header lists ``etag`` (weakly, as the
+    header is compared for GET)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag:
+            return True
+    return False
+
+
 class WebViewer:
     """Serve the published build snapshot and the shared viewer bundle."""
     def __init__(self, path, dev=True):
@@ -55,6 +132,11 @@ class WebViewer:
         self.frontend_dir = os.path.join(basedir, 'app/build')
         self.app = FastAPI()
 
+        # Connected /ws/reload clients, and the published state they were
+        # last told about.
+        self.clients = set()
+        self.revision, self.artifacts = published_state()
+
         self._setup_build_error()
         self._setup_build_snapshot()
         self._setup_viewer_bundle()
@@ -72,15 +154,49 @@ class WebViewer:
                     log_config=uvicorn_config)
 
     def _setup_reload_websocket(self):
+        """The viewer outlives builds. A builder that ends a pass posts to
+        /_build_ready, and every client connected to /ws/reload is sent
+        the new document revision and the artifacts that changed, so it
+        fetches those and nothing else. A client is sent the current
+        revision when it connects, so a tab opened or reconnected
+        between builds checks for a pending build error and catches up
+        with a build it missed."""
         @self.app.websocket('/ws/reload')
         async def websocket_endpoint(websocket: WebSocket):
             await websocket.accept()
-            await websocket.send_text('reload')
+            await websocket.send_json(
+                {'type': 'build', 'revision': self.revision, 'changed': []})
+            self.clients.add(websocket)
             try:
                 while True:
                     await websocket.receive_text()
             except WebSocketDisconnect:
                 return
+            finally:
+                self.clients.discard(websocket)
+
+        @self.app.post('/_build_ready')
+        async def build_ready():
+            message = self._build_message()
+            await self._broadcast(message)
+            return message
+
+    def _build_message(self):
+        """What changed in the published build since clients were last
+        told, as the message sent to them."""
+        revision, artifacts = published_state()
+        changed = sorted(model for model, mtime in artifacts.items()
+                         if self.artifacts.get(model, object()) != mtime)
+        self.revision, self.artifacts = revision, artifacts
+        return {'type': 'build', 'revision': revision, 'changed': changed}
+
+    async def _broadcast(self, message):
+        for client in list(self.clients):
+            try:
+                await client.send_json(message)
+            except Exception:
+                # A client gone without a close frame.
+                self.clients.discard(client)
 
     def _setup_build_error(self):
         @self.app.get('/_build_error')
@@ -93,7 +209,7 @@ class WebViewer:
 
     def _setup_build_snapshot(self):
         @self.app.get('/build/{requested_path:path}')
-        async def get_build_file(requested_path: str):
+        async def get_build_file(requested_path: str, request: Request):
             build_dir = Path(get_build_dir()).resolve()
             candidate = (build_dir / requested_path).resolve()
             try:
@@ -102,7 +218,7 @@ class WebViewer:
                 raise HTTPException(status_code=404)
             if not candidate.is_file():
                 raise HTTPException(status_code=404, detail='Published build artifact not found')
-            return FileResponse(candidate)
+            return artifact_response(str(candidate), request)
 
     def _setup_viewer_bundle(self):
         @self.app.get('/_viewer')
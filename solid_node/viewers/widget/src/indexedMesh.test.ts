@@ -0,0 +1,61 @@
+/*
+ * Solid Node - A framework for mechanical CAD projects
+ * Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+import { describe, expect, it } from 'vitest';
+
+import { isIndexedMesh, parseIndexedMesh } from './indexedMesh';
+
+// One triangle, laid out as solid_node/node/indexed_mesh.py writes it.
+function triangle(encoding: number): ArrayBuffer {
+  const positions = encoding === 2 ? 3 * 3 * 2 + 2 : 3 * 3 * 4;
+  const buffer = new ArrayBuffer(88 + positions + 3 * 4);
+  const view = new DataView(buffer);
+  'SNIM'.split('').forEach((char, index) => view.setUint8(index, char.charCodeAt(0)));
+  view.setUint16(4, 2, true);
+  view.setUint8(6, encoding);
+  view.setUint32(8, 3, true);
+  view.setUint32(12, 1, true);
+  [0, 0, 0, 2, 4, 0].forEach((value, index) => view.setFloat64(16 + index * 8, value, true));
+  const corners = [0, 0, 0, 2, 0, 0, 0, 4, 0];
+  if (encoding === 2) {
+    const quantized = [-32767, -32767, 0, 32767, -32767, 0, -32767, 32767, 0];
+    quantized.forEach((value, index) => view.setInt16(88 + index * 2, value, true));
+  } else {
+    corners.forEach((value, index) => view.setFloat32(88 + index * 4, value, true));
+  }
+  [0, 1, 2].forEach((value, index) => view.setUint32(88 + positions + index * 4, value, true));
+  return buffer;
+}
+
+describe('parseIndexedMesh', () => {
+  it('reads float positions and indices as published', () => {
+    const geometry = parseIndexedMesh(triangle(0));
+
+    expect(Array.from(geometry.getAttribute('position').array))
+      .toEqual([0, 0, 0, 2, 0, 0, 0, 4, 0]);
+    expect(Array.from(geometry.getIndex()!.array)).toEqual([0, 1, 2]);
+  });
+
+  it('dequantizes int16 positions across the bounds', () => {
+    const geometry = parseIndexedMesh(triangle(2));
+
+    expect(Array.from(geometry.getAttribute('position').array))
+      .toEqual([0, 0, 0, 2, 0, 0, 0, 4, 0]);
+    expect(Array.from(geometry.getIndex()!.array)).toEqual([0, 1, 2]);
+  });
+
+  it('refuses a file that is not an indexed mesh', () => {
+    expect(() => parseIndexedMesh(new ArrayBuffer(88))).toThrow();
+  });
+});
+
+describe('isIndexedMesh', () => {
+  it('recognizes a mesh reference with or without a content version', () => {
+    expect(isIndexedMesh('/build/part.stl.mesh')).toBe(true);
+    expect(isIndexedMesh('/build/part.stl.mesh?v=3f2a9c0e41b7')).toBe(true);
+    expect(isIndexedMesh('/build/part.stl')).toBe(false);
+  });
+});
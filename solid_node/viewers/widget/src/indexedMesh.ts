@@ -0,0 +1,78 @@
+/*
+ * Solid Node - A framework for mechanical CAD projects
+ * Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+// Reads the indexed mesh files the builder and `solid export` write beside
+// each STL (see solid_node/node/indexed_mesh.py for the layout): welded
+// positions, float or int16 quantized across the bounds, and uint32
+// indices. The geometry is indexed as published, so it is uploaded once
+// per shared vertex instead of once per triangle corner.
+
+import * as THREE from 'three';
+
+const MAGIC = 'SNIM';
+const VERSION = 2;
+const HEADER_BYTES = 88;
+const FLOAT32 = 0;
+const FLOAT64 = 1;
+const INT16 = 2;
+const QUANTUM = 32767;
+
+export const INDEXED_MESH_SUFFIX = '.mesh';
+
+export function isIndexedMesh(url: string): boolean {
+  return url.split('?')[0].endsWith(INDEXED_MESH_SUFFIX);
+}
+
+export function parseIndexedMesh(buffer: ArrayBuffer): THREE.BufferGeometry {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(
+    ...new Uint8Array(buffer, 0, MAGIC.length));
+  if (magic !== MAGIC || view.getUint16(4, true) !== VERSION) {
+    throw new Error('Not an indexed mesh this viewer reads');
+  }
+  const encoding = view.getUint8(6);
+  const vertexCount = view.getUint32(8, true);
+  const faceCount = view.getUint32(12, true);
+  const bounds = Array.from({ length: 6 },
+    (_, index) => view.getFloat64(16 + index * 8, true));
+
+  const coordinates = vertexCount * 3;
+  const positions = new Float32Array(coordinates);
+  let offset = HEADER_BYTES;
+  if (encoding === FLOAT32) {
+    positions.set(new Float32Array(buffer, offset, coordinates));
+    offset += coordinates * 4;
+  } else if (encoding === FLOAT64) {
+    positions.set(new Float64Array(buffer, offset, coordinates));
+    offset += coordinates * 8;
+  } else if (encoding === INT16) {
+    const quantized = new Int16Array(buffer, offset, coordinates);
+    const center = [0, 1, 2].map((axis) => (bounds[axis] + bounds[axis + 3]) / 2);
+    const half = [0, 1, 2].map((axis) => (bounds[axis + 3] - bounds[axis]) / 2 || 1);
+    for (let index = 0; index < coordinates; index++) {
+      const axis = index % 3;
+      positions[index] = center[axis] + quantized[index] / QUANTUM * half[axis];
+    }
+    offset += coordinates * 2;
+    offset += (4 - offset % 4) % 4;
+  } else {
+    throw new Error(`Unknown indexed mesh position encoding ${encoding}`);
+  }
+
+  const geometry = new THREE.BufferGeometry();
+  geometry.setAttribute('position', new THREE.BufferAttribute(positions, 3));
+  geometry.setIndex(new THREE.BufferAttribute(
+    new Uint32Array(buffer.slice(offset, offset + faceCount * 12)), 1));
+  return geometry;
+}
+
+export async function loadIndexedMesh(url: string): Promise<THREE.BufferGeometry> {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`${url}: ${response.status} ${response.statusText}`);
+  }
+  return parseIndexedMesh(await response.arrayBuffer());
+}
@@ -0,0 +1,54 @@
+/*
+ * Solid Node - A framework for mechanical CAD projects
+ * Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+import * as THREE from 'three';
+import { describe, expect, it } from 'vitest';
+
+import { MatrixTracks } from './tracks';
+
+// Two tracks of frames = 2, laid out as bake_tracks() writes them: a
+// translation along x by the sample index, then a quarter turn about z.
+function tracks(): MatrixTracks {
+  const samples: THREE.Matrix4[] = [
+    ...[0, 1, 2].map((x) => new THREE.Matrix4().makeTranslation(x, 0, 0)),
+    ...[0, 1, 2].map(() => new THREE.Matrix4().makeRotationZ(Math.PI / 2)),
+  ];
+  const data = new Float32Array(samples.length * 12);
+  samples.forEach((matrix, index) => {
+    data.set(matrix.elements.filter((_, element) => element % 4 !== 3), index * 12);
+  });
+  return new MatrixTracks(data, 2);
+}
+
+describe('MatrixTracks', () => {
+  it('reads the sample nearest the animation time', () => {
+    const matrix = new THREE.Matrix4();
+
+    tracks().matrixAt(0, 0.3, matrix);
+
+    expect(new THREE.Vector3().setFromMatrixPosition(matrix).toArray())
+      .toEqual([1, 0, 0]);
+  });
+
+  it('clamps to the ends of the cycle', () => {
+    const matrix = new THREE.Matrix4();
+
+    tracks().matrixAt(0, 1, matrix);
+
+    expect(matrix.elements[12]).toBe(2);
+  });
+
+  it('addresses a track by its index', () => {
+    const matrix = new THREE.Matrix4();
+
+    tracks().matrixAt(1, 0, matrix);
+
+    const x = new THREE.Vector3(1, 0, 0).applyMatrix4(matrix);
+    expect(x.x).toBeCloseTo(0);
+    expect(x.y).toBeCloseTo(1);
+    expect(matrix.elements[15]).toBe(1);
+  });
+});
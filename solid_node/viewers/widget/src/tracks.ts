@@ -0,0 +1,48 @@
+/*
+ * Solid Node - A framework for mechanical CAD projects
+ * Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+// Plays back the matrix tracks `solid export --bake-frames` and
+// SOLID_BAKE_FRAMES=on publish (see bake_tracks() in
+// solid_node/core/animation.py): per animated node, frames + 1 samples of
+// 12 Float32s, the top three rows of its local matrix in column-major
+// order. A baked node's matrix is a lookup instead of an evaluation of
+// its operations.
+
+import * as THREE from 'three';
+import { Manifest } from './types';
+
+const SAMPLE_FLOATS = 12;
+
+export class MatrixTracks {
+  constructor(readonly data: Float32Array, readonly frames: number) {}
+
+  // Set matrix to the sample of track nearest animation time t (0..1)
+  matrixAt(track: number, t: number, matrix: THREE.Matrix4): THREE.Matrix4 {
+    const sample = Math.min(Math.max(Math.round(t * this.frames), 0), this.frames);
+    const at = (track * (this.frames + 1) + sample) * SAMPLE_FLOATS;
+    const e = this.data;
+    return matrix.set(
+      e[at], e[at + 3], e[at + 6], e[at + 9],
+      e[at + 1], e[at + 4], e[at + 7], e[at + 10],
+      e[at + 2], e[at + 5], e[at + 8], e[at + 11],
+      0, 0, 0, 1,
+    );
+  }
+}
+
+export async function loadTracks(document: Manifest,
+                                 baseUrl: string): Promise<MatrixTracks | null> {
+  if (!document.animation.tracks) {
+    return null;
+  }
+  const url = baseUrl + document.animation.tracks;
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`${url}: ${response.status} ${response.statusText}`);
+  }
+  return new MatrixTracks(new Float32Array(await response.arrayBuffer()),
+                          document.animation.frames);
+}
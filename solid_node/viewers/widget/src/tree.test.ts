@@ -68,6 +68,19 @@ describe('WidgetTree targeted updates', () => {
     expect(tree.children[1].group).toBe(otherGroup);
   });
 
+  it('fetches a published indexed mesh instead of the STL', async () => {
+    const fetchMesh = vi.fn(() => Promise.reject(new Error('offline')));
+    vi.stubGlobal('fetch', fetchMesh);
+    loadAsync.mockClear();
+
+    const tree = new WidgetTree(root([leaf({ mesh: 'leaf.stl.mesh' })]), '/build/');
+    await expect(tree.loaded).rejects.toThrow('offline');
+
+    expect(fetchMesh).toHaveBeenCalledWith('/build/leaf.stl.mesh');
+    expect(loadAsync).not.toHaveBeenCalled();
+    vi.unstubAllGlobals();
+  });
+
   it('keeps the old tree when fetching a changed document mesh fails', async () => {
     const tree = new WidgetTree(root([leaf()]), '/build/');
     await tree.loaded;
@@ -15,6 +15,8 @@ import * as THREE from 'three';
 import { STLLoader } from 'three/examples/jsm/loaders/STLLoader.js';
 import { ManifestNode, RawOperation } from './types';
 import { evalExpr, isAnimated } from './evaluator';
+import { isIndexedMesh, loadIndexedMesh } from './indexedMesh';
+import { MatrixTracks } from './tracks';
 
 const stlLoader = new STLLoader();
 
@@ -32,14 +34,18 @@ export function assemblyPathKey(path: AssemblyPath): string {
   return JSON.stringify(path);
 }
 
-export function materialForColor(color: string | null): THREE.Material {
+// flatShading derives each face's normal in the shader: an indexed mesh
+// shares vertices across creases, so its vertex normals would be smoothed.
+export function materialForColor(color: string | null,
+                                 flatShading = false): THREE.Material {
   if (color === null) {
-    return new THREE.MeshNormalMaterial();
+    return new THREE.MeshNormalMaterial({ flatShading });
   }
   return new THREE.MeshStandardMaterial({
     color: new THREE.Color(color),
     metalness: 0.1,
     roughness: 0.6,
+    flatShading,
   });
 }
 
@@ -49,7 +55,11 @@ export class WidgetTree {
   children: WidgetTree[];
   name: string;
   private model: string | undefined;
+  // The indexed mesh published for the model, fetched instead of its STL.
+  private indexedMesh: string | undefined;
   private mtime: number | undefined;
+  // The node's baked track, played back in place of its operations.
+  private track: number | undefined;
   private color: string | null;
   // Set when artifactChanged() has already fetched this node's current
   // geometry. The manifest publishes after the artifact (PRD D3), so the
@@ -73,11 +83,13 @@ export class WidgetTree {
     const color = data.color ?? inheritedColor;
     this.color = color;
     this.model = data.model;
+    this.indexedMesh = data.mesh;
     this.mtime = data.mtime;
+    this.track = data.track;
     const pending: Promise<void>[] = [];
 
     if (data.model) {
-      pending.push(this.loadModel(baseUrl + data.model, color));
+      pending.push(this.loadModel(baseUrl + (data.mesh ?? data.model), color));
     }
 
     for (const childData of data.children ?? []) {
@@ -106,7 +118,8 @@ export class WidgetTree {
     };
     collect(this);
     await Promise.all(replacements.map(async (replacement) => {
-      replacement.mesh = await loadMesh(baseUrl + path, replacement.tree.color);
+      replacement.mesh = await loadMesh(baseUrl + (replacement.tree.indexedMesh ?? path),
+                                        replacement.tree.color);
     }));
     replacements.forEach(({ tree, mesh }) => {
       tree.replaceMesh(mesh);
@@ -128,7 +141,7 @@ export class WidgetTree {
     const skipMtimeCheck = this.freshFromArtifact;
     const modelChanged = this.model !== data.model || (this.mtime !== data.mtime && !skipMtimeCheck);
     const replacement = data.model && modelChanged
-      ? await loadMesh(baseUrl + data.model, nextColor) : undefined;
+      ? await loadMesh(baseUrl + (data.mesh ?? data.model), nextColor) : undefined;
 
     const existing = uniqueByName(this.children);
     const incoming = uniqueDataByName(data.children ?? []);
@@ -156,9 +169,11 @@ export class WidgetTree {
       }
       this.name = data.name;
       this.model = data.model;
+      this.indexedMesh = data.mesh;
       this.mtime = data.mtime;
       this.freshFromArtifact = false;
       this.operations = data.operations;
+      this.track = data.track;
       this.setColor(nextColor);
 
       const retained = new Set(nextChildren.map((child) => child.tree));
@@ -195,7 +210,8 @@ export class WidgetTree {
     this.group.children.filter((child): child is THREE.Mesh => child instanceof THREE.Mesh)
       .forEach((mesh) => {
         const previous = Array.isArray(mesh.material) ? mesh.material : [mesh.material];
-        mesh.material = materialForColor(color);
+        mesh.material = materialForColor(
+          color, (previous[0] as THREE.MeshStandardMaterial).flatShading);
         previous.forEach((material) => material.dispose());
       });
   }
@@ -256,11 +272,16 @@ export class WidgetTree {
     visit(this, []);
   }
 
-  // Recompute every local matrix for animation time t (0..1)
-  update(t: number): void {
-    this.group.matrix.copy(operationsMatrix(this.operations, t));
+  // Recompute every local matrix for animation time t (0..1), looking
+  // baked nodes up in tracks
+  update(t: number, tracks: MatrixTracks | null = null): void {
+    if (this.track !== undefined && tracks) {
+      tracks.matrixAt(this.track, t, this.group.matrix);
+    } else {
+      this.group.matrix.copy(operationsMatrix(this.operations, t));
+    }
     for (const child of this.children) {
-      child.update(t);
+      child.update(t, tracks);
     }
   }
 
@@ -283,6 +304,10 @@ function isPathPrefix(prefix: AssemblyPath, path: AssemblyPath): boolean {
 }
 
 async function loadMesh(url: string, color: string | null): Promise<THREE.Mesh> {
+  if (isIndexedMesh(url)) {
+    const geometry = await loadIndexedMesh(url);
+    return new THREE.Mesh(geometry, materialForColor(color, true));
+  }
   const geometry = await stlLoader.loadAsync(url);
   geometry.computeVertexNormals();
   return new THREE.Mesh(geometry, materialForColor(color));
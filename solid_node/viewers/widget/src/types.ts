@@ -18,9 +18,14 @@ export interface ManifestNode {
   // A rigid node has a model (path relative to the manifest) and no
   // children; a non-rigid node has children.
   model?: string;
+  // The model's indexed mesh (solid_node/node/indexed_mesh.py), when one
+  // was published: what a viewer fetches in place of the STL.
+  mesh?: string;
   // The builder publishes the source mtime with each model reference.  It is
   // part of the geometry identity: a source edit can retain the same path.
   mtime?: number;
+  // An animated node's baked track: its index in the animation's tracks.
+  track?: number;
   children?: ManifestNode[];
 }
 
@@ -30,6 +35,8 @@ export interface Manifest {
   animation: {
     fps: number;
     frames: number;
+    // The baked matrix tracks (see tracks.ts), when published.
+    tracks?: string;
   };
   root: ManifestNode;
 }
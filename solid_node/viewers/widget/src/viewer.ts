@@ -9,6 +9,7 @@ import { OrbitControls } from 'three/examples/jsm/controls/OrbitControls.js';
 import { frameBounds, ViewerView } from './camera';
 import { AssemblyNavigation } from './assembly';
 import { controlPlan, resolveBaseUrl, resolveOptions } from './options';
+import { MatrixTracks, loadTracks } from './tracks';
 import { AssemblyNode, AssemblyPath, WidgetTree } from './tree';
 import { Manifest } from './types';
 import { API_VERSION } from './version';
@@ -83,6 +84,7 @@ export async function mount(
   controls.rotateSpeed = 0.5;
 
   let tree: WidgetTree | undefined;
+  let tracks: MatrixTracks | null = null;
   let time = resolved.time;
   let playing = false;
   let slider: HTMLInputElement | undefined;
@@ -96,7 +98,7 @@ export async function mount(
     if (slider) {
       slider.value = String(time);
     }
-    tree?.update(time);
+    tree?.update(time, tracks);
     renderer.render(scene, camera);
   };
 
@@ -122,8 +124,9 @@ export async function mount(
 
   const replaceTree = async (view: View | null) => {
     const document = await loadDocument(sourceUrl);
+    const nextTracks = await loadTracks(document, baseUrl);
     const next = new WidgetTree(document.root, baseUrl);
-    next.update(time);
+    next.update(time, nextTracks);
     await next.loaded;
     if (disposed) {
       next.dispose();
@@ -134,6 +137,7 @@ export async function mount(
       tree.dispose();
     }
     tree = next;
+    tracks = nextTracks;
     scene.add(tree.group);
     assemblyNavigation.reconcile(tree);
     applyFrame(view);
@@ -187,7 +191,7 @@ export async function mount(
     if (playing) {
       setTime((time + elapsed / cycleSeconds) % 1);
     }
-    tree?.update(time);
+    tree?.update(time, tracks);
     renderer.render(scene, camera);
   });
 
@@ -218,10 +222,12 @@ export async function mount(
     },
     async manifestChanged() {
       const document = await loadDocument(sourceUrl);
+      const nextTracks = await loadTracks(document, baseUrl);
       await tree?.reconcile(document.root, baseUrl);
+      tracks = nextTracks;
       if (tree) {
         const rootChanged = assemblyNavigation.reconcile(tree);
-        tree.update(time);
+        tree.update(time, tracks);
         refreshControls(document);
         if (rootChanged) {
           applyFrame(null);
@@ -0,0 +1,10 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Exact parts a render pool worker can construct again from their
+source file (tests/test_render_pool.py)."""
+
+from .parts import Disc, Plate, PlateWithDisc
+
+__all__ = ['Disc', 'Plate', 'PlateWithDisc']
@@ -0,0 +1,34 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+import cadquery as cq
+
+from solid_node.node import CadQueryNode, FusionNode
+
+
+class Plate(CadQueryNode):
+
+    def __init__(self, width=4):
+        self.width = width
+        super().__init__(width)
+
+    def render(self):
+        return cq.Workplane("XY").box(self.width, self.width, 1)
+
+
+class Disc(CadQueryNode):
+
+    def render(self):
+        return cq.Workplane("XY").circle(1).extrude(2)
+
+
+class PlateWithDisc(FusionNode):
+
+    def __init__(self):
+        self.plate = Plate()
+        self.disc = Disc()
+        super().__init__()
+
+    def render(self):
+        return [self.plate, self.disc]
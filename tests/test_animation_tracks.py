@@ -0,0 +1,133 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Animated operations baked into matrix tracks, so a viewer plays them
+back by lookup (see solid_node/core/animation.py)."""
+
+import os
+import shutil
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from trimesh.creation import box, icosphere
+
+from solid_node.cli import manage
+from solid_node.core.animation import (bake_tracks, local_matrices,
+                                       local_matrix, sample_times)
+from solid_node.core.export import export_node
+
+from .test_gltf import Engine
+
+
+def node(name, operations, children=()):
+    return {'name': name, 'operations': operations,
+            'children': list(children)}
+
+
+def read_tracks(content, frames):
+    """Each track of ``content`` as ``(frames + 1, 3, 4)`` matrix rows."""
+    samples = np.frombuffer(content, '<f4').reshape(-1, frames + 1, 4, 3)
+    return samples.transpose(0, 1, 3, 2)
+
+
+class LocalMatricesTest(TestCase):
+
+    def test_a_cycle_matches_one_matrix_per_sample(self):
+        operations = [['r', '360 * $t', [1, 1, 0]],
+                      ['t', ['5 * $t', '0', 'sin(90 * $t)']],
+                      ['r', '45', [0, 0, 1]]]
+
+        np.testing.assert_allclose(
+            local_matrices(operations, 12),
+            [local_matrix(operations, time) for time in sample_times(12)],
+            atol=1e-12)
+
+
+class BakeTracksTest(TestCase):
+
+    def test_only_animated_nodes_get_a_track(self):
+        spin = [['r', '360 * $t', [0, 0, 1]]]
+        root = node('root', [], [
+            node('fixed', [['t', ['1', '2', '3']]]),
+            node('crank', spin + [['t', ['0', '20', '0']]])])
+
+        content = bake_tracks(root, 4)
+
+        fixed, crank = root['children']
+        self.assertNotIn('track', fixed)
+        self.assertNotIn('track', root)
+        track, = read_tracks(content, 4)
+        np.testing.assert_allclose(
+            track, local_matrices(crank['operations'], 4)[:, :3],
+            atol=1e-6)
+
+    def test_nodes_that_move_alike_share_a_track(self):
+        spin = [['r', '360 * $t', [0, 0, 1]]]
+        root = node('root', [], [node('a', spin), node('b', spin),
+                                 node('c', [['t', ['$t', '0', '0']]])])
+
+        content = bake_tracks(root, 8)
+
+        self.assertEqual(len(content), 2 * 9 * 12 * 4)
+        a, b, c = (child['track'] for child in root['children'])
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+
+class ExportBakeFramesTest(TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.build_dir = os.path.join(self.root, 'build')
+        os.makedirs(self.build_dir)
+        box((2, 2, 8)).export(os.path.join(self.build_dir, 'piston.stl'))
+        icosphere().export(os.path.join(self.build_dir, 'crank.stl'))
+        environment = patch.dict(os.environ,
+                                 {'SOLID_BUILD_DIR': self.build_dir})
+        environment.start()
+        self.addCleanup(environment.stop)
+        self.output = os.path.join(self.root, 'export')
+
+    def export(self, **options):
+        engine = Engine(self.build_dir)
+        with patch.object(engine, 'build_stls'):
+            return export_node(engine, self.output, frames=6, widget=False,
+                               **options)
+
+    def test_the_manifest_names_the_tracks_it_was_baked_with(self):
+        manifest = self.export(bake_frames=True)
+
+        with open(os.path.join(self.output,
+                               manifest['animation']['tracks']), 'rb') as f:
+            tracks = read_tracks(f.read(), 6)
+        cranks = [child for child in manifest['root']['children']
+                  if 'track' in child]
+        self.assertEqual([crank['track'] for crank in cranks], [0, 1])
+        np.testing.assert_allclose(tracks[1][0, :, 3], [0, 20, 0])
+        # Operations stay published for viewers that evaluate them.
+        self.assertEqual(cranks[0]['operations'][0],
+                         ['r', '360 * $t', [0, 0, 1]])
+
+    def test_tracks_are_not_baked_by_default(self):
+        manifest = self.export()
+
+        self.assertNotIn('tracks', manifest['animation'])
+        self.assertFalse([name for name in os.listdir(self.output)
+                          if name.startswith('tracks-')])
+
+    def test_the_cli_flag_asks_the_export_to_bake(self):
+        with patch.object(sys, 'argv',
+                          ['solid', 'export', 'somefile.py',
+                           '--bake-frames', '-o', 'out']), \
+             patch('solid_node.manager.export.load_node') as load_node, \
+             patch('solid_node.manager.export.export_node') as export:
+            manage()
+
+        export.assert_called_once_with(
+            load_node.return_value, 'out', fps=30, frames=360, widget=True,
+            bake_frames=True)
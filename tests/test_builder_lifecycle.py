@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import gzip
 import json
 import os
 import shutil
@@ -15,6 +16,8 @@ from unittest.mock import Mock, patch
 from trimesh.creation import box
 from trimesh.util import concatenate
 
+from solid_node import derived_store
+from solid_node.core.precompress import sibling_of
 from solid_node.core.builder import (Builder, BuildOutcome, atomic_write,
                                      write_error)
 from solid_node.node.base import StlRenderStart
@@ -39,6 +42,34 @@ class BuilderLifecycleTest(TestCase):
                          BuildOutcome.RENDERED)
         job.wait.assert_called_once()
 
+    def test_in_process_renders_drive_every_pending_render(self):
+        builder = Builder('model.py', build_dir=self.root, watch=False,
+                          in_process_renders=True, jobs=4)
+        builder.node = FakeNode()
+
+        with patch('solid_node.core.builder.RenderScheduler') as scheduler:
+            scheduler.return_value.run.return_value = True
+            outcome = asyncio.run(builder.generate_stl())
+
+        self.assertEqual(outcome, BuildOutcome.CURRENT)
+        scheduler.assert_called_once_with(builder.node, 4)
+
+    def test_in_process_renders_stand_down_when_source_changes(self):
+        builder = Builder('model.py', build_dir=self.root, watch=False,
+                          in_process_renders=True)
+        node = builder.node = FakeNode()
+
+        def edited_while_rendering(interrupted):
+            self.assertFalse(interrupted())
+            node.mtime += 1
+            return not interrupted()
+
+        with patch('solid_node.core.builder.RenderScheduler') as scheduler:
+            scheduler.return_value.run.side_effect = edited_while_rendering
+            outcome = asyncio.run(builder.generate_stl())
+
+        self.assertEqual(outcome, BuildOutcome.SOURCE_CHANGED)
+
     def test_snapshot_is_manifest_last_and_sweeps_old_stls(self):
         old = os.path.join(self.root, 'old.stl')
         current = os.path.join(self.root, 'part.stl')
@@ -328,6 +359,16 @@ class BuildCallbackTest(TestCase):
             'http://listener/build-ready?token=opaque', content=b'', timeout=2.0)
         response.raise_for_status.assert_called_once()
 
+    def test_a_failed_build_notifies_the_viewer(self):
+        builder = Builder('model.py', build_dir=self.root, watch=False,
+                          viewer_callback='http://127.0.0.1:8000/_build_ready')
+        with patch('httpx.post', return_value=Mock()) as post:
+            outcome = asyncio.run(builder.report_error('Traceback'))
+
+        self.assertEqual(outcome, BuildOutcome.FAILED)
+        post.assert_called_once_with(
+            'http://127.0.0.1:8000/_build_ready', content=b'', timeout=2.0)
+
     def test_callback_failure_is_best_effort(self):
         builder = Builder('model.py', build_dir=self.root, watch=False,
                           callback='http://listener/build-ready')
@@ -530,3 +571,115 @@ class PublicationOrderingTest(TestCase):
 
         self.assertEqual(outcome, BuildOutcome.FAILED)
         self.assertLessEqual(set(before), set(os.listdir(self.root)))
+
+    def test_content_urls_change_with_the_artifact(self):
+        self.builder.node = self.node_for('part')
+        with patch.dict(os.environ, {'SOLID_MODEL_URLS': 'content'}):
+            self.builder._write_viewer_snapshot()
+            with open(os.path.join(self.root, 'part.stl'), 'w') as handle:
+                handle.write('changed')
+            self.builder._write_viewer_snapshot()
+
+        with open(os.path.join(self.root, 'viewer.json')) as snapshot:
+            data = json.load(snapshot)
+        model = data['root']['children'][0]['model']
+        self.assertEqual(model, 'part.stl?v=' + data['pieces'][0]['id'])
+        self.assertIn('part.stl', os.listdir(self.root))
+
+    def test_precompressed_siblings_follow_their_model(self):
+        self.builder.node = self.node_for('part', 'other')
+        with patch.dict(os.environ, {'SOLID_PRECOMPRESS': 'gzip'}):
+            self.builder._write_viewer_snapshot()
+            self.builder.node = self.node_for('part')
+            self.builder._write_viewer_snapshot()
+
+        sibling = os.path.basename(sibling_of(
+            os.path.join(self.root, 'part.stl'), 'gzip'))
+        self.assertEqual(sorted(os.listdir(self.root)),
+                         ['part.stl', sibling, 'viewer.json'])
+        with gzip.open(os.path.join(self.root, sibling)) as compressed:
+            self.assertEqual(compressed.read(), b'part')
+
+    def test_new_content_under_the_same_mtime_gets_a_new_sibling(self):
+        self.builder.node = self.node_for('part')
+        path = os.path.join(self.root, 'part.stl')
+        with patch.dict(os.environ, {'SOLID_PRECOMPRESS': 'gzip'}):
+            self.builder._write_viewer_snapshot()
+            stale = sibling_of(path, 'gzip')
+            with open(path, 'w') as artifact:
+                artifact.write('rendered again')
+            os.utime(path, (0, 0))
+            self.builder._write_viewer_snapshot()
+
+        self.assertFalse(os.path.exists(stale))
+        with gzip.open(sibling_of(path, 'gzip')) as compressed:
+            self.assertEqual(compressed.read(), b'rendered again')
+
+    def test_an_unknown_encoding_is_refused(self):
+        self.builder.node = self.node_for('part')
+        with patch.dict(os.environ, {'SOLID_PRECOMPRESS': 'zstd'}), \
+             self.assertRaises(ValueError):
+            self.builder._write_viewer_snapshot()
+
+    def test_an_indexed_mesh_is_published_beside_each_model(self):
+        self.builder.node = self.node_for('part')
+        box().export(os.path.join(self.root, 'part.stl'))
+        self.builder._write_viewer_snapshot()
+
+        with open(os.path.join(self.root, 'viewer.json')) as snapshot:
+            data = json.load(snapshot)
+        self.assertEqual(data['root']['children'][0]['mesh'],
+                         'part.stl.mesh')
+        self.assertEqual(sorted(os.listdir(self.root)),
+                         ['part.stl', 'part.stl.mesh', 'viewer.json'])
+
+        with patch.dict(os.environ, {'SOLID_INDEXED_MESHES': 'off'}):
+            self.builder._write_viewer_snapshot()
+
+        self.assertEqual(sorted(os.listdir(self.root)),
+                         ['part.stl', 'viewer.json'])
+
+    def test_source_digests_of_published_artifacts_survive_the_sweep(self):
+        self.builder.node = self.node_for('part')
+        for name in ('part.stl.digest', 'part.brep.digest',
+                     'part.scad.digest', 'gone.stl.digest'):
+            with open(os.path.join(self.root, name), 'w') as record:
+                record.write('0123456789ab')
+
+        self.builder._write_viewer_snapshot()
+
+        self.assertEqual(sorted(os.listdir(self.root)),
+                         ['part.brep.digest', 'part.scad.digest', 'part.stl',
+                          'part.stl.digest', 'viewer.json'])
+
+    def test_derived_facts_survive_a_publication(self):
+        self.builder.node = self.node_for('part')
+        artifact = self.builder.node.children[0].stl_file
+        with patch.dict(os.environ, {'SOLID_BUILD_DIR': self.root}):
+            derived_store.put('probe', artifact, 'abc')
+
+            self.builder._write_viewer_snapshot()
+
+            self.assertEqual(derived_store.get('probe', artifact),
+                             'abc')
+        self.assertIn(derived_store.DATABASE, os.listdir(self.root))
+
+    def test_baked_tracks_are_published_while_frames_are_baked(self):
+        self.builder.node = self.node_for('part', 'other')
+        for child in self.builder.node.children:
+            child.operations = [SimpleNamespace(
+                serialized=['r', '360 * $t', [0, 0, 1]])]
+        with patch.dict(os.environ, {'SOLID_BAKE_FRAMES': 'on'}):
+            self.builder._write_viewer_snapshot()
+
+        with open(os.path.join(self.root, 'viewer.json')) as snapshot:
+            data = json.load(snapshot)
+        tracks = data['animation']['tracks']
+        self.assertEqual([child['track'] for child in
+                          data['root']['children']], [0, 0])
+        self.assertEqual(os.path.getsize(os.path.join(self.root, tracks)),
+                         361 * 12 * 4)
+
+        self.builder._write_viewer_snapshot()
+
+        self.assertNotIn(tracks, os.listdir(self.root))
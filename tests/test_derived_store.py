@@ -0,0 +1,143 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""The derived store answers, in a later process, what an earlier one
+computed from an unchanged file."""
+
+import os
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from trimesh.creation import box
+
+import solid_node.test as test_module
+from solid_node import derived_store
+from solid_node.core import pieces
+from solid_node.node import sources
+
+
+class DerivedStoreTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.build_dir = os.path.join(self.directory.name, '_build')
+        os.makedirs(self.build_dir)
+        patcher = patch.dict(os.environ, {'SOLID_BUILD_DIR': self.build_dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def file(self, name, content, mtime=1000):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as output:
+            output.write(content)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def stl(self, name, mesh):
+        path = os.path.join(self.directory.name, name)
+        mesh.export(path)
+        return path
+
+    def test_a_fact_is_kept_until_the_file_changes(self):
+        path = self.file('part.stl', 'one')
+        derived_store.put('fingerprint', path, 'abc')
+
+        self.assertEqual(derived_store.get('fingerprint', path), 'abc')
+        self.assertIsNone(derived_store.get('geometry', path))
+
+        self.file('part.stl', 'two', mtime=2000)
+        self.assertIsNone(derived_store.get('fingerprint', path))
+
+    def test_a_replaced_file_is_another_file(self):
+        path = self.file('part.stl', 'one')
+        derived_store.put('fingerprint', path, 'abc')
+
+        replacement = self.file('part.stl.tmp', 'two')
+        os.replace(replacement, path)
+
+        self.assertIsNone(derived_store.get('fingerprint', path))
+
+    def test_nothing_is_stored_without_a_build_directory(self):
+        os.rmdir(self.build_dir)
+        path = self.file('part.stl', 'one')
+        derived_store.put('fingerprint', path, 'abc')
+
+        self.assertIsNone(derived_store.get('fingerprint', path))
+        self.assertFalse(os.path.exists(self.build_dir))
+
+    def test_fingerprints_survive_the_in_memory_cache(self):
+        path = self.file('part.stl', 'solid part\nendsolid part\n')
+        fingerprint = pieces.fingerprint_artifact(path)
+        pieces._fingerprint_cache.clear()
+
+        with patch.object(pieces.hashlib, 'sha256',
+                          side_effect=AssertionError('must not rehash')):
+            self.assertEqual(pieces.fingerprint_artifact(path), fingerprint)
+
+    def test_geometry_facts_are_not_derived_twice(self):
+        path = self.stl('part.stl', box(extents=(1, 2, 3)))
+        facts = pieces._geometry_facts(path)
+
+        with patch.object(pieces, 'cached_base_mesh',
+                          side_effect=AssertionError('must not load')):
+            self.assertEqual(pieces._geometry_facts(path), facts)
+        self.assertEqual(facts[0], [1.0, 2.0, 3.0])
+
+    def test_a_known_open_mesh_fails_without_being_loaded(self):
+        mesh = box()
+        mesh.faces = mesh.faces[:-1]
+        path = self.stl('open.stl', mesh)
+        with self.assertRaisesRegex(ValueError, 'not watertight'):
+            test_module._cached_manifold(path)
+
+        with patch.object(test_module, 'cached_base_mesh',
+                          side_effect=AssertionError('must not load')), \
+             self.assertRaisesRegex(ValueError, 'not watertight'):
+            test_module._cached_manifold(path)
+
+    def test_manifold_bounds_come_back_unchanged(self):
+        path = self.stl('closed.stl', box(extents=(1, 2, 3)))
+        _, bounds = test_module._cached_manifold(path)
+        test_module._manifold_cache.clear()
+
+        _, stored = test_module._cached_manifold(path)
+
+        self.assertEqual(stored.tolist(), bounds.tolist())
+
+    def test_import_statements_are_parsed_once(self):
+        path = self.file('part.py', 'import math\nfrom .dims import WIDTH\n')
+        statements = sources._import_statements(path)
+
+        with patch.object(sources.ast, 'parse',
+                          side_effect=AssertionError('must not parse')):
+            self.assertEqual(sources._import_statements(path), statements)
+        self.assertEqual(statements,
+                         [[0, 'math', None], [1, 'dims', ['WIDTH']]])
+
+    def test_readers_and_writers_run_concurrently(self):
+        paths = [self.file(f'{index}.stl', str(index)) for index in range(4)]
+        errors = []
+
+        def work(index):
+            try:
+                for _ in range(25):
+                    for path in paths:
+                        derived_store.put('fingerprint', path, index)
+                        self.assertIn(
+                            derived_store.get('fingerprint', path),
+                            range(4))
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=work, args=(index,))
+                   for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
@@ -0,0 +1,134 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""SOLID_FRESHNESS=digest: an artifact stays current while the content of
+its source closure does, whatever happens to the mtimes."""
+
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from solid2 import cube
+from trimesh.creation import box
+
+from solid_node.core.builder import Builder
+from solid_node.node import Solid2Node
+from solid_node.node.base import StlRenderStart
+
+
+class Box(Solid2Node):
+    def render(self):
+        return cube(2)
+
+
+class DigestFreshnessTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        environment = {
+            'SOLID_BUILD_DIR': os.path.join(self.directory.name, '_build'),
+            'SOLID_FRESHNESS': 'digest',
+        }
+        patcher = patch.dict(os.environ, environment)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.source = os.path.join(self.directory.name, 'box.py')
+        self.write_source('SIDE = 2\n', mtime=1000)
+        self.node = Box()
+        self.node.files = {self.source}
+        self.artifact = self.node.stl_file
+        with open(self.artifact, 'w') as output:
+            output.write('solid box\nendsolid box\n')
+        os.utime(self.artifact, (1000, 1000))
+        # As the render that produced it would.
+        self.node._record_digest(self.artifact)
+
+    def write_source(self, content, mtime):
+        with open(self.source, 'w', newline='') as source:
+            source.write(content)
+        os.utime(self.source, (mtime, mtime))
+
+    def test_a_touch_keeps_the_artifact_current(self):
+        self.assertTrue(self.node._up_to_date(self.artifact))
+
+        self.write_source('SIDE = 2\n', mtime=2000)
+
+        self.assertTrue(self.node._up_to_date(self.artifact))
+        self.assertEqual(os.path.getmtime(self.artifact), 2000)
+
+    def test_whitespace_only_changes_keep_the_artifact_current(self):
+        self.assertTrue(self.node._up_to_date(self.artifact))
+
+        self.write_source('SIDE = 2   \r\n\r\n', mtime=2000)
+
+        self.assertTrue(self.node._up_to_date(self.artifact))
+
+    def test_a_content_change_makes_it_stale_for_good(self):
+        self.assertTrue(self.node._up_to_date(self.artifact))
+
+        self.write_source('SIDE = 3\n', mtime=2000)
+        self.assertFalse(self.node._up_to_date(self.artifact))
+
+        # Reverting the content must not vouch for whatever is rendered
+        # in the meantime.
+        self.write_source('SIDE = 2\n', mtime=3000)
+        self.assertFalse(self.node._up_to_date(self.artifact))
+
+    def test_mtime_mode_is_the_default(self):
+        self.assertTrue(self.node._up_to_date(self.artifact))
+        del os.environ['SOLID_FRESHNESS']
+
+        self.write_source('SIDE = 2\n', mtime=2000)
+
+        self.assertFalse(self.node._up_to_date(self.artifact))
+
+    def test_checking_freshness_records_nothing(self):
+        os.remove(f'{self.artifact}.digest')
+
+        self.assertTrue(self.node._up_to_date(self.artifact))
+
+        self.assertFalse(os.path.exists(f'{self.artifact}.digest'))
+
+    def test_a_restamp_leaves_other_links_alone(self):
+        cached = os.path.join(self.directory.name, 'cached.stl')
+        os.link(self.artifact, cached)
+
+        self.write_source('SIDE = 2\n', mtime=2000)
+
+        self.assertTrue(self.node._up_to_date(self.artifact))
+        self.assertEqual(os.path.getmtime(self.artifact), 2000)
+        self.assertEqual(os.path.getmtime(cached), 1000)
+        with open(cached) as link, open(self.artifact) as artifact:
+            self.assertEqual(link.read(), artifact.read())
+
+    def test_a_finished_render_records_the_sources_it_started_from(self):
+        temporary = f'{self.artifact}.tmp'
+        with open(temporary, 'w') as output:
+            output.write('solid box\nendsolid box\n')
+        render = StlRenderStart(None, self.artifact, temporary, 1000,
+                                f'{self.artifact}.lock',
+                                digest=self.node._source_digest())
+        os.remove(f'{self.artifact}.digest')
+
+        render.finish()
+        self.write_source('SIDE = 2\n', mtime=2000)
+
+        self.assertTrue(self.node._up_to_date(self.artifact))
+
+    def test_a_touch_after_a_publication_skips_the_render(self):
+        box().export(self.artifact)
+        os.utime(self.artifact, (1000, 1000))
+        self.node._record_digest(self.artifact)
+        self.node.generate_scad()
+        builder = Builder(self.source,
+                          build_dir=os.environ['SOLID_BUILD_DIR'], watch=False)
+        builder.node = self.node
+        builder._write_viewer_snapshot()
+
+        self.write_source('SIDE = 2\n', mtime=2000)
+
+        self.assertTrue(self.node._render_can_be_skipped())
@@ -12,6 +12,7 @@ from unittest.mock import Mock, patch
 
 import cadquery as cq
 import trimesh
+from OCP.BRepAlgoAPI import BRepAlgoAPI_Fuse
 from solid2 import cube
 
 from solid_node.node import (
@@ -21,8 +22,9 @@ from solid_node.node import (
     OpenScadNode,
     Solid2Node,
 )
-from solid_node.exact import (_shape_cache, cached_shape, placed_shape,
-                              solid_count, solid_volume, write_brep)
+from solid_node.exact import (_shape_cache, cached_shape, fuse_all,
+                              placed_shape, solid_count, solid_volume,
+                              write_brep)
 from solid_node.node.base import StlRenderStart
 from solid_node.test import TestCase as GeometryTestCase, _intersection_stats
 from solid_node.core.builder import Builder
@@ -245,6 +247,35 @@ class ExactArtifactTest(TestCase):
                 fusion.generate_stl()
 
 
+class ExactFuseAllTest(TestCase):
+
+    def boxes(self, count):
+        return [placed_shape(cq.Workplane('XY').box(2, 2, 2).val(),
+                             trimesh.transformations.translation_matrix(
+                                 (index, 0, 0)))
+                for index in range(count)]
+
+    def test_many_shapes_fuse_in_one_boolean(self):
+        algorithm = BRepAlgoAPI_Fuse()
+        with patch('solid_node.exact.BRepAlgoAPI_Fuse',
+                   return_value=algorithm) as fuse:
+            result = fuse_all(self.boxes(4), ['a', 'b', 'c', 'd'], 'bar')
+
+        self.assertEqual(fuse.call_count, 1)
+        self.assertEqual(solid_count(result), 1)
+        self.assertAlmostEqual(solid_volume(result), 5 * 2 * 2)
+
+    def test_a_failed_batch_is_fused_pairwise_and_names_the_child(self):
+        failed = Mock()
+        failed.IsDone.return_value = False
+        pairwise = iter([failed, BRepAlgoAPI_Fuse(), failed])
+
+        with patch('solid_node.exact.BRepAlgoAPI_Fuse',
+                   side_effect=lambda: next(pairwise)), \
+             self.assertRaisesRegex(RuntimeError, 'bar and c'):
+            fuse_all(self.boxes(3), ['a', 'b', 'c'], 'bar')
+
+
 class ExactIntersectionTest(TestCase):
 
     def box(self, size, name):
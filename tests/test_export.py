@@ -11,10 +11,12 @@ from unittest import TestCase
 from unittest.mock import patch
 from pathlib import Path
 
+from trimesh.creation import box
+
 from solid_node.cli import manage
 from solid_node.core.builder import Builder
 from solid_node.core.export import export_node, WidgetBundleMissing
-from solid_node.node import AssemblyNode
+from solid_node.node import AssemblyNode, indexed_mesh
 from solid_node.node.base import AbstractBaseNode
 
 from .base import BaseNodeTest
@@ -134,6 +136,24 @@ class ClassNameFallbackAssembly(AssemblyNode):
         return [Cube(self._fixture_build_dir)]
 
 
+class SolidCube(Cube):
+    """A Cube whose fixture STL holds triangles, so it is indexed."""
+
+    def __init__(self, build_dir):
+        super().__init__(build_dir)
+        box().export(self.stl_file)
+
+
+class SolidCubeAssembly(AssemblyNode):
+
+    def __init__(self, build_dir):
+        self._fixture_build_dir = build_dir
+        super().__init__()
+
+    def render(self):
+        return [SolidCube(self._fixture_build_dir)]
+
+
 class NonListNonRigidAssembly(AssemblyNode):
 
     def __init__(self, build_dir):
@@ -215,6 +235,17 @@ class ExportBuildSnapshotParityTest(TestCase):
         self.assertEqual(export_child['operations'],
                          [['t', ['1', '2', '3']]])
 
+    def test_both_publish_the_indexed_mesh_beside_the_model(self):
+        export, build, export_dir, _ = self._documents(SolidCubeAssembly)
+
+        export_child = export['root']['children'][0]
+        self.assertEqual(export_child['mesh'], 'models/parts/cube.stl.mesh')
+        self.assertEqual(build['root']['children'][0]['mesh'],
+                         'parts/cube.stl.mesh')
+        self.assertEqual(
+            len(indexed_mesh.read(os.path.join(
+                export_dir, export_child['mesh'])).faces), 12)
+
     def test_attribute_linking_boundaries_match(self):
         boundaries = (
             (ExplicitNameAssembly, ['drive_gear']),
@@ -0,0 +1,210 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""solid_node.expression: the in-process evaluator Solid2Node.as_number
+tries before launching OpenSCAD. Symbolic values built from solid2 and
+solid_node.math must evaluate to the number the same code computes with
+a numeric time, and anything outside the subset must be refused rather
+than guessed.
+"""
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from solid2 import cube
+from solid2.core.object_base import OpenSCADConstant
+
+from solid_node import math as snmath
+from solid_node.expression import (UnsupportedExpression, evaluate,
+                                   evaluate_samples)
+from solid_node.node import AssemblyNode, Solid2Node
+from solid_node.openscad import openscad_binary
+from solid_node.node.stat_cache import source_stats
+
+
+T = OpenSCADConstant('$t')
+
+
+def crank(time):
+    """A non-linear mechanism, written once for numeric and symbolic time."""
+    angle = 360 * time
+    return snmath.sqrt(100 - (3 * snmath.sin(angle)) ** 2) \
+        + 3 * snmath.cos(angle)
+
+
+class Box(Solid2Node):
+    def render(self):
+        return cube(1)
+
+
+class EvaluateTest(TestCase):
+
+    def test_symbolic_mechanism_matches_numeric(self):
+        for time in (0, 0.1, 0.25, 0.6, 0.95):
+            self.assertAlmostEqual(
+                evaluate(repr(crank(T)), time), crank(time))
+
+    def test_time_defaults_to_zero(self):
+        self.assertEqual(evaluate(repr(720.0 * T + 1.5)), 1.5)
+
+    def test_non_integer_results_are_kept(self):
+        self.assertEqual(evaluate('7 / 2'), 3.5)
+
+    def test_openscad_operator_semantics(self):
+        self.assertEqual(evaluate('2 ^ 3 ^ 2'), 512)
+        self.assertEqual(evaluate('-2 ^ 2'), -4)
+        self.assertEqual(evaluate('-7 % 3'), -1)
+        self.assertEqual(evaluate('$t < 0.5 ? 10 : 20', 0.75), 20)
+        self.assertEqual(evaluate('round(-2.5) + log(100) + atan2(1, 1)'),
+                         -3 + 2 + 45)
+
+    def test_registered_variables_resolve(self):
+        with patch.dict(
+                'solid2.extensions.greedy_scad_interface.scad_variable'
+                '.ScadVariable.registered_variables',
+                {'stroke': 'stroke = 2 * $t;'}):
+            self.assertEqual(evaluate('stroke + 1', 0.25), 1.5)
+
+    def test_unsupported_constructs_are_refused(self):
+        for expression in ('norm([3, 4])', 'unknown + 1', 'lookup($t)',
+                           '1 / 0', 'sqrt(-1)', '1 < 2', '(1 + 2'):
+            with self.subTest(expression=expression):
+                with self.assertRaises(UnsupportedExpression):
+                    evaluate(expression)
+
+
+class EvaluateSamplesTest(TestCase):
+
+    TIMES = np.arange(9) / 8
+
+    def test_samples_match_one_evaluation_per_time(self):
+        for expression in (repr(crank(T)), '720.0 * $t', '3',
+                           '$t < 0.5 ? round($t * 5) : -7 % 3 + 2 ^ $t',
+                           'max($t, 0.3) + log(2, 8) + atan2($t, 1)'):
+            with self.subTest(expression=expression):
+                np.testing.assert_allclose(
+                    evaluate_samples(expression, self.TIMES),
+                    [evaluate(expression, time) for time in self.TIMES],
+                    rtol=1e-12, atol=1e-12)
+
+    def test_a_sample_evaluate_refuses_is_refused(self):
+        for expression in ('1 / (1 - $t)', '$t < 2', 'norm([$t, 1])'):
+            with self.subTest(expression=expression):
+                with self.assertRaises(UnsupportedExpression):
+                    evaluate_samples(expression, self.TIMES)
+
+    def test_an_untaken_branch_does_not_refuse(self):
+        np.testing.assert_array_equal(
+            evaluate_samples('$t < 1 ? 2 : 1 / (1 - $t)', self.TIMES[:-1]),
+            [2] * 8)
+
+
+class Solid2NodeAsNumberTest(TestCase):
+
+    def test_supported_expressions_skip_openscad(self):
+        node = Box(name='box')
+        with patch('solid_node.node.adapters.solid2.Popen',
+                   side_effect=AssertionError('must not launch openscad')):
+            self.assertAlmostEqual(node.as_number(crank(T)), crank(0))
+        self.assertEqual(node.as_number(2.5), 2.5)
+
+
+class FakeOpenScad:
+    """Stands in for Popen([openscad, '-o', echo_file, scad_file]): echoes
+    a distinct number per echo() statement and records each launch."""
+
+    def __init__(self):
+        self.launches = []
+
+    def __call__(self, command):
+        _, _, result_file, scad_file = command
+        code = open(scad_file).read()
+        self.launches.append(code)
+        echoes = [line for line in code.split('\n')
+                  if line.startswith('echo(')]
+        with open(result_file, 'w') as result:
+            for index, _ in enumerate(echoes):
+                result.write(f'ECHO: {index + 0.5}\n')
+        return Mock(wait=Mock(return_value=0))
+
+
+class Arm(Solid2Node):
+    def render(self):
+        return cube(1)
+
+
+class Robot(AssemblyNode):
+    def render(self):
+        # norm() of a vector is outside the in-process subset.
+        self.arm.rotate(OpenSCADConstant(f'norm([{self.time}, 1])'),
+                        [0, 0, 1])
+        self.hand.translate([OpenSCADConstant(f'norm([{self.time}, 2])'),
+                             0, 0])
+        return [self.arm, self.hand]
+
+    def __init__(self):
+        super().__init__(name='robot')
+        self.arm = Arm(name='arm')
+        self.hand = Arm(name='hand')
+
+
+class KeyframeBatchTest(TestCase):
+
+    def setUp(self):
+        self.openscad = FakeOpenScad()
+        for patcher in (
+                patch('solid_node.openscad.shutil.which',
+                      return_value='/usr/bin/openscad'),
+                patch('solid_node.node.adapters.solid2.Popen', self.openscad),
+                patch.dict('solid_node.node.adapters.solid2._openscad_values',
+                           clear=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        openscad_binary.cache_clear()
+        self.addCleanup(openscad_binary.cache_clear)
+
+    def test_one_openscad_launch_per_keyframe(self):
+        robot = Robot()
+        for step in range(3):
+            robot.set_keyframe(step / 3)
+            robot.arm.operations[-1].matrix()
+            robot.arm.operations[-1].matrix()
+            robot.hand.operations[-1].matrix()
+
+        self.assertEqual(len(self.openscad.launches), 3)
+        self.assertIn(f'$t = {1 / 3!r};', self.openscad.launches[1])
+        self.assertEqual(self.openscad.launches[0].count('echo('), 2)
+
+    def test_another_keyframe_keeps_the_batched_values(self):
+        robot = Robot()
+        robot.set_keyframe(0)
+        angle = robot.arm.operations[-1].angle
+        robot.arm._keyframe_time = 0.5
+        robot.arm.as_number(angle)
+        robot.arm._keyframe_time = 0
+
+        robot.arm.as_number(angle)
+        robot.hand.as_number(robot.hand.operations[-1].translation[0])
+
+        self.assertEqual(len(self.openscad.launches), 2)
+
+    def test_values_are_dropped_when_the_sources_may_have_changed(self):
+        robot = Robot()
+        robot.set_keyframe(0)
+        source_stats.invalidate()
+
+        robot.arm.as_number(robot.arm.operations[-1].angle)
+
+        self.assertEqual(len(self.openscad.launches), 2)
+
+    def test_values_are_memoized_per_keyframe(self):
+        robot = Robot()
+        robot.set_keyframe(0)
+        angle = robot.arm.operations[-1].angle
+        self.assertEqual(robot.arm.as_number(angle), 0.5)
+        self.assertEqual(robot.hand.as_number(
+            robot.hand.operations[-1].translation[0]), 1.5)
+        self.assertEqual(len(self.openscad.launches), 1)
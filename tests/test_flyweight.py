@@ -0,0 +1,93 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Identical leaves render once per build, and keep their own operations
+and parents (see solid_node/node/flyweight.py)."""
+
+from solid2 import cube
+
+from solid_node.node import AssemblyNode, Solid2Node
+from solid_node.node.flyweight import flyweights
+from solid_node.node.stat_cache import source_stats
+from .base import BaseNodeTest
+
+
+class Piston(Solid2Node):
+
+    renders = 0
+
+    def __init__(self, bore=2):
+        self.bore = bore
+        super().__init__(bore=bore)
+
+    def render(self):
+        Piston.renders += 1
+        return cube(self.bore, center=True)
+
+
+class Engine(AssemblyNode):
+
+    def __init__(self):
+        self.pistons = [Piston() for _ in range(8)]
+        self.oversized = Piston(bore=3)
+        super().__init__()
+
+    def render(self):
+        for index, piston in enumerate(self.pistons):
+            piston.translate((index * 10, 0, 0))
+        return list(self.pistons) + [self.oversized]
+
+
+class FlyweightTest(BaseNodeTest):
+
+    def setUp(self):
+        super().setUp()
+        Piston.renders = 0
+
+    def test_identical_leaves_render_once_per_build(self):
+        engine = Engine()
+        with flyweights.build():
+            engine.assemble()
+
+        self.assertEqual(Piston.renders, 2)
+        self.assertEqual(flyweights.hits, 7)
+
+    def test_each_instance_keeps_its_operations_and_parent(self):
+        engine = Engine()
+        with flyweights.build():
+            engine.assemble()
+
+        code = engine.scad_code
+        for index in range(8):
+            self.assertIn(f'translate(v = [{index * 10}, 0, 0])', code)
+        for index, piston in enumerate(engine.pistons):
+            self.assertIs(piston._parent, engine)
+            self.assertEqual(len(piston.operations), 1)
+            self.assertEqual(piston.operations[0].translation,
+                             (index * 10, 0, 0))
+        self.assertEqual(
+            len({id(piston._assembled) for piston in engine.pistons}), 8)
+
+    def test_nothing_is_shared_outside_a_build(self):
+        Engine().assemble()
+
+        self.assertEqual(Piston.renders, 9)
+
+    def test_a_discarded_assembly_is_done_again(self):
+        engine = Engine()
+        with flyweights.build():
+            engine.assemble()
+            engine.discard_assembly()
+            engine.assemble()
+
+        self.assertEqual(Piston.renders, 4)
+
+    def test_invalidated_sources_are_not_shared(self):
+        first, second = Piston(), Piston()
+        with flyweights.build():
+            first.assemble()
+            source_stats.invalidate()
+            second.assemble()
+
+        self.assertEqual(Piston.renders, 2)
@@ -0,0 +1,143 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""A fusion of rendered STLs is unioned in process by manifold3d, and
+only falls back to OpenSCAD when it has to."""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+import trimesh
+from manifold3d import Manifold, Mesh
+from solid2 import cube
+
+from solid_node.core import pieces
+from solid_node.node import FusionNode, Solid2Node
+from solid_node.node.base import AbstractBaseNode
+from .base import BaseNodeTest
+
+
+class Block(Solid2Node):
+
+    def render(self):
+        return cube(2, center=True)
+
+
+class Blocks(FusionNode):
+
+    def __init__(self):
+        self.left = Block(name='left')
+        self.right = Block(name='right')
+        super().__init__()
+
+    def render(self):
+        self.right.translate((1, 0, 0))
+        return [self.left, self.right]
+
+
+class FusionUnionTest(BaseNodeTest):
+
+    def setUp(self):
+        super().setUp()
+        # Every test writes the children's STL with the same mtime: the
+        # caches keyed on (path, mtime) must not carry one test's mesh
+        # into the next.
+        pieces._fingerprint_cache.clear()
+
+    def rendered(self, mesh):
+        """A Blocks whose children's STLs are ``mesh``, current."""
+        fusion = Blocks()
+        fusion.assemble()
+        for child in fusion.children:
+            mesh.export(child.stl_file)
+            os.utime(child.stl_file, (child.mtime, child.mtime))
+        return fusion
+
+    def test_child_stls_are_unioned_without_openscad(self):
+        fusion = self.rendered(trimesh.creation.box((2, 2, 2)))
+
+        with patch('solid_node.node.base.Popen', side_effect=AssertionError(
+                'fusing rendered STLs must not launch OpenSCAD')):
+            fusion.generate_stl()
+
+        self.assertTrue(fusion._up_to_date(fusion.stl_file))
+        fused = trimesh.load(fusion.stl_file)
+        self.assertTrue(fused.is_volume)
+        self.assertAlmostEqual(fused.volume, 3 * 2 * 2, places=4)
+        self.assertEqual(fused.bounds.tolist(), [[-1, -1, -1], [2, 1, 1]])
+
+    def test_an_open_child_falls_back_to_openscad(self):
+        mesh = trimesh.creation.box((2, 2, 2))
+        mesh.faces = mesh.faces[:-1]
+        fusion = self.rendered(mesh)
+
+        with patch.object(AbstractBaseNode, 'generate_stl') as openscad:
+            fusion.generate_stl()
+
+        openscad.assert_called_once_with()
+        self.assertFalse(os.path.exists(fusion.stl_file))
+
+    def test_a_missing_child_stl_falls_back_to_openscad(self):
+        fusion = self.rendered(trimesh.creation.box((2, 2, 2)))
+        os.remove(fusion.right.stl_file)
+
+        with patch.object(AbstractBaseNode, 'generate_stl') as openscad:
+            fusion.generate_stl()
+
+        openscad.assert_called_once_with()
+
+    def test_an_empty_union_falls_back_to_openscad(self):
+        fusion = self.rendered(trimesh.creation.box((2, 2, 2)))
+
+        with patch('solid_node.node.fusion.Manifold.batch_boolean',
+                   return_value=Manifold()), \
+             patch.object(AbstractBaseNode, 'generate_stl') as openscad:
+            fusion.generate_stl()
+
+        openscad.assert_called_once_with()
+        self.assertFalse(os.path.exists(fusion.stl_file))
+
+    def test_a_child_manifold_in_error_falls_back_to_openscad(self):
+        fusion = self.rendered(trimesh.creation.box((2, 2, 2)))
+        # One triangle: manifold3d builds it, in NotManifold status.
+        broken = Manifold(mesh=Mesh(
+            vert_properties=np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]],
+                                     np.float32),
+            tri_verts=np.array([[0, 1, 2]], np.uint32)))
+
+        with patch('solid_node.test._cached_manifold',
+                   return_value=(broken, np.zeros((2, 3)))), \
+             patch.object(AbstractBaseNode, 'generate_stl') as openscad:
+            fusion.generate_stl()
+
+        openscad.assert_called_once_with()
+        self.assertFalse(os.path.exists(fusion.stl_file))
+
+    def test_a_cached_union_is_linked_instead_of_computed(self):
+        fusion = self.rendered(trimesh.creation.box((2, 2, 2)))
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        with patch.dict(os.environ, {'SOLID_CACHE_DIR': cache.name}):
+            fusion.generate_stl()
+            with open(fusion.stl_file, 'rb') as fused:
+                content = fused.read()
+            os.remove(fusion.stl_file)
+
+            with patch('solid_node.node.fusion.Manifold.batch_boolean',
+                       side_effect=AssertionError('must not union again')):
+                fusion.generate_stl()
+
+        self.assertTrue(fusion._up_to_date(fusion.stl_file))
+        with open(fusion.stl_file, 'rb') as fused:
+            self.assertEqual(fused.read(), content)
+
+    def test_a_union_records_its_source_digest(self):
+        fusion = self.rendered(trimesh.creation.box((2, 2, 2)))
+
+        with patch.dict(os.environ, {'SOLID_FRESHNESS': 'digest'}):
+            fusion.generate_stl()
+
+        self.assertTrue(os.path.exists(f'{fusion.stl_file}.digest'))
@@ -0,0 +1,195 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""`solid export --format glb`: one binary glTF, a mesh per printed piece
+(see solid_node/core/gltf.py)."""
+
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import trimesh
+from trimesh.creation import box, icosphere
+
+from solid_node.cli import manage
+from solid_node.core.gltf import UnsupportedAnimation, export_glb
+from solid_node.node import AssemblyNode
+from solid_node.node.base import AbstractBaseNode
+
+from .test_export import SerializedOperation
+
+
+class Part(AbstractBaseNode):
+    """A rigid node with a fixture-owned STL, avoiding OpenSCAD."""
+
+    _type = 'Part'
+    rigid = True
+
+    def __init__(self, stl_file, operations=(), name=None):
+        super().__init__(name=name)
+        self.stl_file = stl_file
+        self.operations = [SerializedOperation(operation)
+                           for operation in operations]
+
+    @property
+    def mtime(self):
+        return 42
+
+
+class Engine(AssemblyNode):
+
+    def __init__(self, build_dir):
+        self._fixture_build_dir = build_dir
+        super().__init__()
+        self.color = '#cc4444'
+
+    @property
+    def mtime(self):
+        return 42
+
+    def render(self):
+        piston = os.path.join(self._fixture_build_dir, 'piston.stl')
+        crank = os.path.join(self._fixture_build_dir, 'crank.stl')
+        self.pistons = [
+            Part(piston, [['t', [str(index * 10), '0', '0']]])
+            for index in range(8)]
+        self.cranks = [
+            Part(crank, [['r', '360 * $t', [0, 0, 1]],
+                         ['t', ['0', str(index * 20), '0']]])
+            for index in range(2)]
+        return self.pistons + self.cranks
+
+
+def read_glb(path):
+    with open(path, 'rb') as stream:
+        content = stream.read()
+    magic, version, length = struct.unpack_from('<4sII', content)
+    size, kind = struct.unpack_from('<I4s', content, 12)
+    document = json.loads(content[20:20 + size])
+    return magic, version, length, len(content), kind, document
+
+
+class GlbExportTest(TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.build_dir = os.path.join(self.root, 'build')
+        os.makedirs(self.build_dir)
+        box((2, 2, 8)).export(os.path.join(self.build_dir, 'piston.stl'))
+        icosphere().export(os.path.join(self.build_dir, 'crank.stl'))
+        environment = patch.dict(os.environ,
+                                 {'SOLID_BUILD_DIR': self.build_dir})
+        environment.start()
+        self.addCleanup(environment.stop)
+        self.output = os.path.join(self.root, 'export', 'model.glb')
+
+    def export(self, **options):
+        engine = Engine(self.build_dir)
+        with patch.object(engine, 'build_stls'):
+            return export_glb(engine, self.output, **options)
+
+    def test_one_mesh_per_piece_instanced_by_every_placement(self):
+        gltf = self.export()
+
+        self.assertEqual(len(gltf['meshes']), 2)
+        placed = [node['mesh'] for node in gltf['nodes'] if 'mesh' in node]
+        self.assertEqual(sorted(placed), [0] * 8 + [1] * 2)
+        self.assertEqual([piece['count'] for piece in
+                          gltf['scenes'][0]['extras']['pieces']], [8, 2])
+
+        scene = trimesh.load(self.output, force='scene')
+        self.assertEqual(len(scene.geometry), 2)
+        self.assertEqual(len(scene.graph.nodes_geometry), 10)
+        np.testing.assert_allclose(scene.extents, [0.072, 0.008, 0.022],
+                                   atol=1e-3)
+
+    def test_the_file_is_a_well_formed_glb(self):
+        self.export()
+
+        magic, version, length, size, kind, _ = read_glb(self.output)
+        self.assertEqual((magic, version, kind), (b'glTF', 2, b'JSON'))
+        self.assertEqual(length, size)
+
+    def test_animated_nodes_are_baked_into_shared_samplers(self):
+        gltf = self.export(frames=4)
+
+        animation, = gltf['animations']
+        self.assertEqual([channel['target']['path']
+                          for channel in animation['channels']],
+                         ['rotation', 'rotation'])
+        outputs = {sampler['output'] for sampler in animation['samplers']}
+        self.assertEqual(len(outputs), 1)
+        rotations = gltf['accessors'][outputs.pop()]
+        times = gltf['accessors'][animation['samplers'][0]['input']]
+        self.assertEqual(rotations['count'], 5)
+        self.assertAlmostEqual(times['max'][0], 4 / 30, places=6)
+        crank = gltf['nodes'][animation['channels'][1]['target']['node']]
+        self.assertEqual(crank['translation'], [0.0, 20.0, 0.0])
+
+    def test_expressions_are_kept_raw_in_extras(self):
+        gltf = self.export(animation='expressions')
+
+        self.assertNotIn('animations', gltf)
+        crank = [node for node in gltf['nodes']
+                 if node.get('mesh') == 1][1]
+        self.assertEqual(crank['extras']['operations'][0],
+                         ['r', '360 * $t', [0, 0, 1]])
+        np.testing.assert_allclose(
+            np.array(crank['matrix']).reshape(4, 4).T[:3, 3], [0, 20, 0])
+
+    def test_node_colors_are_written_linear(self):
+        gltf = self.export()
+
+        material, = gltf['materials']
+        np.testing.assert_allclose(
+            material['pbrMetallicRoughness']['baseColorFactor'],
+            [0.6038, 0.0578, 0.0578, 1.0], atol=1e-4)
+
+    def test_an_unsupported_expression_names_its_node(self):
+        engine = Engine(self.build_dir)
+        engine.render = lambda: [
+            Part(os.path.join(self.build_dir, 'crank.stl'),
+                 [['r', 'lookup($t, table)', [0, 0, 1]]], name='crank')]
+
+        with patch.object(engine, 'build_stls'), \
+             self.assertRaisesRegex(UnsupportedAnimation,
+                                    r"crank: .*'lookup\(\$t, table\)'"):
+            export_glb(engine, self.output)
+
+        self.assertFalse(os.path.exists(self.output))
+
+    def test_the_cli_reports_an_unsupported_expression(self):
+        with patch.object(sys, 'argv',
+                          ['solid', 'export', 'somefile.py', '--format',
+                           'glb', '-o', 'out']), \
+             patch('solid_node.manager.export.load_node'), \
+             patch('solid_node.manager.export.export_glb',
+                   side_effect=UnsupportedAnimation(
+                       'crank', 'f($t)', 'unknown function f()')), \
+             patch.object(sys, 'stderr') as stderr, \
+             self.assertRaises(SystemExit):
+            manage()
+
+        stderr.write.assert_called_once_with(
+            "Error: crank: cannot evaluate 'f($t)' for the GLB "
+            "(unknown function f())\n")
+
+    def test_the_cli_writes_model_glb_in_the_output_directory(self):
+        with patch.object(sys, 'argv',
+                          ['solid', 'export', 'somefile.py', '--format',
+                           'glb', '-o', 'out']), \
+             patch('solid_node.manager.export.load_node') as load_node, \
+             patch('solid_node.manager.export.export_glb') as export:
+            manage()
+
+        export.assert_called_once_with(
+            load_node.return_value, os.path.join('out', 'model.glb'),
+            fps=30, frames=360, animation='baked')
@@ -0,0 +1,94 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Indexed meshes written beside published STLs, and read in their place
+(see solid_node/node/indexed_mesh.py)."""
+
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from trimesh.creation import icosphere
+
+from solid_node.core.pieces import indexed_mesh_of
+from solid_node.node import indexed_mesh
+from solid_node.node.base import _base_mesh_cache, cached_base_mesh
+from solid_node.node.stl import load_stl
+
+
+class IndexedMeshTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.stl = os.path.join(self.directory.name, 'part.stl')
+        icosphere(subdivisions=3).export(self.stl)
+        _base_mesh_cache.clear()
+        self.addCleanup(_base_mesh_cache.clear)
+
+    def test_float_positions_are_the_welded_stl(self):
+        loaded = load_stl(self.stl)
+
+        path = indexed_mesh_of(self.stl)
+        read = indexed_mesh.read(path)
+
+        np.testing.assert_array_equal(read.vertices, loaded.vertices)
+        np.testing.assert_array_equal(read.faces, loaded.faces)
+        self.assertLess(os.path.getsize(path), os.path.getsize(self.stl) / 2)
+
+    def test_the_header_carries_the_piece_facts(self):
+        record = indexed_mesh.header(indexed_mesh_of(self.stl))
+
+        mesh = load_stl(self.stl).copy()
+        np.testing.assert_allclose(record['bounds'], mesh.bounds)
+        self.assertAlmostEqual(float(record['volume']), mesh.volume, 4)
+        self.assertTrue(record['flags'] & indexed_mesh.WATERTIGHT)
+
+    def test_quantized_positions_stay_within_a_quantum(self):
+        loaded = load_stl(self.stl)
+
+        path = indexed_mesh_of(self.stl, quantize=True)
+        read = indexed_mesh.read(path)
+
+        extent = loaded.bounds[1] - loaded.bounds[0]
+        error = np.abs(read.vertices - loaded.vertices).max(axis=0)
+        self.assertTrue((error <= extent / 65534).all())
+        np.testing.assert_array_equal(read.faces, loaded.faces)
+
+    def test_the_base_mesh_is_read_from_a_current_sibling(self):
+        indexed_mesh_of(self.stl)
+
+        with patch('solid_node.node.base.load_stl', side_effect=AssertionError(
+                'an indexed STL must not be parsed')):
+            mesh = cached_base_mesh(self.stl)
+
+        self.assertTrue(mesh.copy().is_volume)
+
+    def test_a_stale_or_quantized_sibling_is_not_read(self):
+        indexed_mesh_of(self.stl, quantize=True)
+        self.assertIsNone(indexed_mesh.load(self.stl))
+
+        indexed_mesh_of(self.stl)
+        # Rendered again: other bytes, published under the same mtime.
+        stat = os.stat(self.stl)
+        rendered = f'{self.stl}.tmp'
+        icosphere(subdivisions=2).export(rendered, file_type='stl')
+        os.utime(rendered, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(rendered, self.stl)
+        self.assertIsNone(indexed_mesh.load(self.stl))
+
+    def test_a_touched_stl_keeps_its_sibling(self):
+        indexed_mesh_of(self.stl)
+        os.utime(self.stl, (1, 1))
+
+        self.assertIsNotNone(indexed_mesh.load(self.stl))
+
+    def test_an_empty_artifact_is_not_indexed(self):
+        with open(self.stl, 'w') as stl:
+            stl.write('solid empty\nendsolid empty\n')
+
+        self.assertIsNone(indexed_mesh_of(self.stl))
+        self.assertFalse(os.path.exists(indexed_mesh.sibling(self.stl)))
@@ -1,7 +1,9 @@
 import os
 import tempfile
+import tomllib
 from contextlib import chdir
 from unittest import TestCase
+from unittest.mock import patch
 
 from solid_node.core.loader import (AmbiguousNodeError, ProjectManifestError,
                                     discover_project, load_node, resolve_node)
@@ -100,3 +102,43 @@ class ProjectManifestReferenceTest(TestCase):
 
         self.assertEqual(os.path.realpath(root), os.path.realpath(elsewhere))
         self.assertEqual(klass.__name__, 'Sail')
+
+
+class ProjectDiscoveryCacheTest(TestCase):
+    """Every node construction asks for its project; the manifest must be
+    parsed once, and again only when it changes."""
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp.cleanup)
+        self.root = os.path.realpath(self.temp.name)
+        self.subdir = os.path.join(self.root, 'boat')
+        os.mkdir(self.subdir)
+        self.write_manifest(self.root, 'boat.model:Sail', mtime=1000)
+
+    def write_manifest(self, directory, model, mtime):
+        manifest = os.path.join(directory, 'pyproject.toml')
+        with open(manifest, 'w') as stream:
+            stream.write(f'[tool.solid-node]\nmodel = "{model}"\n')
+        os.utime(manifest, (mtime, mtime))
+
+    def test_the_manifest_is_parsed_once(self):
+        with patch('solid_node.core.loader.tomllib.load',
+                   side_effect=tomllib.load) as parse:
+            for _ in range(10):
+                self.assertEqual(discover_project(self.subdir),
+                                 (self.root, 'boat.model:Sail'))
+        self.assertEqual(parse.call_count, 1)
+
+    def test_an_edited_manifest_is_read_again(self):
+        discover_project(self.subdir)
+        self.write_manifest(self.root, 'boat.model:Hull', mtime=2000)
+
+        self.assertEqual(discover_project(self.subdir)[1], 'boat.model:Hull')
+
+    def test_a_nearer_manifest_takes_over(self):
+        discover_project(self.subdir)
+        self.write_manifest(self.subdir, 'model:Sail', mtime=1000)
+
+        self.assertEqual(discover_project(self.subdir),
+                         (self.subdir, 'model:Sail'))
@@ -41,3 +41,18 @@ class BuildCommandTest(TestCase):
         ])
         self.assertEqual(render.start.call_count, 1)
         self.assertEqual(current.start.call_count, 1)
+
+    def test_renders_in_one_builder_process_unless_isolated(self):
+        for isolated in (False, True):
+            with self.subTest(isolated=isolated):
+                command = Build()
+                command.path = 'model.py'
+                command.isolated_renders = isolated
+                command.jobs = 3
+                with patch('solid_node.manager.build.Builder') as builder:
+                    command.builder()
+
+                self.assertEqual(
+                    builder.call_args.kwargs['in_process_renders'],
+                    not isolated)
+                self.assertEqual(builder.call_args.kwargs['jobs'], 3)
@@ -124,16 +124,65 @@ class ReloadFlagPassedOnSubsequentBuildsTest(TestCase):
         builder_2.join.side_effect = KeyboardInterrupt
 
         with patch('solid_node.manager.develop.Process',
-                   side_effect=[web_instance, builder_1, web_instance, builder_2]) as mock_process:
+                   side_effect=[web_instance, builder_1, builder_2]
+                   ) as mock_process:
             with self.assertRaises(SystemExit):
                 develop.handle(args)
 
         self.assertEqual(mock_process.call_args_list[1],
                           call(target=develop.builder, args=(False, ANY, None)))
-        self.assertEqual(mock_process.call_args_list[3],
+        self.assertEqual(mock_process.call_args_list[2],
                           call(target=develop.builder, args=(True, ANY, None)))
 
 
+class PersistentViewerTest(TestCase):
+    """The web viewer stays up across builds; builders notify it."""
+
+    def test_the_viewer_is_not_restarted_between_builds(self):
+        develop = Develop()
+        args = default_args()
+
+        web_instance = MagicMock()
+        builder_1 = MagicMock(exitcode=BuildOutcome.SOURCE_CHANGED.value)
+        builder_1.join.return_value = None
+        builder_2 = MagicMock()
+        builder_2.join.side_effect = KeyboardInterrupt
+
+        with patch('solid_node.manager.develop.Process',
+                   side_effect=[web_instance, builder_1, builder_2]):
+            with self.assertRaises(SystemExit):
+                develop.handle(args)
+
+        web_instance.start.assert_called_once()
+        web_instance.terminate.assert_not_called()
+
+    def test_builders_notify_the_viewer(self):
+        develop = Develop()
+        develop.path = '.'
+        develop.jobs = 1
+        develop.viewer_callback = 'http://127.0.0.1:8000/_build_ready'
+
+        with patch('solid_node.manager.develop.Builder') as builder:
+            develop.builder()
+
+        self.assertEqual(builder.call_args.kwargs['viewer_callback'],
+                         'http://127.0.0.1:8000/_build_ready')
+
+    def test_no_viewer_is_notified_without_one(self):
+        develop = Develop()
+        args = default_args(no_web=True)
+
+        builder_instance = MagicMock(exitcode=0)
+        builder_instance.join.side_effect = KeyboardInterrupt
+
+        with patch('solid_node.manager.develop.Process',
+                   side_effect=[builder_instance]):
+            with self.assertRaises(SystemExit):
+                develop.handle(args)
+
+        self.assertIsNone(develop.viewer_callback)
+
+
 class CallbackConfigurationTest(TestCase):
 
     def test_callback_is_passed_to_normal_web_builder(self):
@@ -70,6 +70,8 @@ class ManifoldCacheTestCase(TestCase):
         self.addCleanup(self.tmpdir.cleanup)
         self.box_path = os.path.join(self.tmpdir.name, 'box.stl')
         box((2, 2, 2)).export(self.box_path)
+        # Keyed on content: another test's identical box is not ours.
+        test_module._manifold_cache.clear()
 
     def _part(self, name, translation=None):
         node = MeshRaisesIfTouched(name, self.box_path)
@@ -0,0 +1,87 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from trimesh.creation import box
+
+from solid_node.core.pieces import fingerprint_artifact
+from solid_node.memory_cache import MemoryCache, parse_size
+from solid_node.node.base import _base_mesh_cache, cached_base_mesh
+
+
+class MemoryCacheTest(TestCase):
+
+    def setUp(self):
+        patcher = patch.dict(os.environ, {'SOLID_MEMORY_CACHE_SIZE': '100'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.meshes = MemoryCache('meshes')
+        self.shapes = MemoryCache('shapes')
+        self.addCleanup(self.meshes.clear)
+        self.addCleanup(self.shapes.clear)
+
+    def test_least_recently_used_entries_go_first_across_caches(self):
+        self.meshes.put('a', 'A', 40)
+        self.shapes.put('b', 'B', 40)
+        self.meshes.get('a')
+
+        self.shapes.put('c', 'C', 40)
+
+        self.assertEqual(list(self.meshes), ['a'])
+        self.assertEqual(list(self.shapes), ['c'])
+        self.assertEqual(self.shapes.evictions, 1)
+        self.assertEqual(self.meshes.evictions, 0)
+
+    def test_counters(self):
+        self.meshes.put('a', 'A', 30)
+        self.meshes.get('a')
+        self.meshes.get('missing')
+        self.meshes.put('a', 'A2', 50)
+
+        self.assertEqual(self.meshes.stats(), {
+            'hits': 1, 'misses': 1, 'evictions': 0, 'bytes': 50,
+            'entries': 1})
+
+    def test_removed_entries_give_their_bytes_back(self):
+        self.meshes.put(('part.stl', 1), 'old', 60)
+        del self.meshes[('part.stl', 1)]
+        self.shapes.put('b', 'B', 60)
+
+        self.assertEqual(self.meshes.bytes, 0)
+        self.assertEqual(self.shapes.evictions, 0)
+        self.assertIn('b', self.shapes)
+
+    def test_an_entry_larger_than_the_budget_is_still_kept(self):
+        self.meshes.put('a', 'A', 10)
+        self.meshes.put('huge', 'H', 1000)
+
+        self.assertEqual(list(self.meshes), ['huge'])
+
+    def test_sizes(self):
+        self.assertEqual(parse_size('512', 'SIZE'), 512)
+        self.assertEqual(parse_size('2G', 'SIZE'), 2 * 1024 ** 3)
+        with self.assertRaises(ValueError):
+            parse_size('lots', 'SIZE')
+
+    def test_base_meshes_are_charged_to_the_budget(self):
+        os.environ['SOLID_MEMORY_CACHE_SIZE'] = '700'
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        paths = [os.path.join(directory.name, f'{index}.stl')
+                 for index in range(3)]
+        self.addCleanup(_base_mesh_cache.clear)
+        for index, path in enumerate(paths):
+            box(extents=(1, 1, index + 1)).export(path)
+            cached_base_mesh(path)
+
+        # 8 float32 vertices and 12 int32 faces are 240 bytes, and each
+        # mesh's content fingerprint about 60 more: two of each fit in
+        # 700.
+        cached = [path for path in paths
+                  if fingerprint_artifact(path) in _base_mesh_cache]
+        self.assertEqual(cached, paths[1:])
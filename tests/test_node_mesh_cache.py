@@ -29,8 +29,11 @@ import numpy as np
 import trimesh
 from trimesh.creation import box
 
-from solid_node.node.base import AbstractBaseNode
+import solid_node.test as test_module
+from solid_node.node.base import (AbstractBaseNode, _base_mesh_cache,
+                                  cached_base_mesh)
 from solid_node.node.operations import Rotation, Translation
+from solid_node.node.stl import load_stl
 
 
 def _old_style_mesh(node):
@@ -111,6 +114,10 @@ class MeshCacheTestCase(TestCase):
         self.addCleanup(self.tmpdir.cleanup)
         self.stl_path = os.path.join(self.tmpdir.name, 'part.stl')
         box((2, 3, 4)).export(self.stl_path)
+        # The cache is keyed on content: another test's identical box
+        # would otherwise already be loaded.
+        _base_mesh_cache.clear()
+        test_module._manifold_cache.clear()
 
 
 class BaseMeshCacheTest(MeshCacheTestCase):
@@ -123,13 +130,13 @@ class BaseMeshCacheTest(MeshCacheTestCase):
         node.operations.append(Translation([1, 0, 0], node))
 
         calls = []
-        original_load = trimesh.load
+        original_load = load_stl
 
         def counting_load(path, *args, **kwargs):
             calls.append(path)
             return original_load(path, *args, **kwargs)
 
-        with patch('solid_node.node.base.trimesh.load',
+        with patch('solid_node.node.base.load_stl',
                    side_effect=counting_load):
             node.mesh
             node.mesh
@@ -142,13 +149,13 @@ class BaseMeshCacheTest(MeshCacheTestCase):
         node_b = FakeNode(self.stl_path)
 
         calls = []
-        original_load = trimesh.load
+        original_load = load_stl
 
         def counting_load(path, *args, **kwargs):
             calls.append(path)
             return original_load(path, *args, **kwargs)
 
-        with patch('solid_node.node.base.trimesh.load',
+        with patch('solid_node.node.base.load_stl',
                    side_effect=counting_load):
             node_a.mesh
             node_b.mesh
@@ -167,6 +174,21 @@ class BaseMeshCacheTest(MeshCacheTestCase):
 
         self.assertNotAlmostEqual(first_volume, second_volume, places=2)
 
+    def test_a_replaced_stl_under_the_same_stat_is_reloaded(self):
+        box((1, 1, 1)).export(self.stl_path)
+        stat = os.stat(self.stl_path)
+        self.assertEqual(cached_base_mesh(self.stl_path).bounds[1][0], 0.5)
+
+        replacement = self.stl_path + '.tmp'
+        box((5, 5, 5)).export(replacement, file_type='stl')
+        os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(replacement, self.stl_path)
+        self.assertEqual(os.path.getsize(self.stl_path), stat.st_size)
+
+        self.assertEqual(cached_base_mesh(self.stl_path).bounds[1][0], 2.5)
+        manifold, bounds = test_module._cached_manifold(self.stl_path)
+        self.assertEqual(bounds[1][0], 2.5)
+
 
 class CopySemanticsTest(MeshCacheTestCase):
     """.mesh must hand back a COPY: callers are free to mutate it, and
@@ -277,3 +299,45 @@ class ReflectsKeyframeChangeTest(MeshCacheTestCase):
 
         self.assertFalse(np.allclose(
             mesh_at_0.vertices, mesh_at_90.vertices, atol=1e-6))
+
+
+class ContentDedupeTest(MeshCacheTestCase):
+    """Byte-identical STLs behind different paths -- the same printed
+    piece built by two nodes -- share one cached mesh and Manifold."""
+
+    def setUp(self):
+        super().setUp()
+        self.twin_path = os.path.join(self.tmpdir.name, 'twin.stl')
+        with open(self.stl_path, 'rb') as source, \
+                open(self.twin_path, 'wb') as twin:
+            twin.write(source.read())
+
+    def test_identical_stls_are_loaded_once(self):
+        calls = []
+
+        def counting_load(path):
+            calls.append(path)
+            return load_stl(path)
+
+        with patch('solid_node.node.base.load_stl',
+                   side_effect=counting_load):
+            first = cached_base_mesh(self.stl_path)
+            second = cached_base_mesh(self.twin_path)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+
+    def test_identical_stls_share_one_manifold(self):
+        first = test_module._cached_manifold(self.stl_path)
+        second = test_module._cached_manifold(self.twin_path)
+
+        self.assertIs(first, second)
+
+    def test_a_rebuilt_stl_releases_its_old_content(self):
+        first = cached_base_mesh(self.twin_path)
+        box((6, 6, 6)).export(self.twin_path)
+        os.utime(self.twin_path, (5000, 5000))
+
+        self.assertIsNot(cached_base_mesh(self.twin_path), first)
+        # Still the stl_path's content: it is kept.
+        self.assertIs(cached_base_mesh(self.stl_path), first)
@@ -109,7 +109,9 @@ class OpenScadDependencyTest(TestCase):
                    side_effect=AssertionError('must fail before launch')):
             with self.assertRaisesRegex(
                     RuntimeError, 'animated-arm.*symbolic.*OpenSCAD'):
-                node.as_number(OpenSCADConstant('$t'))
+                # $t alone is evaluated in process; a vector function is
+                # not, and still needs the binary.
+                node.as_number(OpenSCADConstant('norm([3, 4])'))
 
     def test_viewer_missing_binary_names_requested_viewer(self):
         node = Mock(scad_file='/tmp/project.scad')
@@ -0,0 +1,144 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import cadquery as cq
+from solid2 import cube
+
+from solid_node import render_cache
+from solid_node.node import CadQueryNode, Solid2Node
+from solid_node.node.base import StlRenderStart
+
+
+class FacetedBox(Solid2Node):
+    def render(self):
+        return cube(2)
+
+
+class ExactBox(CadQueryNode):
+    def render(self):
+        return cq.Workplane('XY').box(2, 2, 2)
+
+
+def fake_openscad(command):
+    """Popen for `openscad scad -o output ...`: writes a tiny STL."""
+    with open(command[3], 'w') as output:
+        output.write('solid fake\nendsolid fake\n')
+    return Mock(pid=4242, poll=Mock(return_value=0), wait=Mock(return_value=0))
+
+
+class RenderCacheTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = os.path.join(self.directory.name, 'cache')
+        environment = {
+            'SOLID_CACHE_DIR': self.cache,
+            'SOLID_BUILD_DIR': os.path.join(self.directory.name, 'first'),
+        }
+        for patcher in (
+                patch.dict(os.environ, environment),
+                patch('solid_node.node.base.require_openscad',
+                      return_value='/usr/bin/openscad'),
+                patch('solid_node.render_cache.openscad_version',
+                      return_value='OpenSCAD version 2021.01')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def second_worktree(self):
+        os.environ['SOLID_BUILD_DIR'] = os.path.join(
+            self.directory.name, 'second')
+
+    def artifact(self, name, content='data', mtime=1000):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as output:
+            output.write(content)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_identical_scad_is_linked_instead_of_rendered(self):
+        first = FacetedBox()
+        first.assemble()
+        with patch('solid_node.node.base.Popen', side_effect=fake_openscad):
+            with self.assertRaises(StlRenderStart) as started:
+                first.generate_stl()
+        started.exception.finish()
+
+        self.second_worktree()
+        second = FacetedBox()
+        second.assemble()
+        with patch('solid_node.node.base.Popen', side_effect=AssertionError(
+                'a cached STL must not be rendered again')):
+            second.generate_stl()
+
+        self.assertTrue(second._up_to_date(second.stl_file))
+        self.assertNotEqual(first.stl_file, second.stl_file)
+        self.assertEqual(os.stat(first.stl_file).st_ino,
+                         os.stat(second.stl_file).st_ino)
+
+    def test_exact_artifacts_are_linked_instead_of_exported(self):
+        ExactBox().assemble()
+
+        self.second_worktree()
+        second = ExactBox()
+        with patch('solid_node.node.adapters.cadquery.write_stl',
+                   side_effect=AssertionError('must not export the STL')), \
+             patch('solid_node.node.adapters.cadquery.write_brep',
+                   side_effect=AssertionError('must not export the BREP')):
+            second.assemble()
+
+        self.assertTrue(second._up_to_date(second.stl_file))
+        self.assertTrue(second._up_to_date(second.brep_file))
+
+    def test_scad_key_covers_imported_files(self):
+        scad = self.artifact('part.scad', 'import("child.stl");')
+        self.artifact('child.stl', 'one')
+        before = render_cache.scad_key(scad, '/usr/bin/openscad')
+        self.artifact('child.stl', 'two', mtime=2000)
+
+        self.assertNotEqual(
+            render_cache.scad_key(scad, '/usr/bin/openscad'), before)
+
+        self.artifact('part.scad', 'include <not-next-to-it.scad>\ncube(1);')
+        self.assertIsNone(render_cache.scad_key(scad, '/usr/bin/openscad'))
+
+    def test_a_link_never_changes_another_trees_mtime(self):
+        render_cache.store('ab' * 32, self.artifact('rendered.stl'))
+
+        first = os.path.join(self.directory.name, 'first.stl')
+        second = os.path.join(self.directory.name, 'second.stl')
+        self.assertTrue(render_cache.fetch('ab' * 32, first, 1000))
+        self.assertTrue(render_cache.fetch('ab' * 32, second, 3000))
+
+        self.assertEqual(os.path.getmtime(first), 1000)
+        self.assertEqual(os.path.getmtime(second), 3000)
+        self.assertFalse(render_cache.fetch(
+            'cd' * 32, os.path.join(self.directory.name, 'miss.stl'), 1))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        os.environ['SOLID_CACHE_SIZE'] = '10'
+        keys = [f'{index:02d}' * 32 for index in range(3)]
+        for index, key in enumerate(keys[:2]):
+            render_cache.store(key, self.artifact(f'{index}.stl', 'four'))
+            os.utime(render_cache._entry(key), (index, index))
+        # Using the oldest entry makes the other one the eviction victim.
+        render_cache.fetch(
+            keys[0], os.path.join(self.directory.name, 'used.stl'), 1000)
+
+        render_cache.store(keys[2], self.artifact('2.stl', 'four'))
+
+        cached = [key for key in keys
+                  if os.path.exists(render_cache._entry(key))]
+        self.assertEqual(cached, [keys[0], keys[2]])
+
+    def test_caching_is_off_without_a_directory(self):
+        del os.environ['SOLID_CACHE_DIR']
+        self.assertIsNone(render_cache.scad_key(
+            self.artifact('part.scad', 'cube(1);'), '/usr/bin/openscad'))
+        self.assertIsNone(render_cache.exact_key(ExactBox(), 'stl'))
@@ -0,0 +1,67 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""Exact artifacts are rendered by pool workers during a build with
+several jobs (see solid_node/node/render_pool.py)."""
+
+from unittest.mock import patch
+
+import cadquery as cq
+
+from solid_node.node import CadQueryNode
+from solid_node.node.render_pool import render_pool
+from solid_node.node.scheduler import RenderScheduler
+from .base import BaseNodeTest
+from .pool_project import Plate, PlateWithDisc
+
+
+def refuse_in_process(*args, **kwargs):
+    raise AssertionError('must be rendered by a worker')
+
+
+class RenderPoolTest(BaseNodeTest):
+
+    def test_exact_nodes_are_rendered_by_workers(self):
+        node = PlateWithDisc()
+        with render_pool.build(2), \
+             patch.object(Plate, 'render', refuse_in_process), \
+             patch('solid_node.node.fusion.fuse_all', refuse_in_process):
+            node.assemble()
+            self.assertIsNotNone(render_pool.pending(node.plate.stl_file))
+            self.assertTrue(RenderScheduler(node, 2).run())
+
+        for part in (node, node.plate, node.disc):
+            self.assertTrue(part._up_to_date(part.stl_file))
+            self.assertTrue(part._up_to_date(part.brep_file))
+        self.assertIn(node.plate.local_stl, node.scad_code)
+
+    def test_nothing_is_pooled_with_a_single_job(self):
+        node = Plate()
+        with render_pool.build(1):
+            node.assemble()
+
+        self.assertIsNone(render_pool.pending(node.stl_file))
+        self.assertTrue(node._up_to_date(node.stl_file))
+
+    def test_a_current_node_is_not_pooled(self):
+        Plate().assemble()
+
+        node = Plate()
+        with render_pool.build(2), \
+             patch.object(Plate, 'render', refuse_in_process):
+            node.assemble()
+            self.assertIsNone(render_pool.pending(node.stl_file))
+
+    def test_a_node_workers_cannot_rebuild_renders_in_process(self):
+        class Local(CadQueryNode):
+
+            def render(self):
+                return cq.Workplane("XY").box(1, 1, 1)
+
+        node = Local()
+        with render_pool.build(2):
+            node.assemble()
+            self.assertIsNone(render_pool.pending(node.stl_file))
+
+        self.assertTrue(node._up_to_date(node.stl_file))
@@ -0,0 +1,161 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from solid_node.node.base import StlRenderStart
+from solid_node.node.render_pool import render_pool
+from solid_node.node.scheduler import RenderScheduler
+
+
+class FakeProc:
+    """An openscad child that has already exited."""
+
+    pid = 123
+
+    def __init__(self, running=False):
+        self.running = running
+        self.terminate = Mock()
+
+    def poll(self):
+        return None if self.running else 0
+
+    def wait(self):
+        return 0
+
+
+class FakeNode:
+    """A rigid node whose generate_stl starts a render the way the real one
+    does: a temporary file and a lock beside the artifact, published by
+    StlRenderStart.finish()."""
+
+    def __init__(self, directory, name, children=(), events=None,
+                 running=False):
+        self.name = name
+        self.rigid = True
+        self.children = children
+        self.mtime = 0
+        self.stl_file = os.path.join(directory, f'{name}.stl')
+        self.lock_file = f'{self.stl_file}.lock'
+        self.events = events if events is not None else []
+        self.running = running
+        self.locked = False
+
+    def assemble(self):
+        pass
+
+    def discard_assembly(self):
+        for child in self.children:
+            child.discard_assembly()
+
+    def _up_to_date(self, path):
+        return os.path.exists(path) and os.path.getmtime(path) == self.mtime
+
+    def generate_stl(self):
+        if self._up_to_date(self.stl_file) or self.locked:
+            return
+        self.events.append(('start', self.name, self._rendering()))
+        temporary = f'{self.stl_file}.tmp'
+        open(temporary, 'w').close()
+        open(self.lock_file, 'w').close()
+        raise StlRenderStart(FakeProc(self.running), self.stl_file,
+                             temporary, self.mtime, self.lock_file)
+
+    def _rendering(self):
+        directory = os.path.dirname(self.stl_file)
+        return len([name for name in os.listdir(directory)
+                    if name.endswith('.tmp')])
+
+
+class FakePooledRender:
+    """A render pool job handed out while the tree assembled, already
+    done."""
+
+    def __init__(self, pending, events):
+        self.stl_file = 'pooled.stl'
+        self.pending = pending
+        self.events = events
+        self.cancel = Mock()
+
+    def done(self):
+        return True
+
+    def finish(self):
+        self.pending.remove(self)
+        self.events.append(('finish', 'pooled', None))
+
+
+class RenderSchedulerTest(TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.events = []
+
+    def node(self, name, children=(), **kwargs):
+        return FakeNode(self.root, name, children, self.events, **kwargs)
+
+    def assembly(self, children):
+        root = self.node('assembly', children)
+        root.rigid = False
+        return root
+
+    def test_independent_renders_run_concurrently_up_to_the_limit(self):
+        parts = [self.node(f'part{index}') for index in range(5)]
+
+        self.assertTrue(RenderScheduler(self.assembly(parts), jobs=3).run())
+
+        self.assertEqual(max(running for _, _, running in self.events), 2)
+        self.assertEqual([running for _, _, running in self.events[:3]],
+                         [0, 1, 2])
+        for part in parts:
+            self.assertTrue(part._up_to_date(part.stl_file))
+            self.assertFalse(os.path.exists(part.lock_file))
+
+    def test_a_parent_waits_for_the_stls_it_imports(self):
+        children = [self.node('left'), self.node('right')]
+        parent = self.node('fusion', children)
+
+        RenderScheduler(self.assembly([parent]), jobs=8).run()
+
+        self.assertEqual([name for _, name, _ in self.events],
+                         ['left', 'right', 'fusion'])
+        self.assertTrue(parent._up_to_date(parent.stl_file))
+
+    def test_a_locked_artifact_is_left_to_its_owner(self):
+        part = self.node('part')
+        part.locked = True
+
+        self.assertTrue(RenderScheduler(self.assembly([part])).run())
+        self.assertEqual(self.events, [])
+
+    def test_interruption_cancels_running_renders(self):
+        finished = self.node('finished')
+        running = self.node('running', running=True)
+
+        completed = RenderScheduler(
+            self.assembly([finished, running]), jobs=2).run(lambda: True)
+
+        self.assertFalse(completed)
+        self.assertTrue(finished._up_to_date(finished.stl_file))
+        self.assertFalse(os.path.exists(running.stl_file))
+        self.assertEqual(
+            [name for name in os.listdir(self.root)], ['finished.stl'])
+
+    def test_pooled_renders_count_against_the_limit(self):
+        parts = [self.node(f'part{index}') for index in range(2)]
+        pending = []
+        pending.append(FakePooledRender(pending, self.events))
+
+        with patch.object(render_pool, 'pending_jobs',
+                          side_effect=lambda: list(pending)):
+            self.assertTrue(
+                RenderScheduler(self.assembly(parts), jobs=2).run())
+
+        self.assertEqual([name for _, name, _ in self.events],
+                         ['part0', 'pooled', 'part1'])
@@ -0,0 +1,108 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from trimesh.creation import box, icosphere
+
+from solid_node.node import shared_meshes
+from solid_node.node.base import (_base_mesh_cache, _base_mesh_paths,
+                                  cached_base_mesh)
+
+
+class SharedMeshesTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.segments = os.path.join(self.directory.name, 'shm')
+        patcher = patch.dict(os.environ,
+                             {'SOLID_SHARED_MESHES': self.segments})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.stl = os.path.join(self.directory.name, 'part.stl')
+        icosphere(subdivisions=2).export(self.stl)
+        self.addCleanup(self.forget)
+
+    def forget(self):
+        """What a fresh process knows about the STL: nothing."""
+        _base_mesh_cache.clear()
+
+    def test_another_process_maps_the_published_mesh(self):
+        loaded = subprocess.run(
+            [sys.executable, '-c',
+             'import sys\n'
+             'from solid_node.node.base import cached_base_mesh\n'
+             'cached_base_mesh(sys.argv[1])\n', self.stl],
+            env=os.environ.copy(), check=True)
+
+        with patch('solid_node.node.base.load_stl', side_effect=AssertionError(
+                'a published mesh must not be parsed again')):
+            mesh = cached_base_mesh(self.stl)
+
+        self.assertEqual(loaded.returncode, 0)
+        self.assertFalse(mesh.vertices.flags.writeable)
+        self.assertTrue(mesh.copy().is_volume)
+
+    def test_the_mapped_mesh_is_the_loaded_mesh(self):
+        loaded = cached_base_mesh(self.stl)
+        self.forget()
+
+        mapped = cached_base_mesh(self.stl)
+
+        self.assertIsNot(mapped, loaded)
+        np.testing.assert_array_equal(mapped.vertices, loaded.vertices)
+        np.testing.assert_array_equal(mapped.faces, loaded.faces)
+        # Callers that transform take a private copy.
+        copy = mapped.copy()
+        copy.apply_translation([1, 0, 0])
+        self.assertEqual(mapped.bounds[0][0], loaded.bounds[0][0])
+
+    def test_a_mapped_mesh_is_not_fingerprinted(self):
+        loaded = cached_base_mesh(self.stl)
+        self.forget()
+        _base_mesh_paths.clear()
+
+        with patch('solid_node.core.pieces.fingerprint_artifact',
+                   side_effect=AssertionError('must not read the STL')):
+            mapped = cached_base_mesh(self.stl)
+
+        np.testing.assert_array_equal(mapped.faces, loaded.faces)
+
+    def test_a_changed_stl_replaces_its_segment(self):
+        cached_base_mesh(self.stl)
+        box().export(self.stl)
+        os.utime(self.stl, (5000, 5000))
+
+        self.assertEqual(len(cached_base_mesh(self.stl).faces), 12)
+        self.assertEqual(len(os.listdir(self.segments)), 1)
+
+    def test_a_replaced_stl_under_the_same_stat_is_not_mapped(self):
+        box((1, 1, 1)).export(self.stl)
+        stat = os.stat(self.stl)
+        cached_base_mesh(self.stl)
+
+        replacement = self.stl + '.tmp'
+        box((5, 5, 5)).export(replacement, file_type='stl')
+        os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(replacement, self.stl)
+        self.assertEqual(os.path.getsize(self.stl), stat.st_size)
+        self.forget()
+
+        self.assertIsNone(shared_meshes.attach(self.stl, os.stat(self.stl)))
+        self.assertEqual(cached_base_mesh(self.stl).bounds[1][0], 2.5)
+
+    def test_nothing_is_shared_by_default(self):
+        del os.environ['SOLID_SHARED_MESHES']
+        cached_base_mesh(self.stl)
+
+        self.assertFalse(os.path.exists(self.segments))
+        self.assertIsNone(
+            shared_meshes.attach(self.stl, os.stat(self.stl)))
@@ -18,8 +18,10 @@ render is what keeps a shared-module edit correct.
 """
 
 import os
+import sys
 import tempfile
 import time
+import types
 from contextlib import chdir
 from unittest import TestCase, mock
 
@@ -32,6 +34,7 @@ from .source_set_project.cyl import Cyl
 from .source_set_project.jsblock import JsBlock
 from .source_set_project.lonely import Lonely
 from solid_node.core.loader import import_module_from_path
+from solid_node.node import sources
 from solid_node.node.sources import source_closure
 
 
@@ -252,3 +255,45 @@ class SourceClosureRootAnchoringTest(TestCase):
         # is genuinely part of the set both times, which is the whole
         # thing a wrong project boundary would have silently dropped.
         self.assertIn(self.dims_path, from_root)
+
+
+class ModuleIndexTest(TestCase):
+    """The realpath -> module lookups closures make follow sys.modules
+    without resolving every module's path on every call."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.realpath(
+            os.path.join(self.directory.name, 'gear.py'))
+        open(self.path, 'w').close()
+
+    def install(self, name, package):
+        module = types.ModuleType(name)
+        module.__file__ = self.path
+        module.__package__ = package
+        sys.modules[name] = module
+        self.addCleanup(sys.modules.pop, name, None)
+        return module
+
+    def test_lookups_follow_imports_and_reimports(self):
+        self.install('_index_probe_gear', 'first')
+        self.assertEqual(sources._package_of(self.path), 'first')
+
+        del sys.modules['_index_probe_gear']
+        self.assertIsNone(sources._package_of(self.path))
+
+        self.install('_index_probe_gear', 'second')
+        self.assertEqual(sources._package_of(self.path), 'second')
+
+    def test_paths_are_resolved_once_per_module(self):
+        module = self.install('_index_probe_gear', None)
+        sources._modules.module('_index_probe_gear')
+
+        with mock.patch('solid_node.node.sources.os.path.realpath',
+                        side_effect=AssertionError('resolved again')):
+            for _ in range(3):
+                self.assertEqual(
+                    sources._modules.module('_index_probe_gear'),
+                    (module, self.path))
+                sources._package_of(self.path)
@@ -0,0 +1,69 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from solid_node.core.builder import Builder
+from solid_node.node.stat_cache import SourceStats, source_stats
+
+
+class SourceStatsTest(TestCase):
+
+    def setUp(self):
+        descriptor, self.path = tempfile.mkstemp(suffix='.py')
+        os.close(descriptor)
+        self.addCleanup(os.remove, self.path)
+        os.utime(self.path, (1000, 1000))
+        self.stats = SourceStats()
+
+    def test_a_build_stats_each_source_once(self):
+        with self.stats.build():
+            for _ in range(5):
+                self.assertEqual(self.stats.getmtime(self.path), 1000)
+
+            self.assertEqual(self.stats.lookups, 5)
+            self.assertEqual(self.stats.stats, 1)
+            self.assertEqual(self.stats.avoided, 4)
+
+    def test_invalidation_picks_up_changes(self):
+        with self.stats.build():
+            self.stats.getmtime(self.path)
+            os.utime(self.path, (2000, 2000))
+            self.assertEqual(self.stats.getmtime(self.path), 1000)
+
+            self.stats.invalidate()
+
+            self.assertEqual(self.stats.getmtime(self.path), 2000)
+
+    def test_an_mtime_read_before_an_event_is_not_kept(self):
+        def changed_while_reading(path):
+            self.stats.invalidate()
+            return 1000
+
+        with self.stats.build(), \
+             patch('solid_node.node.stat_cache.os.path.getmtime',
+                   side_effect=changed_while_reading):
+            self.stats.getmtime(self.path)
+            self.stats.getmtime(self.path)
+            self.assertEqual(self.stats.stats, 2)
+
+    def test_nothing_is_remembered_outside_a_build(self):
+        self.stats.getmtime(self.path)
+        os.utime(self.path, (2000, 2000))
+
+        self.assertEqual(self.stats.getmtime(self.path), 2000)
+        self.assertEqual(self.stats.avoided, 0)
+
+    def test_watchdog_events_invalidate_the_build_cache(self):
+        builder = Builder('project.py', watch=True)
+        with source_stats.build():
+            source_stats.getmtime(self.path)
+            os.utime(self.path, (2000, 2000))
+
+            builder.on_any_event(Mock(src_path=self.path, is_directory=False))
+
+            self.assertEqual(source_stats.getmtime(self.path), 2000)
@@ -0,0 +1,152 @@
+# Solid Node - A framework for mechanical CAD projects
+# Copyright (C) 2023-2026 Luis Henrique Cassis Fagundes
+# SPDX-License-Identifier: Apache-2.0
+
+"""load_stl must give cached_base_mesh's callers the mesh trimesh.load
+gave them: same vertices in the same order, same faces -- stored
+compactly."""
+
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import trimesh
+from trimesh.creation import box, icosphere
+
+from solid_node.node.stl import load_stl, weld
+
+
+class LoadStlTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'part.stl')
+
+    def write(self, content):
+        with open(self.path, 'wb') as output:
+            output.write(content)
+
+    def assertLoadsLikeTrimesh(self):
+        expected = trimesh.load(self.path)
+        mesh = load_stl(self.path)
+        np.testing.assert_array_equal(mesh.vertices, expected.vertices)
+        np.testing.assert_array_equal(mesh.faces, expected.faces)
+        self.assertTrue(mesh.copy().is_volume)
+        return mesh
+
+    def test_binary_stl(self):
+        icosphere(subdivisions=3).export(self.path, file_type='stl')
+        mesh = self.assertLoadsLikeTrimesh()
+
+        self.assertEqual(mesh.vertices.dtype, np.float32)
+        self.assertEqual(mesh.faces.dtype, np.int32)
+        self.assertFalse(mesh.vertices.flags.writeable)
+
+    def test_ascii_stl(self):
+        icosphere(subdivisions=3).export(self.path, file_type='stl_ascii')
+        self.assertLoadsLikeTrimesh()
+
+    def test_coordinates_float32_would_round_stay_float64(self):
+        self.write(trimesh.exchange.stl.export_stl_ascii(
+            box(extents=(0.1, 0.2, 0.3))).encode())
+
+        mesh = load_stl(self.path)
+
+        self.assertEqual(mesh.vertices.dtype, np.float64)
+        np.testing.assert_array_equal(mesh.bounds, [[-0.05, -0.1, -0.15],
+                                                    [0.05, 0.1, 0.15]])
+
+    def test_placed_meshes_are_float64(self):
+        box().export(self.path)
+        compact = load_stl(self.path)
+        matrix = np.eye(4)
+        matrix[:3, 3] = [10, 0, 0]
+
+        placed = compact.placed(matrix)
+
+        self.assertEqual(placed.vertices.dtype, np.float64)
+        self.assertEqual(placed.bounds[0].tolist(), [9.5, -0.5, -0.5])
+        self.assertEqual(compact.bounds[0].tolist(), [-0.5, -0.5, -0.5])
+
+    def test_a_binary_header_may_start_with_solid(self):
+        content = trimesh.exchange.stl.export_stl(box())
+        self.write(b'solid'.ljust(80) + content[80:])
+
+        self.assertEqual(len(load_stl(self.path).faces), 12)
+
+    def test_an_unusual_ascii_layout_still_loads(self):
+        text = trimesh.exchange.stl.export_stl_ascii(box())
+        self.write(text.upper().encode() + text.encode())
+
+        mesh = load_stl(self.path)
+
+        self.assertEqual(len(mesh.faces), 24)
+        self.assertEqual(len(mesh.vertices), 8)
+
+    def test_an_empty_stl_is_an_empty_mesh(self):
+        self.write(b'solid empty\nendsolid empty\n')
+        self.assertEqual(len(load_stl(self.path).faces), 0)
+
+    def test_negative_zero_is_the_same_corner(self):
+        corners = np.array([[0.0, 1, 0], [1, 0, 0], [0, 0, 0],
+                            [-0.0, 1, 0], [0, 0, -0.0], [1, 0, 1]])
+
+        vertices, faces = weld(corners)
+
+        self.assertEqual(len(vertices), 4)
+        np.testing.assert_array_equal(faces, [[0, 1, 2], [0, 2, 3]])
+
+
+class PlacedMeshTest(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'part.stl')
+        box(extents=(1, 2, 3)).export(path)
+        self.compact = load_stl(path)
+
+    def transformed(self, matrix):
+        mesh = self.compact.copy()
+        mesh.apply_transform(matrix)
+        return mesh
+
+    def test_bounds_do_not_place_the_mesh(self):
+        matrix = trimesh.transformations.rotation_matrix(
+            np.pi / 2, [0, 0, 1], point=[1, 0, 0])
+        placed = self.compact.placed(matrix)
+        expected = self.transformed(matrix)
+
+        np.testing.assert_allclose(placed.bounds, expected.bounds)
+        self.assertIsNotNone(placed._pending)
+        np.testing.assert_array_equal(placed.vertices, expected.vertices)
+        self.assertIsNone(placed._pending)
+
+    def test_it_is_the_transformed_trimesh(self):
+        matrix = np.diag([-1.0, 1, 1, 1])
+        placed = self.compact.placed(matrix)
+        expected = self.transformed(matrix)
+
+        self.assertIsInstance(placed, trimesh.Trimesh)
+        self.assertAlmostEqual(placed.volume, expected.volume)
+        np.testing.assert_array_equal(placed.faces, expected.faces)
+        self.assertTrue(placed.contains([[0, 0, 0]]).all())
+        both = placed + self.compact.placed(np.eye(4))
+        self.assertEqual(len(both.faces), 2 * len(expected.faces))
+
+    def test_oblique_bounds_are_exact(self):
+        matrix = trimesh.transformations.rotation_matrix(0.3, [1, 1, 0])
+        placed = self.compact.placed(matrix)
+
+        np.testing.assert_array_equal(
+            placed.bounds, self.transformed(matrix).bounds)
+
+    def test_mutations_reach_what_is_read_next(self):
+        placed = self.compact.placed(np.eye(4))
+        placed.vertices
+        placed.apply_translation([5, 0, 0])
+
+        self.assertEqual(placed.bounds[0].tolist(), [4.5, -1.0, -1.5])
+        self.assertEqual(self.compact.bounds[0].tolist(), [-0.5, -1.0, -1.5])
@@ -4,6 +4,7 @@
 
 """HTTP coverage for the snapshot-backed development viewer."""
 
+import gzip
 import json
 import os
 import shutil
@@ -19,6 +20,7 @@ from fastapi.testclient import TestClient
 import uvicorn
 
 from solid_node.core.export import export_node
+from solid_node.core.precompress import sibling_of
 from solid_node.viewers.bundle import bundle_path
 from solid_node.viewers.web.viewer import WebViewer
 
@@ -71,6 +73,104 @@ class WebViewerSnapshotTest(TestCase):
         self.assertEqual(client.get('/build/viewer.json').status_code, 404)
         self.assertEqual(client.get('/_build_error').status_code, 200)
 
+    def test_a_finished_build_is_pushed_with_what_changed(self):
+        viewer = self.viewer()
+        client = TestClient(viewer.app)
+        first = viewer.revision
+        (self.build_dir / 'viewer.json').write_text(json.dumps({
+            'format': 'solid-node-viewer',
+            'version': 1,
+            'animation': {'fps': 30, 'frames': 360},
+            'root': {'name': 'part', 'mtime': 2, 'children': [
+                {'name': 'part', 'model': 'models/part.stl', 'mtime': 2},
+                {'name': 'lid', 'model': 'models/lid.stl', 'mtime': 1},
+            ]},
+        }))
+
+        with client.websocket_connect('/ws/reload') as first_client, \
+             client.websocket_connect('/ws/reload') as second_client:
+            greeted = [first_client.receive_json(),
+                       second_client.receive_json()]
+            response = client.post('/_build_ready')
+            pushed = [first_client.receive_json(),
+                      second_client.receive_json()]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(pushed, [response.json()] * 2)
+        self.assertEqual(response.json()['type'], 'build')
+        self.assertEqual(response.json()['changed'],
+                         ['models/lid.stl', 'models/part.stl'])
+        self.assertNotEqual(response.json()['revision'], first)
+
+        self.assertEqual(greeted, [
+            {'type': 'build', 'revision': first, 'changed': []}] * 2)
+        self.assertEqual(client.post('/_build_ready').json()['changed'], [])
+
+    def test_a_revalidated_artifact_is_not_sent_again(self):
+        client = TestClient(self.viewer().app)
+        model = client.get('/build/models/part.stl')
+
+        again = client.get('/build/models/part.stl',
+                           headers={'If-None-Match': model.headers['etag']})
+
+        self.assertEqual(model.headers['cache-control'], 'no-cache')
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b'')
+        self.assertEqual(again.headers['etag'], model.headers['etag'])
+
+    def test_a_changed_artifact_is_sent_with_a_new_tag(self):
+        client = TestClient(self.viewer().app)
+        etag = client.get('/build/models/part.stl').headers['etag']
+        path = self.build_dir / 'models' / 'part.stl'
+        path.write_text('solid changed')
+        os.utime(path, (1, 1))
+
+        model = client.get('/build/models/part.stl',
+                           headers={'If-None-Match': etag})
+
+        self.assertEqual(model.status_code, 200)
+        self.assertEqual(model.text, 'solid changed')
+        self.assertNotEqual(model.headers['etag'], etag)
+
+    def test_a_content_versioned_model_is_cached_immutable(self):
+        client = TestClient(self.viewer().app)
+        fingerprint = client.get(
+            '/build/models/part.stl').headers['etag'].strip('"')
+
+        current = client.get(f'/build/models/part.stl?v={fingerprint}')
+        outdated = client.get('/build/models/part.stl?v=000000000000')
+
+        self.assertEqual(current.headers['cache-control'],
+                         'public, max-age=31536000, immutable')
+        self.assertEqual(outdated.headers['cache-control'], 'no-cache')
+
+    def test_a_current_compressed_sibling_is_served_encoded(self):
+        path = self.build_dir / 'models' / 'part.stl'
+        sibling = sibling_of(str(path), 'gzip')
+        with open(sibling, 'wb') as compressed:
+            compressed.write(gzip.compress(b'solid part'))
+        client = TestClient(self.viewer().app)
+
+        encoded = client.get('/build/models/part.stl',
+                             headers={'Accept-Encoding': 'gzip'})
+        plain = client.get('/build/models/part.stl',
+                           headers={'Accept-Encoding': 'identity'})
+        # Rendered again: other bytes, published under the same mtime.
+        stat = path.stat()
+        rendered = path.with_suffix('.tmp')
+        rendered.write_text('solid PART')
+        os.utime(rendered, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(rendered, path)
+        stale = client.get('/build/models/part.stl',
+                           headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(encoded.headers['content-encoding'], 'gzip')
+        self.assertEqual(encoded.text, 'solid part')
+        self.assertNotEqual(encoded.headers['etag'], plain.headers['etag'])
+        self.assertNotIn('content-encoding', plain.headers)
+        self.assertNotIn('content-encoding', stale.headers)
+        self.assertEqual(stale.text, 'solid PART')
+
     def test_serving_a_snapshot_never_imports_project_source(self):
         with patch('solid_node.core.loader.load_node',
                    side_effect=AssertionError('project source was imported')) as load_node: